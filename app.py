@@ -1,26 +1,214 @@
-from flask import Flask, render_template, request, jsonify
+import time
+_import_started = time.perf_counter()  # startup report: total app import time
+
+from flask import Flask, render_template, request, jsonify, g, send_file
 from flask_cors import CORS
+from werkzeug.exceptions import HTTPException, RequestEntityTooLarge
 import json
 from recommendation_engine import InternshipRecommendationEngine
+from job_queue import BackgroundJobQueue, JobQueueFull
+from resume_cache import ResumeExtractionCache, file_digest
+from upload_utils import UploadRejected, check_magic_bytes, resume_extension, save_upload_to_temp
+from resume_storage import ResumeStore
+from profile_store import create_profile_store, DuplicateProfileField, UNIQUE_PROFILE_FIELDS
+from request_profiler import RequestProfiler, SlowRequestLog
+from precomputed_recommendations import RecommendationPrecomputer, candidate_profile_from, saved_candidate_profiles
+from candidate_index import CandidateIndex
+from diversity import diversity_options
+from posting_alerts import upsert_and_alert
+import lazy_imports
+import metrics
+import request_timing
+import structured_logging
+from structured_logging import log_event
+from request_timing import stage
+from config import (API_CONFIG, DATABASE_CONFIG, DIVERSITY_CONFIG, JOB_QUEUE_CONFIG, LOGGING_CONFIG,
+                    MAX_RECOMMENDATIONS, METRICS_CONFIG, PRECOMPUTE_QUEUE_CONFIG, PROFILING_CONFIG,
+                    RESUME_CACHE_CONFIG, SKILLS_CONFIG, STARTUP_CONFIG, STORAGE_CONFIG, TIMING_CONFIG)
+import hmac
+import logging
+import re
+import threading
 import os
-import tempfile
-import uuid
 from datetime import datetime
 
 app = Flask(__name__)
 CORS(app)
 
-# Initialize recommendation engine
-recommendation_engine = InternshipRecommendationEngine()
+# Request threads only enqueue log records; a background thread writes them
+structured_logging.configure_logging(LOGGING_CONFIG)
+logger = logging.getLogger(__name__)
+REQUEST_ID_PATTERN = re.compile(r'^[A-Za-z0-9._-]{1,64}$')
 
-# User profiles storage (in production, use a proper database)
-user_profiles = {}
-user_goals = {}
+# Reject oversized request bodies from Content-Length before anything is buffered
+app.config['MAX_CONTENT_LENGTH'] = API_CONFIG['max_content_length']
+MAX_RESUME_SIZE = API_CONFIG['max_resume_size']
+MAX_PROFILE_SKILLS = API_CONFIG['max_profile_skills']
+MAX_PROFILE_SECTOR_INTERESTS = API_CONFIG['max_profile_sector_interests']
 
-# Create uploads directory
-UPLOAD_FOLDER = 'static/uploads'
-if not os.path.exists(UPLOAD_FOLDER):
-    os.makedirs(UPLOAD_FOLDER)
+# Initialize recommendation engine
+_engine_started = time.perf_counter()
+recommendation_engine = InternshipRecommendationEngine()
+lazy_imports.record_phase('engine_build', time.perf_counter() - _engine_started)
+
+# User profiles and goals storage, shared by all workers when backed by SQLite
+profile_store = create_profile_store(DATABASE_CONFIG)
+
+# Background queue for asynchronous resume processing
+job_queue = BackgroundJobQueue(**JOB_QUEUE_CONFIG)
+
+# Recommendations ranked in the background whenever a profile, its skills or goal change;
+# on their own queue so profile saves never take resume-processing slots
+precompute_queue = BackgroundJobQueue(**PRECOMPUTE_QUEUE_CONFIG)
+precomputer = RecommendationPrecomputer(recommendation_engine, profile_store, precompute_queue)
+
+# Encoded candidate features for employer-side matching; filled from the store at startup,
+# then caught up with profiles other workers saved before each employer-side query
+candidate_index = CandidateIndex(recommendation_engine)
+# Profile store revision the candidate index has caught up to (None until the startup load finishes)
+_profiles_synced = None
+_candidate_sync_lock = threading.Lock()
+
+# Cache of extraction results keyed by resume content hash
+resume_cache = ResumeExtractionCache(**RESUME_CACHE_CONFIG)
+_resume_extractor = None
+_resume_extractor_lock = threading.Lock()
+
+# Content-addressed resume storage (creates the uploads directory)
+UPLOAD_FOLDER = STORAGE_CONFIG['upload_folder']
+resume_store = ResumeStore(UPLOAD_FOLDER, STORAGE_CONFIG['refs_db'],
+                           grace_period=STORAGE_CONFIG['gc_grace_period'],
+                           legacy_refs_file=STORAGE_CONFIG['legacy_refs_file'])
+resume_store.start_gc(STORAGE_CONFIG['gc_interval'])
+
+# Request-level metrics; engine and extractor counters are defined in metrics.py
+HTTP_REQUESTS = metrics.registry.counter(
+    'internmatch_http_requests_total', 'HTTP requests handled', ['route', 'method', 'status'])
+HTTP_LATENCY = metrics.registry.histogram(
+    'internmatch_http_request_duration_seconds', 'HTTP request latency', ['route'])
+STAGE_LATENCY = metrics.registry.histogram(
+    'internmatch_request_stage_duration_seconds', 'Time spent in each request stage', ['route', 'stage'])
+metrics.registry.gauge('internmatch_catalogue_size', 'Internships loaded in the recommendation engine') \
+    .set_function(lambda: [((), len(recommendation_engine.internships))])
+metrics.registry.gauge('internmatch_resume_cache_entries', 'Resume extraction results held in memory') \
+    .set_function(lambda: [((), resume_cache.stats()['entries'])])
+metrics.registry.gauge('internmatch_resume_cache_hit_ratio', 'Resume extraction cache hits / lookups') \
+    .set_function(lambda: [((), resume_cache.stats()['hit_ratio'])])
+metrics.registry.gauge('internmatch_resume_cache_lookups', 'Resume extraction cache lookups by result', ['result']) \
+    .set_function(lambda: [(('hit',), resume_cache.hits), (('miss',), resume_cache.misses)])
+metrics.registry.gauge('internmatch_startup_phase_seconds', 'Time spent in each startup phase', ['phase']) \
+    .set_function(lambda: [((phase,), seconds) for phase, seconds in lazy_imports.import_report()['phases'].items()])
+metrics.registry.gauge('internmatch_lazy_import_seconds', 'Time to import each lazily loaded dependency', ['module']) \
+    .set_function(lambda: [((module,), seconds) for module, seconds in lazy_imports.import_report()['imports'].items()])
+metrics.registry.gauge('internmatch_jobs', 'Background resume jobs by status', ['status']) \
+    .set_function(lambda: [((status,), count) for status, count in job_queue.stats().items()])
+metrics.registry.gauge('internmatch_precompute_jobs', 'Background recommendation precompute jobs by status', ['status']) \
+    .set_function(lambda: [((status,), count) for status, count in precompute_queue.stats().items()])
+
+# Admin-triggered profiling (disabled without an admin token) and the slowest-requests buffer
+request_profiler = (RequestProfiler(PROFILING_CONFIG['output_dir'], PROFILING_CONFIG['keep_profiles'])
+                    if PROFILING_CONFIG['admin_token'] else None)
+slow_requests = SlowRequestLog(PROFILING_CONFIG['slow_requests'])
+
+def _is_admin():
+    token = PROFILING_CONFIG['admin_token']
+    return bool(token) and hmac.compare_digest(request.headers.get('X-Admin-Token', ''), token)
+
+def _truncate(value):
+    text = value if isinstance(value, str) else json.dumps(value, default=str)
+    limit = PROFILING_CONFIG['max_input_chars']
+    return text if len(text) <= limit else text[:limit] + '...'
+
+def _redact(data):
+    if not isinstance(data, dict):
+        return data
+    return {key: ('<redacted>' if key in UNIQUE_PROFILE_FIELDS else value) for key, value in data.items()}
+
+def _request_inputs():
+    """What a slow request was asked to do, with contact/ID fields masked"""
+    inputs = {
+        'route': request.endpoint or 'unmatched',
+        'method': request.method,
+        'path': request.path,
+        'args': request.args.to_dict()
+    }
+    # Only bodies the handler already parsed: parsing one here can raise (e.g. 413) and change the response
+    try:
+        if request.is_json:
+            inputs['json'] = _truncate(_redact(request.get_json(silent=True)))
+        if 'form' in request.__dict__ and request.form:
+            inputs['form'] = _truncate(_redact(request.form.to_dict()))
+        if 'files' in request.__dict__ and request.files:
+            inputs['files'] = [{'field': field, 'filename': f.filename, 'content_type': f.content_type}
+                               for field, f in request.files.items()]
+    except HTTPException:
+        inputs['body'] = 'unreadable'
+    return inputs
+
+def _finish_profile(duration):
+    profile = g.pop('profile', None)
+    if profile is None:
+        return None
+    return request_profiler.end(profile, request.endpoint or 'unmatched', duration)
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    # Reuse a well-formed upstream request id so logs correlate across proxies
+    incoming_id = request.headers.get('X-Request-ID', '')
+    g.request_id = structured_logging.set_request_id(
+        incoming_id if REQUEST_ID_PATTERN.match(incoming_id) else None)
+    if TIMING_CONFIG['enabled']:
+        request_timing.start_request()
+    
+    mode = request.args.get('profile') or request.headers.get('X-Profile')
+    if mode and request_profiler is not None and _is_admin():
+        try:
+            g.profile = request_profiler.begin(mode.lower())
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        g.profile_busy = g.profile is None
+
+@app.before_request
+def refresh_catalogue():
+    # Postings upserted by another worker process are written to the catalogue file
+    recommendation_engine.reload_if_changed()
+
+@app.after_request
+def finish_request_timer(response):
+    route = request.endpoint or 'unmatched'
+    duration = time.perf_counter() - g.get('request_started', time.perf_counter())
+    if 'request_id' in g:
+        response.headers['X-Request-ID'] = g.request_id
+    entry = _finish_profile(duration)
+    if entry is not None:
+        response.headers['X-Profile-Id'] = entry['id']
+    elif g.get('profile_busy'):
+        response.headers['X-Profile-Status'] = 'busy'
+    if slow_requests.would_record(duration):
+        slow_requests.record(duration, dict(_request_inputs(), status=response.status_code,
+                                            request_id=g.get('request_id'),
+                                            profile_id=entry['id'] if entry else None))
+    
+    timer = request_timing.finish_request()
+    if timer is not None:
+        if TIMING_CONFIG['server_timing_header']:
+            response.headers['Server-Timing'] = timer.header_value()
+        request_timing.stage_stats.record(route, timer)
+        if METRICS_CONFIG['enabled']:
+            for name, seconds in timer.stages.items():
+                STAGE_LATENCY.labels(route, name).observe(seconds)
+    if METRICS_CONFIG['enabled']:
+        HTTP_REQUESTS.labels(route, request.method, response.status_code).inc()
+        HTTP_LATENCY.labels(route).observe(duration)
+    return response
+
+@app.teardown_request
+def release_request_profile(error):
+    # after_request is skipped when a response could not be built; never leave the profiler held
+    if 'profile' in g:
+        _finish_profile(time.perf_counter() - g.request_started)
+    structured_logging.clear_request_id()
 
 @app.route('/')
 def index():
@@ -47,15 +235,52 @@ def get_skills():
     except FileNotFoundError:
         return jsonify([])
 
+@app.route('/api/skills/suggest')
+def suggest_skills():
+    """Autocomplete: canonical skill names matching the typed prefix, most required by postings first"""
+    try:
+        limit = int(request.args.get('limit', SKILLS_CONFIG['suggestions']))
+        if not 1 <= limit <= SKILLS_CONFIG['max_suggestions']:
+            raise ValueError
+    except ValueError:
+        return jsonify({'error': f"limit must be an integer between 1 and {SKILLS_CONFIG['max_suggestions']}"}), 400
+    
+    trie = recommendation_engine.skill_trie(recommendation_engine.internships)
+    return jsonify(trie.suggest(request.args.get('q', ''), limit))
+
 @app.route('/api/internships')
 def get_internships():
-    """Get all internships"""
+    """Get all internships (the engine's catalogue, including postings added since startup)"""
+    return jsonify(recommendation_engine.internships)
+
+@app.route('/api/internships/<int:internship_id>/candidates')
+def get_internship_candidates(internship_id):
+    """Top registered candidates for one internship (employer-side matching)"""
     try:
-        with open('data/internships.json', 'r', encoding='utf-8') as f:
-            internships = json.load(f)
-        return jsonify(internships)
-    except FileNotFoundError:
-        return jsonify([])
+        internship = recommendation_engine.get_internship(internship_id)
+        if internship is None:
+            return jsonify({'error': 'Internship not found'}), 404
+        
+        k = int(request.args.get('k', 20))
+        if k < 1:
+            return jsonify({'error': 'k must be a positive integer'}), 400
+        
+        with stage('score'):
+            _sync_candidate_index()
+            candidates = candidate_index.top_candidates(internship, k)
+        
+        with stage('json'):
+            return jsonify({
+                'internship_id': internship_id,
+                'title': internship.get('title'),
+                'candidates': candidates,
+                'total_candidates': len(candidate_index)
+            })
+    
+    except ValueError:
+        return jsonify({'error': 'k must be a positive integer'}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
 @app.route('/api/recommendations', methods=['POST'])
 def get_recommendations():
@@ -79,15 +304,37 @@ def get_recommendations():
             'experience_level': data.get('experience_level', 'Beginner')
         }
         
-        # Get recommendations
-        num_recommendations = data.get('num_recommendations', 20)  # Increased from 5 to show more internships
-        recommendations = recommendation_engine.get_recommendations(candidate_profile, num_recommendations)
+        # Optional diversity re-ranking: "diversity": true or {"mmr_lambda": 0.7, "max_per_sector": 3, ...}
+        diversity = None
+        if data.get('diversity'):
+            try:
+                diversity = diversity_options(data['diversity'], DIVERSITY_CONFIG)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
         
-        return jsonify({
-            'recommendations': recommendations,
-            'total_found': len(recommendations),
-            'candidate_profile': candidate_profile
-        })
+        # Optional distance filter: only postings within this many km of the preferred city
+        max_distance_km = data.get('max_distance_km')
+        if max_distance_km is not None and (isinstance(max_distance_km, bool) or
+                                            not isinstance(max_distance_km, (int, float)) or max_distance_km <= 0):
+            return jsonify({'error': 'max_distance_km must be a positive number'}), 400
+        
+        # Get recommendations
+        num_recommendations = data.get('num_recommendations', MAX_RECOMMENDATIONS)
+        try:
+            recommendations = recommendation_engine.get_recommendations(candidate_profile, num_recommendations,
+                                                                        diversity, max_distance_km)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        with stage('json'):
+            response = {
+                'recommendations': recommendations,
+                'total_found': len(recommendations),
+                'candidate_profile': candidate_profile
+            }
+            if diversity:
+                response['diversity'] = diversity
+            return jsonify(response)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -124,9 +371,113 @@ def get_skill_suggestions():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _profile_list_error(data):
+    """Error message if a skill or sector interest list is longer than a profile may hold"""
+    for field, limit in (('skills', MAX_PROFILE_SKILLS), ('sector_interests', MAX_PROFILE_SECTOR_INTERESTS)):
+        if isinstance(data.get(field), list) and len(data[field]) > limit:
+            return f"At most {limit} {field.replace('_', ' ')} are allowed"
+    return None
+
+def _profile_changed(user_id: str):
+    """Queue a re-rank of the user's recommendations and re-encode them in the candidate index"""
+    precomputer.schedule(user_id)
+    profile = profile_store.get(user_id)
+    if profile:
+        candidate_index.upsert(user_id, candidate_profile_from(profile, profile_store.get_goal(user_id)))
+
+def _load_candidate_index():
+    """Encode every saved profile into the candidate index"""
+    global _profiles_synced
+    started = time.perf_counter()
+    with _candidate_sync_lock:
+        revision = profile_store.revision()
+        count = candidate_index.load(saved_candidate_profiles(profile_store))
+        _profiles_synced = revision
+    lazy_imports.record_phase('candidate_index_load', time.perf_counter() - started)
+    log_event(logger, 'candidate_index.loaded', 'Candidate index loaded',
+              candidates=count, seconds=round(time.perf_counter() - started, 3))
+
+def _warm_engine_caches():
+    """Hash the catalogue version and build the skill autocomplete trie before first use"""
+    recommendation_engine.catalogue_version
+    recommendation_engine.skill_trie(recommendation_engine.internships)
+
+def _sync_candidate_index():
+    """Apply profiles saved through other worker processes since the last sync"""
+    global _profiles_synced
+    if _profiles_synced is None:
+        return  # the startup load has not finished yet
+    with _candidate_sync_lock:
+        synced = _profiles_synced
+
+        def changed():
+            nonlocal synced
+            for revision, user_id, profile, goal in profile_store.changed_since(synced):
+                synced = revision
+                yield user_id, candidate_profile_from(profile, goal)
+
+        # load() leaves out users this worker re-encoded after the sync started
+        candidate_index.load(changed())
+        _profiles_synced = synced
+
+def _get_resume_extractor():
+    """Shared resume extractor; it is read-only after construction"""
+    global _resume_extractor
+    if _resume_extractor is None:
+        with _resume_extractor_lock:
+            if _resume_extractor is None:
+                from skill_extractor import ResumeSkillExtractor
+                _resume_extractor = ResumeSkillExtractor()
+    return _resume_extractor
+
+def _extract_resume_data(file_path):
+    """Run comprehensive resume extraction on a saved file, reusing cached results"""
+    extractor = _get_resume_extractor()
+    with stage('cache'):
+        cache_key = resume_cache.make_key(file_digest(file_path), extractor.vocabulary_version,
+                                          recommendation_engine.skill_registry.version)
+        cached = resume_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    # Extract comprehensive data; skills are reported under their canonical names
+    extracted_data = extractor.extract_comprehensive_data(file_path)
+    extracted_data['skills'] = recommendation_engine.skill_registry.canonicalize(extracted_data['skills'])
+    resume_cache.put(cache_key, extracted_data)
+    
+    # Sampled summary only; names and emails stay out of the logs
+    log_event(logger, 'resume.extracted', 'Resume extracted',
+              skills_found=len(extracted_data['skills']),
+              education_chars=len(extracted_data['education']),
+              experience_chars=len(extracted_data['experience']),
+              name_found=bool(extracted_data['name']),
+              email_found=bool(extracted_data['email']),
+              experience_level=extracted_data['experience_level'],
+              education_level=extracted_data['education_level'])
+    
+    return extracted_data
+
+def _extract_resume_data_in_job(file_path, request_id):
+    """Background-job entry point; keeps the submitting request's id on the job's log records"""
+    structured_logging.set_request_id(request_id)
+    try:
+        return _extract_resume_data(file_path)
+    finally:
+        structured_logging.clear_request_id()
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except Exception:
+        pass
+
 @app.route('/api/extract-skills', methods=['POST'])
 def extract_skills_from_resume():
-    """Extract comprehensive data from an uploaded resume (PDF/DOCX/TXT)."""
+    """Extract comprehensive data from an uploaded resume (PDF/DOCX/TXT).
+
+    With ``?async=1`` the file is queued for background processing and a job
+    id is returned immediately; poll ``/api/jobs/<job_id>`` for the result.
+    """
     try:
         if 'resume' not in request.files:
             return jsonify({'error': 'Missing file field: resume'}), 400
@@ -135,44 +486,133 @@ def extract_skills_from_resume():
         if resume_file.filename == '':
             return jsonify({'error': 'Empty filename'}), 400
 
-        # Validate file type
-        allowed_extensions = ['.pdf', '.docx', '.doc', '.txt']
-        file_extension = os.path.splitext(resume_file.filename)[1].lower()
-        if file_extension not in allowed_extensions:
-            return jsonify({'error': f'Unsupported file type. Allowed: {", ".join(allowed_extensions)}'}), 400
-
-        # Save to a temp file to support various parsers
-        with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as tmp:
-            resume_file.save(tmp.name)
-            temp_path = tmp.name
+        # Validate file type and content before writing anything to disk
+        try:
+            file_extension = resume_extension(resume_file.filename)
+            check_magic_bytes(resume_file, file_extension)
+            # Save to a temp file to support various parsers
+            with stage('save'):
+                temp_path = save_upload_to_temp(resume_file, file_extension, MAX_RESUME_SIZE)
+        except UploadRejected as e:
+            return jsonify({'error': str(e)}), e.status_code
+
+        if request.args.get('async', '').lower() in ['1', 'true', 'yes']:
+            # The job owns the temp file from here on and removes it when done
+            try:
+                job_id = job_queue.submit(_extract_resume_data_in_job, temp_path, g.request_id,
+                                          cleanup=lambda: _remove_file(temp_path))
+            except JobQueueFull as e:
+                return jsonify({'error': str(e)}), 429, {'Retry-After': '5'}
+            return jsonify({
+                'job_id': job_id,
+                'status': 'queued',
+                'status_url': f'/api/jobs/{job_id}'
+            }), 202
 
         try:
-            from skill_extractor import ResumeSkillExtractor
-            extractor = ResumeSkillExtractor()
-            
-            # Extract comprehensive data
-            extracted_data = extractor.extract_comprehensive_data(temp_path)
-            
-            # Log extraction results for debugging
-            print(f"Resume extraction results:")
-            print(f"  Skills found: {len(extracted_data['skills'])}")
-            print(f"  Education: {extracted_data['education'][:100]}...")
-            print(f"  Experience: {extracted_data['experience'][:100]}...")
-            print(f"  Name: {extracted_data['name']}")
-            print(f"  Email: {extracted_data['email']}")
-            
-            return jsonify(extracted_data)
-            
+            extracted_data = _extract_resume_data(temp_path)
         finally:
-            try:
-                os.remove(temp_path)
-            except Exception:
-                pass
+            _remove_file(temp_path)
+        with stage('json'):
+            return jsonify(extracted_data)
 
+    except RequestEntityTooLarge as e:
+        return request_too_large(e)
     except Exception as e:
-        print(f"Error in resume extraction: {e}")
+        metrics.EXTRACTION_FAILURES.labels('request').inc()
+        logger.exception("Error in resume extraction: %s", e, extra={'event': 'resume.extraction_failed'})
         return jsonify({'error': f'Resume processing failed: {str(e)}'}), 500
 
+@app.route('/api/jobs/<job_id>')
+def get_job_status(job_id):
+    """Poll the status of a background resume processing job"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    response = {
+        'job_id': job['id'],
+        'status': job['status'],
+        'created_at': datetime.fromtimestamp(job['created_at']).isoformat()
+    }
+    if job['status'] == 'done':
+        response['result'] = job['result']
+    elif job['error']:
+        response['error'] = job['error']
+    return jsonify(response)
+
+@app.route('/metrics')
+def get_metrics():
+    """Prometheus scrape endpoint"""
+    return metrics.registry.render(), 200, {'Content-Type': metrics.CONTENT_TYPE}
+
+@app.route('/api/admin/profiles')
+def list_profiles():
+    """Stored request profiles, newest first"""
+    if request_profiler is None or not _is_admin():
+        return jsonify({'error': 'Forbidden'}), 403
+    return jsonify(request_profiler.list())
+
+@app.route('/api/admin/profiles/<profile_id>')
+def get_profile(profile_id):
+    """Download a stored profile: ?format=collapsed (default), text or pstats"""
+    if request_profiler is None or not _is_admin():
+        return jsonify({'error': 'Forbidden'}), 403
+    fmt = request.args.get('format', 'collapsed')
+    path = request_profiler.path(profile_id, fmt)
+    if path is None:
+        return jsonify({'error': 'Profile not found'}), 404
+    if fmt == 'pstats':
+        return send_file(os.path.abspath(path), mimetype='application/octet-stream',
+                         as_attachment=True, download_name=f'{profile_id}.prof')
+    return send_file(os.path.abspath(path), mimetype='text/plain')
+
+@app.route('/api/admin/slow-requests')
+def get_slow_requests():
+    """Slowest requests since startup with their (redacted) inputs"""
+    if not _is_admin():
+        return jsonify({'error': 'Forbidden'}), 403
+    return jsonify(slow_requests.snapshot())
+
+@app.route('/api/admin/internships', methods=['POST'])
+def upsert_internship():
+    """Add or replace a posting and return the saved candidates to alert about it"""
+    if not _is_admin():
+        return jsonify({'error': 'Forbidden'}), 403
+    try:
+        internship = request.get_json()
+        if not isinstance(internship, dict):
+            return jsonify({'error': 'Expected a JSON object'}), 400
+        
+        required_fields = ['id', 'title', 'organization', 'location', 'sector', 'skills_required',
+                           'education_level']
+        for field in required_fields:
+            if field not in internship or internship[field] in (None, '', []):
+                return jsonify({'error': f'Missing required field: {field}'}), 400
+        if not isinstance(internship['id'], int) or isinstance(internship['id'], bool):
+            return jsonify({'error': 'id must be an integer'}), 400
+        
+        min_score = request.args.get('min_score')
+        min_score = float(min_score) if min_score is not None else None
+        
+        with stage('alerts'):
+            # Alert every saved candidate, including those saved through other workers
+            _sync_candidate_index()
+            alert = upsert_and_alert(recommendation_engine, candidate_index, internship, min_score=min_score)
+        
+        with stage('json'):
+            return jsonify(alert), 200 if alert['replaced'] else 201
+    
+    except ValueError:
+        return jsonify({'error': 'min_score must be a number'}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/timing')
+def get_timing_stats():
+    """Per-route stage timings aggregated since startup (mean/max ms)"""
+    return jsonify(request_timing.stage_stats.snapshot())
+
 @app.route('/api/recommendations/from-resume', methods=['POST'])
 def recommendations_from_resume():
     """Upload resume and return recommendations using extracted skills.
@@ -194,20 +634,18 @@ def recommendations_from_resume():
         if resume_file.filename == '':
             return jsonify({'error': 'Empty filename'}), 400
 
-        suffix = os.path.splitext(resume_file.filename)[1]
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-            resume_file.save(tmp.name)
-            temp_path = tmp.name
+        try:
+            file_extension = resume_extension(resume_file.filename)
+            check_magic_bytes(resume_file, file_extension)
+            with stage('save'):
+                temp_path = save_upload_to_temp(resume_file, file_extension, MAX_RESUME_SIZE)
+        except UploadRejected as e:
+            return jsonify({'error': str(e)}), e.status_code
 
         try:
-            from skill_extractor import ResumeSkillExtractor
-            extractor = ResumeSkillExtractor()
-            extracted_skills = extractor.extract_skills_from_file(temp_path)
+            extracted_skills = _extract_resume_data(temp_path)['skills']
         finally:
-            try:
-                os.remove(temp_path)
-            except Exception:
-                pass
+            _remove_file(temp_path)
 
         # Parse other fields from form
         def parse_bool(val: str) -> bool:
@@ -226,7 +664,7 @@ def recommendations_from_resume():
         location_preference = request.form.get('location_preference', '')
         remote_work_preference = parse_bool(request.form.get('remote_work_preference', 'false'))
         experience_level = request.form.get('experience_level', 'Beginner')
-        num_recommendations = int(request.form.get('num_recommendations', '20'))
+        num_recommendations = int(request.form.get('num_recommendations', MAX_RECOMMENDATIONS))
 
         candidate_profile = {
             'education_level': education_level,
@@ -238,12 +676,15 @@ def recommendations_from_resume():
         }
 
         recommendations = recommendation_engine.get_recommendations(candidate_profile, num_recommendations)
-        return jsonify({
-            'recommendations': recommendations,
-            'total_found': len(recommendations),
-            'candidate_profile': candidate_profile
-        })
+        with stage('json'):
+            return jsonify({
+                'recommendations': recommendations,
+                'total_found': len(recommendations),
+                'candidate_profile': candidate_profile
+            })
 
+    except RequestEntityTooLarge as e:
+        return request_too_large(e)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -272,9 +713,9 @@ def get_goal_requirements():
         
         # Check if data was loaded successfully
         if not extractor.internships:
-            print(f"Warning: No internship data loaded. Current directory: {os.getcwd()}")
-            print(f"Script directory: {current_dir}")
-            print(f"Data directory exists: {os.path.exists(os.path.join(current_dir, 'data'))}")
+            log_event(logger, 'goal_requirements.no_data', 'No internship data loaded', level=logging.WARNING,
+                      cwd=os.getcwd(), script_dir=current_dir,
+                      data_dir_exists=os.path.exists(os.path.join(current_dir, 'data')))
             
             return jsonify({
                 'error': 'Unable to load internship data. Please check if data files exist.',
@@ -304,7 +745,7 @@ def manage_profile():
             # For demo purposes, return a default profile
             # In production, get from database based on user session
             user_id = request.args.get('user_id', 'default_user')
-            profile = user_profiles.get(user_id, {})
+            profile = profile_store.get(user_id) or {}
             return jsonify(profile)
         
         elif request.method == 'POST':
@@ -317,35 +758,58 @@ def manage_profile():
                 if field not in data or not data[field]:
                     return jsonify({'error': f'Missing required field: {field}'}), 400
             
-            # Check for unique fields
-            user_id = request.args.get('user_id', 'default_user')
-            
-            # Check if mobile number is unique
-            for uid, profile in user_profiles.items():
-                if uid != user_id and profile.get('mobile_number') == data['mobile_number']:
-                    return jsonify({'error': 'Mobile number already exists'}), 400
-            
-            # Check if email is unique
-            for uid, profile in user_profiles.items():
-                if uid != user_id and profile.get('email') == data['email']:
-                    return jsonify({'error': 'Email already exists'}), 400
+            list_error = _profile_list_error(data)
+            if list_error:
+                return jsonify({'error': list_error}), 400
             
-            # Check if aadhar is unique
-            for uid, profile in user_profiles.items():
-                if uid != user_id and profile.get('aadhar_number') == data['aadhar_number']:
-                    return jsonify({'error': 'Aadhar number already exists'}), 400
+            user_id = request.args.get('user_id', 'default_user')
             
             # Add timestamp
             data['updated_at'] = datetime.now().isoformat()
+            # Stored under canonical names, so "MS Excel" and "Excel" are one skill
+            if isinstance(data.get('skills'), list):
+                data['skills'] = recommendation_engine.skill_registry.canonicalize(data['skills'])
             
-            # Save profile
-            user_profiles[user_id] = data
+            # Save profile; mobile number, email and aadhar must be unique
+            try:
+                profile_store.save(user_id, data)
+            except DuplicateProfileField as e:
+                return jsonify({'error': str(e)}), 400
+            _profile_changed(user_id)
             
             return jsonify({'message': 'Profile saved successfully', 'profile': data})
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/profile/recommendations')
+def get_profile_recommendations():
+    """Recommendations for the saved profile, precomputed in the background when it was saved"""
+    try:
+        user_id = request.args.get('user_id', 'default_user')
+        try:
+            num_recommendations = int(request.args.get('num_recommendations', precomputer.num_recommendations))
+        except ValueError:
+            return jsonify({'error': 'num_recommendations must be an integer'}), 400
+        num_recommendations = min(max(num_recommendations, 1), MAX_RECOMMENDATIONS)
+        
+        entry, precomputed = precomputer.get(user_id, num_recommendations)
+        if entry is None:
+            return jsonify({'error': 'Profile not found'}), 404
+        
+        with stage('json'):
+            return jsonify({
+                'recommendations': entry['recommendations'],
+                'total_found': len(entry['recommendations']),
+                'candidate_profile': entry['candidate_profile'],
+                'precomputed': precomputed,
+                'computed_at': entry['computed_at'],
+                'catalogue_version': entry['catalogue_version']
+            })
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/profile/skills', methods=['POST'])
 def update_profile_skills():
     """Add skills to user profile"""
@@ -353,26 +817,22 @@ def update_profile_skills():
         data = request.get_json()
         user_id = request.args.get('user_id', 'default_user')
         
+        list_error = _profile_list_error(data)
+        if list_error:
+            return jsonify({'error': list_error}), 400
+        
+        # Profiles never grow past MAX_PROFILE_SKILLS; further skills are not added
+        canonicalize = recommendation_engine.skill_registry.canonicalize
         if 'skill' in data:
             # Add single skill
-            skill = data['skill']
-            if user_id not in user_profiles:
-                user_profiles[user_id] = {'skills': []}
-            if 'skills' not in user_profiles[user_id]:
-                user_profiles[user_id]['skills'] = []
-            if skill not in user_profiles[user_id]['skills']:
-                user_profiles[user_id]['skills'].append(skill)
+            profile_store.add_skills(user_id, canonicalize([data['skill']]), MAX_PROFILE_SKILLS)
         
         elif 'skills' in data:
             # Add multiple skills
-            skills = data['skills']
-            if user_id not in user_profiles:
-                user_profiles[user_id] = {'skills': []}
-            if 'skills' not in user_profiles[user_id]:
-                user_profiles[user_id]['skills'] = []
-            for skill in skills:
-                if skill not in user_profiles[user_id]['skills']:
-                    user_profiles[user_id]['skills'].append(skill)
+            profile_store.add_skills(user_id, canonicalize(data['skills']), MAX_PROFILE_SKILLS)
+        
+        if 'skill' in data or 'skills' in data:
+            _profile_changed(user_id)
         
         return jsonify({'message': 'Skills updated successfully'})
     
@@ -390,16 +850,18 @@ def upload_resume():
         if file.filename == '':
             return jsonify({'error': 'No file selected'}), 400
         
-        # Generate unique filename
-        file_extension = os.path.splitext(file.filename)[1]
-        unique_filename = f"{uuid.uuid4()}{file_extension}"
-        file_path = os.path.join(UPLOAD_FOLDER, unique_filename)
+        user_id = request.args.get('user_id', 'default_user')
         
-        # Save file
-        file.save(file_path)
+        # Store by content hash so re-uploads of the same file share one copy
+        try:
+            file_extension = resume_extension(file.filename)
+            check_magic_bytes(file, file_extension)
+            stored_name = resume_store.store(file, file_extension, user_id, MAX_RESUME_SIZE)
+        except UploadRejected as e:
+            return jsonify({'error': str(e)}), e.status_code
         
         # Return file URL
-        resume_url = f"/static/uploads/{unique_filename}"
+        resume_url = f"/{UPLOAD_FOLDER}/{resume_store.url_path(stored_name)}"
         
         return jsonify({
             'message': 'Resume uploaded successfully',
@@ -407,6 +869,8 @@ def upload_resume():
             'resume_filename': file.filename
         })
     
+    except RequestEntityTooLarge as e:
+        return request_too_large(e)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -424,7 +888,9 @@ def save_goal():
         data['created_at'] = datetime.now().isoformat()
         
         # Save goal
-        user_goals[user_id] = data
+        profile_store.save_goal(user_id, data)
+        if user_id in profile_store:
+            _profile_changed(user_id)
         
         return jsonify({'message': 'Goal saved successfully', 'goal': data})
     
@@ -455,9 +921,22 @@ def results():
 def not_found(error):
     return jsonify({'error': 'Endpoint not found'}), 404
 
+@app.errorhandler(413)
+def request_too_large(error):
+    limit_mb = API_CONFIG['max_content_length'] // (1024 * 1024)
+    return jsonify({'error': f'Request too large. Maximum upload size is {limit_mb}MB'}), 413
+
 @app.errorhandler(500)
 def internal_error(error):
     return jsonify({'error': 'Internal server error'}), 500
 
+lazy_imports.record_phase('app_import', time.perf_counter() - _import_started)
+log_event(logger, 'app.started', 'Application module loaded', **lazy_imports.import_report())
+if STARTUP_CONFIG['warm_up']:
+    lazy_imports.warm_up(STARTUP_CONFIG['warm_up_modules'],
+                         tasks=[_get_resume_extractor, _warm_engine_caches, _load_candidate_index])
+else:
+    _load_candidate_index()
+
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)
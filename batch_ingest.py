@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Batch resume ingestion for PM Internship Scheme
+Extracts resumes from a directory or zip archive across a process pool and
+streams one JSON object per resume (JSON Lines)
+
+Usage:
+    python batch_ingest.py resumes/ -o profiles.jsonl
+    python batch_ingest.py college_batch.zip --top-k 5 --sectors Technology,Government
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import zipfile
+from multiprocessing import Pool
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+SUPPORTED_EXTENSIONS = ['.pdf', '.docx', '.doc', '.txt']
+
+# Per-worker state, created once by _init_worker
+_extractor = None
+_engine = None
+_registry = None
+_profile_defaults: Dict[str, Any] = {}
+_top_k = 0
+_archives: Dict[str, zipfile.ZipFile] = {}   # opened once per worker, not once per member
+
+
+def iter_sources(path: str) -> Iterator[Tuple[str, Optional[str]]]:
+    """Yield (path, zip_member) pairs for every supported resume under ``path``"""
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for member in archive.namelist():
+                if os.path.splitext(member)[1].lower() in SUPPORTED_EXTENSIONS:
+                    yield path, member
+        return
+
+    for root, _, files in os.walk(path):
+        for name in sorted(files):
+            if os.path.splitext(name)[1].lower() in SUPPORTED_EXTENSIONS:
+                yield os.path.join(root, name), None
+
+
+def _init_worker(top_k: int, profile_defaults: Dict[str, Any]):
+    global _extractor, _engine, _registry, _profile_defaults, _top_k
+    from skill_extractor import ResumeSkillExtractor
+    _extractor = ResumeSkillExtractor()
+    _profile_defaults = profile_defaults
+    _top_k = top_k
+    if top_k > 0:
+        from recommendation_engine import InternshipRecommendationEngine
+        _engine = InternshipRecommendationEngine()
+        _registry = _engine.skill_registry
+    else:
+        from config import SKILLS_CONFIG
+        from skill_registry import create_skill_registry
+        _registry = create_skill_registry(SKILLS_CONFIG)
+
+
+def _archive(path: str) -> zipfile.ZipFile:
+    archive = _archives.get(path)
+    if archive is None:
+        archive = _archives[path] = zipfile.ZipFile(path)
+    return archive
+
+
+def _process(source: Tuple[str, Optional[str]]) -> Dict[str, Any]:
+    path, member = source
+    name = f"{path}:{member}" if member else path
+    temp_path = None
+    try:
+        if member:
+            suffix = os.path.splitext(member)[1].lower()
+            with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
+                tmp.write(_archive(path).read(member))
+                temp_path = tmp.name
+            text = _extractor.extract_text(temp_path)
+        else:
+            text = _extractor.extract_text(path)
+        # Parsers return '' for corrupt or image-only files rather than raising
+        if not text or not text.strip():
+            return {'file': name, 'status': 'error', 'error': 'No text could be extracted (corrupt, empty or scanned file)'}
+        data = _extractor.extract_comprehensive_data_from_text(text)
+        # Same canonical skill names as /api/extract-skills
+        data['skills'] = _registry.canonicalize(data['skills'])
+
+        record = {'file': name, 'status': 'ok', 'data': data}
+        if _engine is not None:
+            candidate_profile = {
+                'education_level': data['education_level'],
+                'skills': data['skills'],
+                'experience_level': data['experience_level'],
+                **_profile_defaults
+            }
+            recommendations = _engine.get_recommendations(candidate_profile, _top_k)
+            record['recommendations'] = [
+                {
+                    'id': rec['id'],
+                    'title': rec['title'],
+                    'organization': rec['organization'],
+                    'match_score': rec['match_score']
+                }
+                for rec in recommendations
+            ]
+        return record
+    except Exception as e:
+        return {'file': name, 'status': 'error', 'error': str(e)}
+    finally:
+        if temp_path:
+            try:
+                os.remove(temp_path)
+            except Exception:
+                pass
+
+
+def run_batch(path: str, output, workers: int = None, top_k: int = 0,
+              profile_defaults: Dict[str, Any] = None, chunksize: int = 8) -> Dict[str, Any]:
+    """Process every resume under ``path`` and write JSON Lines to ``output``"""
+    sources = list(iter_sources(path))
+    summary = {'total': len(sources), 'succeeded': 0, 'failed': 0, 'failures': []}
+    start = time.perf_counter()
+
+    with Pool(processes=workers, initializer=_init_worker,
+              initargs=(top_k, profile_defaults or {})) as pool:
+        for record in pool.imap_unordered(_process, sources, chunksize=chunksize):
+            output.write(json.dumps(record, ensure_ascii=False) + '\n')
+            if record['status'] == 'ok':
+                summary['succeeded'] += 1
+            else:
+                summary['failed'] += 1
+                summary['failures'].append({'file': record['file'], 'error': record['error']})
+
+    elapsed = time.perf_counter() - start
+    summary['elapsed_seconds'] = round(elapsed, 3)
+    summary['files_per_second'] = round(len(sources) / elapsed, 2) if elapsed > 0 else 0.0
+    return summary
+
+
+def _parse_list(value: str) -> List[str]:
+    return [x.strip() for x in value.split(',') if x.strip()] if value else []
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Bulk-extract resumes into JSON Lines profiles')
+    parser.add_argument('source', help='Directory or .zip archive of PDF/DOCX/TXT resumes')
+    parser.add_argument('-o', '--output', help='Output .jsonl file (default: stdout)')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--top-k', type=int, default=0, help='Also emit the top-k internship matches per resume')
+    parser.add_argument('--sectors', default='', help='Comma-separated sector interests used for matching')
+    parser.add_argument('--location', default='', help='Location preference used for matching')
+    parser.add_argument('--remote', action='store_true', help='Candidates prefer remote work')
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.source):
+        print(f"❌ Source not found: {args.source}", file=sys.stderr)
+        return 1
+
+    profile_defaults = {
+        'sector_interests': _parse_list(args.sectors),
+        'location_preference': args.location,
+        'remote_work_preference': args.remote
+    }
+
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        summary = run_batch(args.source, output, workers=args.workers,
+                            top_k=args.top_k, profile_defaults=profile_defaults)
+    finally:
+        if args.output:
+            output.close()
+
+    print(f"📦 Processed {summary['total']} resumes in {summary['elapsed_seconds']}s "
+          f"({summary['files_per_second']} files/sec)", file=sys.stderr)
+    print(f"✅ Succeeded: {summary['succeeded']}  ❌ Failed: {summary['failed']}", file=sys.stderr)
+    for failure in summary['failures']:
+        print(f"   {failure['file']}: {failure['error']}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
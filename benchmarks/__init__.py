@@ -0,0 +1,5 @@
+"""
+Benchmarks for PM Internship Scheme
+Synthetic data generators and scale/throughput measurements for the
+recommendation engine, resume extractor and HTTP API
+"""
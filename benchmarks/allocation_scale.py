@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Scale benchmark for seat allocation
+Generates synthetic candidates and a synthetic catalogue with seat
+capacities, then runs SeatAllocator with each method and reports runtime,
+objective value and the gap to the LP upper bound.
+
+Usage (from the project root):
+    python -m benchmarks.allocation_scale --candidates 300000 --postings 2000 -o bench_results/allocation.json
+"""
+
+import argparse
+import sys
+import time
+from typing import Any, Dict, List
+
+from benchmarks.common import environment_info, peak_rss_mb, write_results
+from benchmarks.synthetic import SyntheticDataGenerator
+
+
+def run(candidates: int, postings: int, seats_per_posting: int, methods: List[str], seed: int) -> Dict[str, Any]:
+    from allocation import SeatAllocator
+    from candidate_index import CandidateIndex
+    from config import ALLOCATION_CONFIG
+    from recommendation_engine import InternshipRecommendationEngine
+
+    generator = SyntheticDataGenerator(seed=seed)
+    catalogue = generator.internships(postings)
+    for internship in catalogue:
+        internship['capacity'] = generator.rng.randint(1, 2 * seats_per_posting - 1)
+    engine = InternshipRecommendationEngine(internships=catalogue)
+
+    start = time.perf_counter()
+    index = CandidateIndex(engine)
+    index.load((f'candidate_{n}', profile) for n, profile in enumerate(generator.profiles(candidates)))
+    index_seconds = time.perf_counter() - start
+
+    allocator = SeatAllocator(index, **ALLOCATION_CONFIG)
+    runs = {}
+    for method in methods:
+        result = allocator.allocate(catalogue, method)
+        runs[method] = {key: value for key, value in result.items() if key != 'assignments'}
+        runs[method]['gap_to_bound'] = round(1 - result['objective'] / result['upper_bound'], 5) \
+            if result['upper_bound'] else 0.0
+    return {
+        'candidates': candidates,
+        'postings': postings,
+        'index_build_seconds': round(index_seconds, 3),
+        'methods': runs,
+        'peak_rss_mb': peak_rss_mb()
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Measure seat allocation runtime and quality at scale')
+    parser.add_argument('--candidates', type=int, default=100000)
+    parser.add_argument('--postings', type=int, default=1000)
+    parser.add_argument('--seats-per-posting', type=int, default=20, help='Mean seats per posting')
+    parser.add_argument('--methods', nargs='+', default=['auction', 'greedy'], choices=['auction', 'greedy'])
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('-o', '--output', help='Write JSON results here instead of stdout')
+    args = parser.parse_args(argv)
+
+    print(f"⏱️  {args.candidates:,} candidates, {args.postings:,} postings...", file=sys.stderr)
+    result = run(args.candidates, args.postings, args.seats_per_posting, args.methods, args.seed)
+    for method, summary in result['methods'].items():
+        print(f"   {method}: objective {summary['objective']} (bound {summary['upper_bound']}, "
+              f"gap {summary['gap_to_bound']}), {summary['assigned']} placed, "
+              f"{summary['runtime_seconds']['total']}s", file=sys.stderr)
+
+    write_results({'benchmark': 'allocation_scale', 'environment': environment_info(), 'runs': [result]},
+                  args.output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
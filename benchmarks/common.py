@@ -0,0 +1,65 @@
+"""
+Shared helpers for benchmarks: percentiles, memory readings and result files
+"""
+
+import json
+import math
+import os
+import platform
+import resource
+import sys
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100.0 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def latency_summary(samples_seconds: List[float]) -> Dict[str, float]:
+    """p50/p95/p99/mean/max in milliseconds"""
+    values = sorted(samples_seconds)
+    if not values:
+        return {'p50': 0.0, 'p95': 0.0, 'p99': 0.0, 'mean': 0.0, 'max': 0.0}
+    return {
+        'p50': round(percentile(values, 50) * 1000, 3),
+        'p95': round(percentile(values, 95) * 1000, 3),
+        'p99': round(percentile(values, 99) * 1000, 3),
+        'mean': round(sum(values) / len(values) * 1000, 3),
+        'max': round(values[-1] * 1000, 3)
+    }
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round(peak / divisor, 1)
+
+
+def environment_info() -> Dict[str, Any]:
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count()
+    }
+
+
+def write_results(results: Dict[str, Any], output: Optional[str]):
+    """Write results as JSON to ``output``, or to stdout when no path is given"""
+    payload = json.dumps(results, indent=2, ensure_ascii=False)
+    if output:
+        directory = os.path.dirname(output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(payload + '\n')
+        print(f"📄 Results written to {output}", file=sys.stderr)
+    else:
+        print(payload)
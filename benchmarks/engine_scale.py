@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Scale benchmark for InternshipRecommendationEngine
+For each catalogue size, generates a synthetic catalogue, builds the engine,
+forces the structures it otherwise builds on first use (reported separately
+as warm-up) and times get_recommendations over synthetic candidate profiles. Each size
+runs in a fresh process so peak RSS is measured per size.
+
+Usage (from the project root):
+    python -m benchmarks.engine_scale --sizes 10000 100000 -o bench_results/engine.json
+"""
+
+import argparse
+import gc
+import multiprocessing
+import queue as queue_module
+import sys
+import time
+from typing import Any, Dict, List
+
+from benchmarks.common import environment_info, latency_summary, peak_rss_mb, write_results
+from benchmarks.synthetic import SyntheticDataGenerator
+
+DEFAULT_SIZES = [10000, 100000]
+
+
+def default_query_count(size: int) -> int:
+    """Enough queries for stable percentiles without hour-long runs at 1M postings"""
+    return max(20, min(500, 5_000_000 // size))
+
+
+def run_size(size: int, queries: int, num_recommendations: int, seed: int) -> Dict[str, Any]:
+    """Benchmark one catalogue size in the current process"""
+    from recommendation_engine import InternshipRecommendationEngine
+
+    baseline_rss = peak_rss_mb()
+    generator = SyntheticDataGenerator(seed=seed)
+
+    start = time.perf_counter()
+    catalogue = generator.internships(size)
+    generation_seconds = time.perf_counter() - start
+    catalogue_rss = peak_rss_mb()
+
+    gc.collect()
+    start = time.perf_counter()
+    engine = InternshipRecommendationEngine(internships=catalogue)
+    build_seconds = time.perf_counter() - start
+    build_rss = peak_rss_mb()
+
+    # The constructor defers these to first use; time them here so they show up somewhere
+    warm_up = {}
+    for name, build in (('catalogue_version', lambda: engine.catalogue_version),
+                        ('location_index', lambda: engine.location_index(engine.internships)),
+                        ('skill_trie', lambda: engine.skill_trie(engine.internships)),
+                        ('posting_features', lambda: engine.posting_features(engine.internships)),
+                        ('tfidf_matrix', lambda: engine.tfidf_matrix)):
+        start = time.perf_counter()
+        build()
+        warm_up[name] = round(time.perf_counter() - start, 3)
+    warm_up_rss = peak_rss_mb()
+
+    profiles = list(generator.profiles(queries))
+    # One warm-up query so per-profile caches don't skew the first sample
+    engine.get_recommendations(profiles[0], num_recommendations)
+
+    samples: List[float] = []
+    returned = 0
+    start = time.perf_counter()
+    for profile in profiles:
+        query_start = time.perf_counter()
+        returned += len(engine.get_recommendations(profile, num_recommendations))
+        samples.append(time.perf_counter() - query_start)
+    total_seconds = time.perf_counter() - start
+
+    return {
+        'catalogue_size': size,
+        'queries': queries,
+        'num_recommendations': num_recommendations,
+        'catalogue_generation_seconds': round(generation_seconds, 3),
+        'engine_build_seconds': round(build_seconds, 3),
+        'engine_warm_up_seconds': dict(warm_up, total=round(sum(warm_up.values()), 3)),
+        'engine_ready_seconds': round(build_seconds + sum(warm_up.values()), 3),
+        # Peak RSS is monotonic, so each reading is the high-water mark so far
+        'rss_mb': {
+            'baseline': baseline_rss,
+            'after_catalogue': catalogue_rss,
+            'after_build': build_rss,
+            'after_warm_up': warm_up_rss,
+            'peak_after_queries': peak_rss_mb()
+        },
+        'latency_ms': latency_summary(samples),
+        'throughput_qps': round(queries / total_seconds, 2) if total_seconds > 0 else 0.0,
+        'avg_results_returned': round(returned / queries, 2)
+    }
+
+
+def _run_size_in_child(args, queue):
+    try:
+        queue.put(run_size(*args))
+    except Exception as e:
+        queue.put({'catalogue_size': args[0], 'error': str(e)})
+
+
+def run_isolated(size: int, queries: int, num_recommendations: int, seed: int) -> Dict[str, Any]:
+    """Run one size in a spawned process so its peak RSS is not inherited"""
+    ctx = multiprocessing.get_context('spawn')
+    queue = ctx.Queue()
+    process = ctx.Process(target=_run_size_in_child,
+                          args=((size, queries, num_recommendations, seed), queue))
+    process.start()
+    try:
+        while True:
+            try:
+                return queue.get(timeout=1.0)
+            except queue_module.Empty:
+                # A child killed by the OOM killer never reports back
+                if not process.is_alive():
+                    return {'catalogue_size': size,
+                            'error': f'benchmark process exited with code {process.exitcode}'}
+    finally:
+        process.join()
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Measure recommendation engine build time, memory and latency at scale')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='Catalogue sizes to test (e.g. 10000 100000 1000000)')
+    parser.add_argument('--queries', type=int, default=None,
+                        help='Profiles to score per size (default: scaled to catalogue size)')
+    parser.add_argument('--num-recommendations', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--in-process', action='store_true',
+                        help='Run all sizes in this process (faster, but RSS readings accumulate)')
+    parser.add_argument('-o', '--output', help='Write JSON results here instead of stdout')
+    args = parser.parse_args(argv)
+
+    results = {'benchmark': 'engine_scale', 'environment': environment_info(), 'runs': []}
+    for size in args.sizes:
+        queries = args.queries or default_query_count(size)
+        print(f"⏱️  Catalogue size {size:,}: {queries} queries...", file=sys.stderr)
+        runner = run_size if args.in_process else run_isolated
+        run = runner(size, queries, args.num_recommendations, args.seed)
+        results['runs'].append(run)
+        if 'error' in run:
+            print(f"   ❌ {run['error']}", file=sys.stderr)
+        else:
+            print(f"   build {run['engine_build_seconds']}s, warm-up {run['engine_warm_up_seconds']['total']}s, p50 {run['latency_ms']['p50']}ms, "
+                  f"p99 {run['latency_ms']['p99']}ms, {run['throughput_qps']} qps, "
+                  f"peak RSS {run['rss_mb']['peak_after_queries']}MB", file=sys.stderr)
+
+    write_results(results, args.output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
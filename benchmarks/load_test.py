@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+HTTP load generator for the PM Internship Scheme API
+Drives a running server (``--url``) or the Flask app in-process with a
+weighted mix of endpoint calls at a target rate over concurrent connections,
+then reports throughput, error rate and latency histograms per endpoint.
+
+Usage (from the project root):
+    python -m benchmarks.load_test --url http://localhost:5000 --rate 50 --duration 30
+    python -m benchmarks.load_test --in-process --concurrency 8 --duration 10 \\
+        --mix sectors=30,skills=20,recommendations=30,extract-skills=10,profile=10
+"""
+
+import argparse
+import http.client
+import itertools
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple
+from urllib.parse import urlsplit
+
+from benchmarks.common import environment_info, latency_summary, write_results
+from benchmarks.synthetic import RESUME_NAMES, SyntheticDataGenerator, SyntheticResumeGenerator
+
+DEFAULT_MIX = 'sectors=25,skills=20,recommendations=35,extract-skills=10,profile=10'
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+HISTOGRAM_BUCKETS_MS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+HttpRequest = Tuple[str, str, Dict[str, str], bytes]
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    mix = {}
+    for part in spec.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in REQUEST_BUILDERS:
+            raise ValueError(f"Unknown endpoint '{name}'. Choose from: {', '.join(REQUEST_BUILDERS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+class RequestFactory:
+    """Builds request payloads from synthetic profiles and resumes"""
+
+    def __init__(self, seed: int = 42, unique_resumes: int = 50):
+        self.generator = SyntheticDataGenerator(seed=seed)
+        vocabulary = list(self.generator.skills)
+        resume_generator = SyntheticResumeGenerator(vocabulary, seed=seed)
+        self.resumes = ['\n'.join(resume_generator.resume_lines(random.Random(i).randint(10, 60)))
+                        .encode('utf-8') for i in range(unique_resumes)]
+        self._lock = threading.Lock()
+        self._counter = itertools.count()
+
+    def profile(self) -> Dict[str, Any]:
+        with self._lock:
+            return self.generator.profile()
+
+    def next_id(self) -> int:
+        return next(self._counter)
+
+
+def _json_request(method: str, path: str, payload: Dict[str, Any]) -> HttpRequest:
+    return method, path, {'Content-Type': 'application/json'}, json.dumps(payload).encode('utf-8')
+
+
+def _multipart(field: str, filename: str, content: bytes) -> Tuple[Dict[str, str], bytes]:
+    boundary = uuid.uuid4().hex
+    body = (f"--{boundary}\r\nContent-Disposition: form-data; name=\"{field}\"; filename=\"{filename}\"\r\n"
+            f"Content-Type: text/plain\r\n\r\n").encode('utf-8') + content + f"\r\n--{boundary}--\r\n".encode('utf-8')
+    return {'Content-Type': f'multipart/form-data; boundary={boundary}'}, body
+
+
+def build_sectors(factory: RequestFactory) -> HttpRequest:
+    return 'GET', '/api/sectors', {}, b''
+
+
+def build_skills(factory: RequestFactory) -> HttpRequest:
+    return 'GET', '/api/skills', {}, b''
+
+
+def build_recommendations(factory: RequestFactory) -> HttpRequest:
+    return _json_request('POST', '/api/recommendations', factory.profile())
+
+
+def build_extract_skills(factory: RequestFactory) -> HttpRequest:
+    headers, body = _multipart('resume', 'resume.txt', random.choice(factory.resumes))
+    return 'POST', '/api/extract-skills', headers, body
+
+
+def build_profile(factory: RequestFactory) -> HttpRequest:
+    n = factory.next_id()
+    user_id = f"load_{uuid.uuid4().hex[:12]}"
+    if n % 2:
+        return 'GET', f'/api/profile?user_id={user_id}', {}, b''
+    profile = factory.profile()
+    payload = {
+        'full_name': random.choice(RESUME_NAMES),
+        'mobile_number': f"9{random.randint(0, 999999999):09d}{n}",
+        'email': f"{user_id}@example.com",
+        'aadhar_number': f"{user_id}-{n}",
+        'college': 'Synthetic University',
+        'location': profile['location_preference'],
+        'education_level': profile['education_level'],
+        'experience_level': profile['experience_level'],
+        'skills': profile['skills']
+    }
+    return _json_request('POST', f'/api/profile?user_id={user_id}', payload)
+
+
+REQUEST_BUILDERS: Dict[str, Callable[[RequestFactory], HttpRequest]] = {
+    'sectors': build_sectors,
+    'skills': build_skills,
+    'recommendations': build_recommendations,
+    'extract-skills': build_extract_skills,
+    'profile': build_profile
+}
+
+
+class HttpTransport:
+    """Keep-alive HTTP connection per worker thread"""
+
+    def __init__(self, base_url: str, timeout: float = 30.0):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname or 'localhost'
+        self.port = parts.port or (443 if parts.scheme == 'https' else 80)
+        self.connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def send(self, method: str, path: str, headers: Dict[str, str], body: bytes) -> int:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self.connection_class(self.host, self.port, timeout=self.timeout)
+            self._local.conn = conn
+        try:
+            conn.request(method, path, body=body or None, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            return response.status
+        except Exception:
+            # Drop the broken connection; the next request reconnects
+            conn.close()
+            self._local.conn = None
+            raise
+
+
+class FlaskTransport:
+    """Flask test client per worker thread, for runs without a server"""
+
+    def __init__(self):
+        # Keep synthetic profiles out of the on-disk database
+        from config import DATABASE_CONFIG
+        DATABASE_CONFIG['backend'] = 'memory'
+        from app import app
+        self.app = app
+        self._local = threading.local()
+
+    def send(self, method: str, path: str, headers: Dict[str, str], body: bytes) -> int:
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        return client.open(path, method=method, headers=headers, data=body).status_code
+
+
+class EndpointStats:
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.errors = 0
+        self.status_codes: Dict[int, int] = {}
+
+    def histogram(self) -> Dict[str, int]:
+        counts = {f"le_{bound}ms": 0 for bound in HISTOGRAM_BUCKETS_MS}
+        counts['gt_10000ms'] = 0
+        for latency in self.latencies:
+            ms = latency * 1000
+            for bound in HISTOGRAM_BUCKETS_MS:
+                if ms <= bound:
+                    counts[f"le_{bound}ms"] += 1
+                    break
+            else:
+                counts['gt_10000ms'] += 1
+        return counts
+
+
+def run_load(transport, mix: Dict[str, float], factory: RequestFactory, duration: float,
+             concurrency: int, rate: float) -> Dict[str, Any]:
+    """Run the mix for ``duration`` seconds.
+
+    With a target ``rate`` the schedule is open-loop: request i is due at
+    ``start + i / rate`` and its latency is measured from that due time, so
+    a slow server shows up as latency instead of silently lowering the
+    offered load. With ``rate`` 0 each connection sends back-to-back.
+    """
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    stats = {name: EndpointStats() for name in names}
+    stats_lock = threading.Lock()
+    slot_counter = itertools.count()
+    start = time.perf_counter()
+    deadline = start + duration
+
+    def worker():
+        rng = random.Random()
+        while True:
+            now = time.perf_counter()
+            if rate > 0:
+                due = start + next(slot_counter) / rate
+                if due >= deadline:
+                    return
+                if due > now:
+                    time.sleep(due - now)
+                began = due
+            else:
+                if now >= deadline:
+                    return
+                began = now
+
+            name = rng.choices(names, weights)[0]
+            method, path, headers, body = REQUEST_BUILDERS[name](factory)
+            try:
+                status = transport.send(method, path, headers, body)
+                failed = status >= 400
+            except Exception:
+                status, failed = 0, True
+            elapsed = time.perf_counter() - began
+
+            with stats_lock:
+                endpoint = stats[name]
+                endpoint.latencies.append(elapsed)
+                endpoint.status_codes[status] = endpoint.status_codes.get(status, 0) + 1
+                if failed:
+                    endpoint.errors += 1
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(worker) for _ in range(concurrency)]
+        for future in futures:
+            # Surface bugs in the generator itself instead of silently losing a connection
+            future.result()
+    wall_seconds = time.perf_counter() - start
+
+    endpoints = {}
+    total_requests = total_errors = 0
+    for name, endpoint in stats.items():
+        count = len(endpoint.latencies)
+        total_requests += count
+        total_errors += endpoint.errors
+        endpoints[name] = {
+            'requests': count,
+            'errors': endpoint.errors,
+            'error_rate': round(endpoint.errors / count, 4) if count else 0.0,
+            'throughput_rps': round(count / wall_seconds, 2),
+            'status_codes': {str(code): n for code, n in sorted(endpoint.status_codes.items())},
+            'latency_ms': latency_summary(endpoint.latencies),
+            'histogram': endpoint.histogram()
+        }
+
+    return {
+        'wall_seconds': round(wall_seconds, 3),
+        'total_requests': total_requests,
+        'total_errors': total_errors,
+        'error_rate': round(total_errors / total_requests, 4) if total_requests else 0.0,
+        'throughput_rps': round(total_requests / wall_seconds, 2),
+        'endpoints': endpoints
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Load-test the API with a weighted endpoint mix')
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--url', help='Base URL of a running server, e.g. http://localhost:5000')
+    target.add_argument('--in-process', action='store_true', help='Drive app.py through the Flask test client')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help=f'Endpoint weights (default: {DEFAULT_MIX})')
+    parser.add_argument('--rate', type=float, default=0, help='Target requests/sec across all connections (0 = as fast as possible)')
+    parser.add_argument('--concurrency', type=int, default=8, help='Concurrent connections')
+    parser.add_argument('--duration', type=float, default=10, help='Seconds to run')
+    parser.add_argument('--unique-resumes', type=int, default=50,
+                        help='Distinct resumes sent to /api/extract-skills (lower means more cache hits)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('-o', '--output', help='Write JSON results here instead of stdout')
+    args = parser.parse_args(argv)
+
+    mix = parse_mix(args.mix)
+    factory = RequestFactory(seed=args.seed, unique_resumes=args.unique_resumes)
+    transport = FlaskTransport() if args.in_process else HttpTransport(args.url)
+
+    print(f"🔥 {'in-process' if args.in_process else args.url}: {args.concurrency} connections, "
+          f"{args.rate or 'max'} req/s for {args.duration}s", file=sys.stderr)
+    # The app logs to stdout; keep it off the JSON results when running in-process
+    real_stdout, sys.stdout = sys.stdout, sys.stderr
+    try:
+        summary = run_load(transport, mix, factory, args.duration, args.concurrency, args.rate)
+    finally:
+        sys.stdout = real_stdout
+
+    for name, endpoint in summary['endpoints'].items():
+        print(f"   {name:16} {endpoint['requests']:6} req  {endpoint['error_rate'] * 100:5.1f}% err  "
+              f"p50 {endpoint['latency_ms']['p50']}ms  p99 {endpoint['latency_ms']['p99']}ms", file=sys.stderr)
+    print(f"   total: {summary['throughput_rps']} req/s, {summary['error_rate'] * 100:.1f}% errors", file=sys.stderr)
+
+    results = {
+        'benchmark': 'load_test',
+        'environment': environment_info(),
+        'config': {
+            'target': 'in-process' if args.in_process else args.url,
+            'mix': mix,
+            'rate': args.rate,
+            'concurrency': args.concurrency,
+            'duration': args.duration
+        },
+        'summary': summary
+    }
+    write_results(results, args.output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Resume extraction throughput benchmark for ResumeSkillExtractor
+Synthesizes TXT/DOCX/PDF resumes of varying length and skill density, times
+each extraction stage per format, then measures docs/sec on 1..N worker
+processes.
+
+Usage (from the project root):
+    python -m benchmarks.resume_extraction --docs 60 --max-workers 4 -o bench_results/resume.json
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from multiprocessing import Pool
+from typing import Any, Dict, List
+
+from benchmarks.common import environment_info, latency_summary, write_results
+from benchmarks.synthetic import RESUME_WRITERS, SyntheticResumeGenerator
+
+# Stages of ResumeSkillExtractor.extract_comprehensive_data, in call order
+TEXT_STAGES = [
+    'extract_skills_from_text',
+    'extract_education',
+    'extract_experience',
+    'extract_name',
+    'extract_email',
+    'extract_phone',
+    'determine_experience_level',
+    'determine_education_level'
+]
+CONTACT_STAGES = ['extract_name', 'extract_email', 'extract_phone']
+
+LENGTHS = {'short': 10, 'medium': 40, 'long': 150}
+DENSITIES = {'sparse': 0.1, 'typical': 0.3, 'dense': 0.7}
+
+
+def skill_vocabulary(extractor) -> List[str]:
+    """Everything the extractor can match: skills.json plus the built-in patterns"""
+    vocabulary = list(extractor.known_skills)
+    for skills in extractor.skill_patterns.values():
+        vocabulary.extend(skills)
+    return vocabulary
+
+
+def build_corpus(directory: str, docs_per_format: int, formats: List[str], seed: int) -> List[Dict[str, Any]]:
+    """Write a corpus cycling through every length/density combination"""
+    from skill_extractor import ResumeSkillExtractor
+
+    generator = SyntheticResumeGenerator(skill_vocabulary(ResumeSkillExtractor()), seed=seed)
+    variants = [(length, density) for length in LENGTHS for density in DENSITIES]
+    corpus = []
+    for extension in formats:
+        writer = RESUME_WRITERS[extension]
+        for i in range(docs_per_format):
+            length, density = variants[i % len(variants)]
+            path = os.path.join(directory, f"resume_{i:05d}_{length}_{density}{extension}")
+            writer(path, generator.resume_lines(LENGTHS[length], DENSITIES[density]))
+            corpus.append({'path': path, 'format': extension, 'length': length, 'density': density})
+    return corpus
+
+
+def time_stages(corpus: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Time every extraction stage for every document, grouped by format"""
+    from skill_extractor import ResumeSkillExtractor
+
+    extractor = ResumeSkillExtractor()
+    samples: Dict[str, Dict[str, List[float]]] = defaultdict(lambda: defaultdict(list))
+    skills_found: Dict[str, List[int]] = defaultdict(list)
+
+    for doc in corpus:
+        stage_samples = samples[doc['format']]
+        start = time.perf_counter()
+        text = extractor.extract_text(doc['path'])
+        stage_samples['extract_text'].append(time.perf_counter() - start)
+
+        contact_seconds = 0.0
+        for stage in TEXT_STAGES:
+            start = time.perf_counter()
+            result = getattr(extractor, stage)(text)
+            elapsed = time.perf_counter() - start
+            stage_samples[stage].append(elapsed)
+            if stage in CONTACT_STAGES:
+                contact_seconds += elapsed
+            if stage == 'extract_skills_from_text':
+                skills_found[doc['format']].append(len(result))
+        stage_samples['contact_extractors'].append(contact_seconds)
+
+    report = {}
+    for extension, stage_samples in samples.items():
+        report[extension] = {
+            'documents': len(stage_samples['extract_text']),
+            'avg_skills_found': round(sum(skills_found[extension]) / max(1, len(skills_found[extension])), 2),
+            'stages_ms': {stage: latency_summary(values) for stage, values in stage_samples.items()}
+        }
+    return report
+
+
+_worker_extractor = None
+
+
+def _init_worker():
+    global _worker_extractor
+    from skill_extractor import ResumeSkillExtractor
+    _worker_extractor = ResumeSkillExtractor()
+
+
+def _extract(path: str) -> int:
+    return len(_worker_extractor.extract_comprehensive_data(path)['skills'])
+
+
+def measure_throughput(corpus: List[Dict[str, Any]], max_workers: int) -> List[Dict[str, Any]]:
+    """docs/sec for the full pipeline with 1..max_workers processes"""
+    paths = [doc['path'] for doc in corpus]
+    results = []
+    for workers in range(1, max_workers + 1):
+        with Pool(processes=workers, initializer=_init_worker) as pool:
+            # Warm the workers up so extractor construction isn't timed
+            pool.map(_extract, paths[:workers])
+            start = time.perf_counter()
+            pool.map(_extract, paths, chunksize=max(1, len(paths) // (workers * 4)))
+            elapsed = time.perf_counter() - start
+        results.append({
+            'workers': workers,
+            'documents': len(paths),
+            'seconds': round(elapsed, 3),
+            'docs_per_second': round(len(paths) / elapsed, 2) if elapsed > 0 else 0.0
+        })
+        print(f"   {workers} worker(s): {results[-1]['docs_per_second']} docs/sec", file=sys.stderr)
+    return results
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Measure ResumeSkillExtractor cost per stage and docs/sec')
+    parser.add_argument('--docs', type=int, default=45, help='Documents per format')
+    parser.add_argument('--formats', nargs='+', default=['.txt', '.docx', '.pdf'],
+                        choices=sorted(RESUME_WRITERS))
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('-o', '--output', help='Write JSON results here instead of stdout')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix='resume_bench_') as corpus_dir:
+        print(f"📝 Generating {args.docs} resumes per format...", file=sys.stderr)
+        corpus = build_corpus(corpus_dir, args.docs, args.formats, args.seed)
+
+        print("⏱️  Timing extraction stages...", file=sys.stderr)
+        stages = time_stages(corpus)
+
+        print("🚀 Measuring throughput...", file=sys.stderr)
+        throughput = measure_throughput(corpus, args.max_workers)
+
+    results = {
+        'benchmark': 'resume_extraction',
+        'environment': environment_info(),
+        'corpus': {
+            'documents_per_format': args.docs,
+            'formats': args.formats,
+            'lengths': LENGTHS,
+            'skill_densities': DENSITIES
+        },
+        'stages_by_format': stages,
+        'throughput': throughput
+    }
+    write_results(results, args.output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
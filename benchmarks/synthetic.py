@@ -0,0 +1,234 @@
+"""
+Synthetic data generation for benchmarks
+Builds internship catalogues and candidate profiles shaped like data/*.json,
+drawing sectors, skills and locations from the bundled vocabularies
+"""
+
+import json
+import os
+import random
+from collections import defaultdict
+from typing import Any, Dict, Iterator, List
+
+EDUCATION_LEVELS = ['Graduate', 'Graduate', 'Graduate', 'Post Graduate', 'PhD']
+EXPERIENCE_LEVELS = ['Beginner', 'Beginner', 'Beginner', 'Intermediate', 'Advanced']
+DURATIONS = ['2 months', '3 months', '4 months', '5 months', '6 months']
+CAREER_GOALS = [
+    'Software Developer', 'Data Analyst', 'Digital Marketer', 'Project Manager',
+    'UI/UX Designer', 'Business Analyst', 'Content Writer', 'Social Media Manager',
+    'Research Analyst', 'Government Officer', 'Healthcare Professional',
+    'Education Specialist', 'Environmental Consultant', 'Financial Advisor',
+    'Agriculture Specialist'
+]
+CITIES = [
+    ('Mumbai', 'Maharashtra'), ('Pune', 'Maharashtra'), ('Nagpur', 'Maharashtra'),
+    ('Bangalore', 'Karnataka'), ('Mysore', 'Karnataka'), ('Chennai', 'Tamil Nadu'),
+    ('Coimbatore', 'Tamil Nadu'), ('Hyderabad', 'Telangana'), ('Kolkata', 'West Bengal'),
+    ('Jaipur', 'Rajasthan'), ('Udaipur', 'Rajasthan'), ('Chandigarh', 'Punjab'),
+    ('Ludhiana', 'Punjab'), ('Gurgaon', 'Haryana'), ('Lucknow', 'Uttar Pradesh'),
+    ('Patna', 'Bihar'), ('Bhopal', 'Madhya Pradesh'), ('Ahmedabad', 'Gujarat'),
+    ('Kochi', 'Kerala'), ('Bhubaneswar', 'Odisha'), ('Guwahati', 'Assam')
+]
+SINGLE_NAME_LOCATIONS = ['New Delhi', 'Delhi', 'Goa']
+ROLE_WORDS = ['Intern', 'Research Intern', 'Analyst Intern', 'Trainee', 'Associate Intern', 'Fellow']
+ORG_SUFFIXES = ['Foundation', 'Initiative', 'Solutions', 'Ministry Cell', 'Institute', 'Association', 'Hub', 'Labs']
+
+
+class SyntheticDataGenerator:
+    """Deterministic generator of internships and candidate profiles.
+
+    Skills are biased towards the ones each sector already uses in the
+    bundled catalogue, so skill overlap and sector matches look like real
+    traffic rather than uniform noise.
+    """
+
+    def __init__(self, seed: int = 42, data_dir: str = 'data'):
+        self.rng = random.Random(seed)
+        with open(os.path.join(data_dir, 'sectors.json'), 'r', encoding='utf-8') as f:
+            self.sectors = json.load(f)
+        with open(os.path.join(data_dir, 'skills.json'), 'r', encoding='utf-8') as f:
+            self.skills = json.load(f)
+        with open(os.path.join(data_dir, 'internships.json'), 'r', encoding='utf-8') as f:
+            seed_internships = json.load(f)
+
+        self.sector_names = [sector['name'] for sector in self.sectors]
+        self.sector_skills: Dict[str, List[str]] = defaultdict(list)
+        self.sector_tags: Dict[str, List[str]] = defaultdict(list)
+        for internship in seed_internships:
+            self.sector_skills[internship['sector']].extend(internship['skills_required'])
+            self.sector_tags[internship['sector']].extend(internship.get('tags', []))
+        self.locations = [f"{city}, {state}" for city, state in CITIES] + SINGLE_NAME_LOCATIONS
+
+    def _pick_skills(self, sector: str, count: int) -> List[str]:
+        pool = self.sector_skills.get(sector) or self.skills
+        chosen = set()
+        while len(chosen) < count:
+            # Two thirds sector-typical skills, the rest from the full vocabulary
+            source = pool if self.rng.random() < 0.67 else self.skills
+            chosen.add(self.rng.choice(source))
+        return sorted(chosen)
+
+    def internship(self, internship_id: int) -> Dict[str, Any]:
+        rng = self.rng
+        sector = rng.choice(self.sector_names)
+        keywords = next((s.get('keywords', []) for s in self.sectors if s['name'] == sector), [])
+        skills = self._pick_skills(sector, rng.randint(2, 5))
+        focus = rng.choice(skills)
+        stipend = rng.randrange(5000, 20001, 500)
+        tag_pool = self.sector_tags.get(sector) or keywords or ['general']
+        return {
+            'id': internship_id,
+            'title': f"{focus} {rng.choice(ROLE_WORDS)}",
+            'organization': f"{sector} {rng.choice(ORG_SUFFIXES)} {internship_id % 997}",
+            'location': rng.choice(self.locations),
+            'duration': rng.choice(DURATIONS),
+            'stipend': f"₹{stipend:,}/month",
+            'sector': sector,
+            'skills_required': skills,
+            'education_level': rng.choice(EDUCATION_LEVELS),
+            'description': (f"Work on {', '.join(skills[:2]).lower()} for "
+                            f"{' and '.join(rng.sample(keywords, min(2, len(keywords))))} projects."),
+            'remote_work': rng.random() < 0.3,
+            'experience_level': rng.choice(EXPERIENCE_LEVELS),
+            'application_deadline': f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            'tags': sorted(set(rng.sample(tag_pool, min(3, len(tag_pool)))))
+        }
+
+    def internships(self, count: int, start_id: int = 1) -> List[Dict[str, Any]]:
+        return [self.internship(start_id + i) for i in range(count)]
+
+    def profile(self) -> Dict[str, Any]:
+        rng = self.rng
+        interests = rng.sample(self.sector_names, rng.randint(1, 3))
+        skills = set()
+        for sector in interests:
+            skills.update(self._pick_skills(sector, rng.randint(1, 3)))
+        profile = {
+            'education_level': rng.choice(EDUCATION_LEVELS),
+            'skills': sorted(skills),
+            'sector_interests': interests,
+            'location_preference': rng.choice(CITIES)[rng.randint(0, 1)],
+            'remote_work_preference': rng.random() < 0.4,
+            'experience_level': rng.choice(EXPERIENCE_LEVELS)
+        }
+        if rng.random() < 0.5:
+            profile['career_goal'] = rng.choice(CAREER_GOALS)
+        return profile
+
+    def profiles(self, count: int) -> Iterator[Dict[str, Any]]:
+        for _ in range(count):
+            yield self.profile()
+
+
+RESUME_NAMES = ['Aarav Sharma', 'Priya Nair', 'Rohan Gupta', 'Ananya Iyer', 'Vikram Singh',
+                'Sneha Reddy', 'Arjun Mehta', 'Kavya Joshi', 'Rahul Verma', 'Meera Pillai']
+DEGREES = ['B.Tech in Computer Science', 'B.Com', 'B.Sc in Statistics', 'BCA', 'B.A. in Economics',
+           'M.Tech in Data Science', 'MBA in Marketing', 'M.Sc in Environmental Science']
+COLLEGES = ['Delhi University', 'Anna University', 'University of Mumbai', 'IIT Madras',
+            'Jadavpur University', 'Osmania University', 'Panjab University']
+FILLER_SENTENCES = [
+    'Collaborated with a cross-functional team to deliver the project on schedule.',
+    'Prepared weekly reports and presented findings to stakeholders.',
+    'Coordinated field visits and documented outcomes for the programme.',
+    'Volunteered with a local NGO on community outreach activities.',
+    'Organised college events and managed logistics for participants.',
+    'Completed an online certification and applied it to a capstone project.'
+]
+
+
+class SyntheticResumeGenerator:
+    """Generates resume text of configurable length and skill density.
+
+    ``skill_vocabulary`` should contain the strings the extractor looks for
+    (``skills.json`` plus ``ResumeSkillExtractor._build_skill_patterns``), so
+    the skill matcher does realistic work.
+    """
+
+    def __init__(self, skill_vocabulary: List[str], seed: int = 42):
+        self.rng = random.Random(seed)
+        self.skill_vocabulary = sorted(set(skill_vocabulary))
+
+    def resume_lines(self, filler_lines: int = 20, skill_density: float = 0.3) -> List[str]:
+        rng = self.rng
+        name = rng.choice(RESUME_NAMES)
+        lines = [
+            name,
+            f"{name.split()[0].lower()}.{rng.randint(10, 99)}@example.com",
+            f"+91 9{rng.randint(100000000, 999999999)}",
+            '',
+            'Education',
+            f"{rng.choice(DEGREES)}, {rng.choice(COLLEGES)}, {rng.randint(2018, 2025)}",
+            '',
+            'Experience'
+        ]
+        for _ in range(filler_lines):
+            sentence = rng.choice(FILLER_SENTENCES)
+            if rng.random() < skill_density:
+                skills = rng.sample(self.skill_vocabulary, rng.randint(1, 3))
+                sentence = f"{sentence[:-1]} using {', '.join(skills)}."
+            lines.append(sentence)
+        lines.extend(['', 'Skills', ', '.join(rng.sample(self.skill_vocabulary, max(1, int(20 * skill_density))))])
+        return lines
+
+
+def write_txt_resume(path: str, lines: List[str]):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines))
+
+
+def write_docx_resume(path: str, lines: List[str]):
+    import docx  # python-docx
+    document = docx.Document()
+    for line in lines:
+        document.add_paragraph(line)
+    document.save(path)
+
+
+def _pdf_escape(text: str) -> str:
+    text = text.encode('latin-1', 'replace').decode('latin-1')
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def write_pdf_resume(path: str, lines: List[str], lines_per_page: int = 50):
+    """Write a minimal text PDF (Helvetica, one line per text row) without extra dependencies"""
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    objects: List[bytes] = []
+
+    def add(obj: str) -> int:
+        objects.append(obj.encode('latin-1'))
+        return len(objects)
+
+    catalog_id = add('')  # placeholder, filled once the page tree id is known
+    pages_id = add('')
+    font_id = add('<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>')
+    page_ids = []
+    for page_lines in pages:
+        rows = ''.join(f"({_pdf_escape(line)}) Tj T* " for line in page_lines)
+        stream = f"BT /F1 10 Tf 14 TL 50 780 Td {rows}ET"
+        content_id = add(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        page_ids.append(add(f"<< /Type /Page /Parent {pages_id} 0 R /MediaBox [0 0 595 842] "
+                            f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {content_id} 0 R >>"))
+    objects[catalog_id - 1] = f"<< /Type /Catalog /Pages {pages_id} 0 R >>".encode('latin-1')
+    kids = ' '.join(f"{pid} 0 R" for pid in page_ids)
+    objects[pages_id - 1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode('latin-1')
+
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode('latin-1') + body + b"\nendobj\n"
+    xref_offset = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode('latin-1')
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode('latin-1')
+    out += (f"trailer\n<< /Size {len(objects) + 1} /Root {catalog_id} 0 R >>\n"
+            f"startxref\n{xref_offset}\n%%EOF\n").encode('latin-1')
+    with open(path, 'wb') as f:
+        f.write(bytes(out))
+
+
+RESUME_WRITERS = {
+    '.txt': write_txt_resume,
+    '.docx': write_docx_resume,
+    '.pdf': write_pdf_resume
+}
@@ -0,0 +1,504 @@
+"""
+Candidate index for PM Internship Scheme
+Reverse matching: scores every registered candidate against one internship.
+Each candidate's matching features are encoded once, when the profile is
+saved, into columnar integer arrays (vocabulary ids for education,
+experience, location and goal; padded slot-major id arrays for skills
+(the engine's canonical skill ids, renumbered densely) and sector interests). A query evaluates each score component once per distinct
+vocabulary value using the engine's own component functions, then gathers
+and combines them for all candidates with numpy, so results equal
+``calculate_match_score`` while the per-candidate work is a few array
+lookups. Without numpy it falls back to scoring stored profiles one by one.
+"""
+
+import heapq
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from config import API_CONFIG
+from lazy_imports import optional_module
+
+
+class _Vocabulary:
+    """String -> dense id; id 0 is reserved for the empty value / padding"""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {'': 0}
+        self.values: List[str] = ['']
+
+    def id_for(self, value: Any) -> int:
+        value = str(value or '')
+        vocab_id = self.ids.get(value)
+        if vocab_id is None:
+            vocab_id = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return vocab_id
+
+
+def combine_components(components: Dict[str, Any], weights: Dict[str, float], np) -> Any:
+    """Weighted, normalised match score from ``CandidateIndex._components`` arrays.
+
+    Same weights and summation order as ``calculate_match_score``, so the
+    result equals it exactly; the arrays may have any (matching) shape.
+    """
+    score = weights['education_level'] * components['education_level']
+    term = np.empty_like(score)
+    for name in ('skills', 'sector_interests', 'location', 'career_goal', 'experience_level'):
+        np.multiply(components[name], weights[name], out=term)
+        score += term
+
+    base = weights['education_level'] + weights['skills'] + weights['sector_interests'] + weights['location']
+    score /= np.where(components['goal_applies'], base + weights['career_goal'] + weights['experience_level'],
+                      base + weights['experience_level'])
+    return np.clip(score, 0.0, 1.0, out=score)
+
+
+class CandidateIndex:
+    def __init__(self, engine, initial_capacity: int = 1024, max_skills: int = API_CONFIG['max_profile_skills'],
+                 max_interests: int = API_CONFIG['max_profile_sector_interests']):
+        """``max_skills``/``max_interests`` cap what is encoded per candidate (the first ones listed),
+        so one oversized profile cannot widen every row of the slot-major arrays"""
+        self.engine = engine
+        self.max_skills = max_skills
+        self.max_interests = max_interests
+        self._np = optional_module('numpy')
+        self._lock = threading.RLock()
+        self._rows: Dict[str, int] = {}
+        self._user_ids: List[Optional[str]] = []
+        self._free_rows: List[int] = []
+        # Write sequence number of each user's last upsert/remove, so a bulk load never overwrites newer data
+        self._sequence = 0
+        self._written_at: Dict[str, int] = {}
+        self._education = _Vocabulary()
+        self._experience = _Vocabulary()
+        self._locations = _Vocabulary()
+        self._goals = _Vocabulary()
+        self._interests = _Vocabulary()
+        # Canonical skill id -> dense id (from 1); canonical ids of unregistered skills are sparse hashes
+        self._skill_ids: Dict[int, int] = {}
+        # Highest number of skills / interests any candidate has had; later slots are all padding
+        self._skills_slots = 0
+        self._interests_slots = 0
+        # Percolator postings (skill / interest id -> rows), rebuilt lazily; rows written since are always scored
+        self._postings: Optional[Dict[str, Any]] = None
+        self._postings_rows = 0
+        self._changed_rows: Set[int] = set()
+        if self._np is None:
+            self._profiles: List[Optional[Dict[str, Any]]] = []
+        else:
+            self._allocate(initial_capacity, skills_width=8, interests_width=4)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _allocate(self, capacity: int, skills_width: int, interests_width: int):
+        """(Re)allocate the column arrays, keeping existing rows
+
+        Skills and interests are stored slot-major (``width x capacity``) so a
+        query walks one contiguous array per slot instead of gathering 2-D rows.
+        """
+        np = self._np
+        old = getattr(self, '_columns', None)
+        columns = {
+            'active': np.zeros(capacity, dtype=bool),
+            'remote': np.zeros(capacity, dtype=bool),
+            'education': np.zeros(capacity, dtype=np.int32),
+            'experience': np.zeros(capacity, dtype=np.int32),
+            'location': np.zeros(capacity, dtype=np.int32),
+            'goal': np.zeros(capacity, dtype=np.int32),
+            'skills': np.zeros((skills_width, capacity), dtype=np.int32),
+            'interests': np.zeros((interests_width, capacity), dtype=np.int32)
+        }
+        if old is not None:
+            n = min(len(self._user_ids), len(old['active']))
+            for name, array in old.items():
+                if array.ndim == 1:
+                    columns[name][:n] = array[:n]
+                else:
+                    columns[name][:array.shape[0], :n] = array[:, :n]
+        self._columns = columns
+
+    def _row_for(self, user_id: str) -> int:
+        row = self._rows.get(user_id)
+        if row is not None:
+            return row
+        if self._free_rows:
+            row = self._free_rows.pop()
+            self._user_ids[row] = user_id
+        else:
+            row = len(self._user_ids)
+            self._user_ids.append(user_id)
+            if self._np is None:
+                self._profiles.append(None)
+        self._rows[user_id] = row
+        return row
+
+    def upsert(self, user_id: str, candidate_profile: Dict[str, Any]):
+        """Encode (or re-encode) one candidate's matching features"""
+        with self._lock:
+            self._sequence += 1
+            self._written_at[user_id] = self._sequence
+            candidate_profile = self._capped(candidate_profile)
+            row = self._row_for(user_id)
+            if self._np is None:
+                self._profiles[row] = candidate_profile
+                return
+            if row < self._postings_rows:
+                self._changed_rows.add(row)
+
+            skills = sorted(self._skill_ids.setdefault(skill_id, len(self._skill_ids) + 1)
+                            for skill_id in self.engine.skill_registry.ids(candidate_profile['skills']))
+            interests = sorted({self._interests.id_for(i) for i in candidate_profile['sector_interests'] if i})
+            columns = self._columns
+            capacity = len(columns['active'])
+            skills_width = len(columns['skills'])
+            interests_width = len(columns['interests'])
+            if row >= capacity or len(skills) > skills_width or len(interests) > interests_width:
+                self._allocate(max(capacity * 2 if row >= capacity else capacity, row + 1),
+                               max(skills_width, len(skills)), max(interests_width, len(interests)))
+                columns = self._columns
+
+            columns['active'][row] = True
+            columns['remote'][row] = bool(candidate_profile.get('remote_work_preference', False))
+            columns['education'][row] = self._education.id_for(candidate_profile.get('education_level'))
+            columns['experience'][row] = self._experience.id_for(candidate_profile.get('experience_level', 'Beginner'))
+            columns['location'][row] = self._locations.id_for(candidate_profile.get('location_preference', ''))
+            columns['goal'][row] = self._goals.id_for(candidate_profile.get('career_goal', ''))
+            columns['skills'][:, row] = 0
+            columns['skills'][:len(skills), row] = skills
+            columns['interests'][:, row] = 0
+            columns['interests'][:len(interests), row] = interests
+            self._skills_slots = max(self._skills_slots, len(skills))
+            self._interests_slots = max(self._interests_slots, len(interests))
+
+    def _capped(self, candidate_profile: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy of the profile keeping its first ``max_skills`` distinct skills and ``max_interests`` interests"""
+        skills = list(candidate_profile.get('skills', []))
+        interests = list(candidate_profile.get('sector_interests', []))
+        if len(skills) > self.max_skills:
+            distinct = {}
+            for skill in skills:
+                distinct.setdefault(self.engine.skill_registry.canonical_id(skill), skill)
+                if len(distinct) > self.max_skills:
+                    break
+            distinct.pop(0, None)
+            skills = list(distinct.values())[:self.max_skills]
+        if len(interests) > self.max_interests:
+            interests = list(dict.fromkeys(interests))[:self.max_interests]
+        return dict(candidate_profile, skills=skills, sector_interests=interests)
+
+    def load(self, candidates: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        """Bulk upsert (user_id, candidate_profile) pairs; returns how many were indexed
+
+        Candidates upserted or removed since the load started are skipped: the
+        pairs may have been read before that newer write.
+        """
+        with self._lock:
+            started = self._sequence
+        count = 0
+        for user_id, candidate_profile in candidates:
+            with self._lock:
+                if self._written_at.get(user_id, 0) > started:
+                    continue
+                self.upsert(user_id, candidate_profile)
+            count += 1
+        return count
+
+    def remove(self, user_id: str):
+        with self._lock:
+            self._sequence += 1
+            self._written_at[user_id] = self._sequence
+            row = self._rows.pop(user_id, None)
+            if row is None:
+                return
+            self._user_ids[row] = None
+            self._free_rows.append(row)
+            if self._np is None:
+                self._profiles[row] = None
+            else:
+                self._columns['active'][row] = False
+
+    def top_candidates(self, internship: Dict[str, Any], k: int = 20) -> List[Dict[str, Any]]:
+        """The ``k`` best-matching candidates for ``internship``, best first"""
+        with self._lock:
+            if not self._rows or k <= 0:
+                return []
+            if self._np is None:
+                return self._top_candidates_scalar(internship, k)
+            scores, skills_fraction = self._score_all(internship)
+
+            np = self._np
+            n = len(self._user_ids)
+            k = min(k, len(self._rows))
+            if k < n:
+                top = np.argpartition(-scores, k - 1)[:k]
+            else:
+                top = np.arange(n)
+            # Highest score first; row order breaks ties so results are deterministic
+            top = top[np.lexsort((top, -scores[top]))]
+            return [self._result(self._user_ids[row], float(scores[row]), float(skills_fraction[row]))
+                    for row in top if scores[row] >= 0]
+
+    def percolate(self, internship: Dict[str, Any], min_score: float, limit: Optional[int] = None) -> Dict[str, Any]:
+        """Candidates scoring at least ``min_score`` for ``internship``, best first.
+
+        Standing-query matching for a new posting: skill and interest postings
+        plus each row's own columns bound every candidate's score, and only
+        candidates whose bound reaches ``min_score`` are scored exactly.
+        Returns up to ``limit`` matches, how many matched and how many were scored.
+        """
+        with self._lock:
+            if not self._rows:
+                return {'matches': [], 'matched': 0, 'scored': 0}
+            if self._np is None:
+                matches = self._top_candidates_scalar(internship, len(self._profiles), min_score)
+                return {'matches': matches[:limit], 'matched': len(matches), 'scored': len(self._rows)}
+
+            np = self._np
+            tables = self._tables(internship)
+            rows = self._candidate_rows(tables, len(self._user_ids), min_score)
+            scores, skills_fraction = self._score_rows(tables, rows)
+            keep = scores >= min_score
+            order = np.lexsort((rows[keep], -scores[keep]))[:limit]
+            rows, scores, skills_fraction = rows[keep][order], scores[keep][order], skills_fraction[keep][order]
+            matches = [self._result(self._user_ids[row], score, fraction)
+                       for row, score, fraction in zip(rows.tolist(), scores.tolist(), skills_fraction.tolist())]
+            return {'matches': matches, 'matched': int(keep.sum()), 'scored': len(keep)}
+
+    def _candidate_rows(self, tables: Dict[str, Any], n: int, min_score: float):
+        """Rows whose score could reach ``min_score``, from an upper bound built off the postings.
+
+        When no candidate can reach ``min_score`` without a required skill or
+        a sector interest, only rows in those postings are bounded; otherwise
+        every row is. Skill overlap and best sector interest come from the
+        postings, the other components from each row's own columns. Rows
+        changed since the postings were built are always included, as their
+        postings may be stale.
+        """
+        np = self._np
+        stale = len(self._changed_rows) + n - self._postings_rows
+        if self._postings is None or stale > max(1024, n // 20):
+            self._build_postings(n)
+        weights = self.engine.weights
+        columns = self._columns
+
+        def posting_rows(name: str, key_ids):
+            ids, rows = self._postings[name]
+            key_ids = key_ids.astype(ids.dtype)
+            starts = np.searchsorted(ids, key_ids, side='left').tolist()
+            stops = np.searchsorted(ids, key_ids, side='right').tolist()
+            return [rows[start:stop] for start, stop in zip(starts, stops)]
+
+        required_ids = np.flatnonzero(tables['required_mask'])
+        skill_hits = np.concatenate(posting_rows('skills', required_ids) + [np.zeros(0, dtype=np.int64)])
+        interest_ids = np.flatnonzero(tables['sector'] > 0)
+        interest_rows = posting_rows('interests', interest_ids)
+        always = [np.fromiter(self._changed_rows, dtype=np.int64, count=len(self._changed_rows)),
+                  np.arange(self._postings_rows, n)]
+        touched = len(skill_hits) + sum(len(hits) for hits in interest_rows)
+        # Sorting the postings only pays off while they cover a small share of the rows
+        if touched < n // 8 and self._unkeyed_bound(tables) < min_score - 1e-9:
+            rows = select = np.unique(np.concatenate([skill_hits] + interest_rows + always))
+            skill_hits.sort()
+            skills = np.searchsorted(skill_hits, rows, side='right') - np.searchsorted(skill_hits, rows, side='left')
+        else:
+            rows, select = np.arange(n), slice(0, n)
+            skills = np.bincount(skill_hits, minlength=n)[:n]
+
+        # Score bound for each of ``rows`` (sorted), summed in calculate_match_score's order
+        sector = np.zeros(len(rows))
+        for key_id, hits in zip(interest_ids.tolist(), interest_rows):
+            positions = hits if isinstance(select, slice) else np.searchsorted(rows, hits)
+            sector[positions] = np.maximum(sector[positions], tables['sector'][key_id])
+        goal_ids = columns['goal'][select]
+        location_ids = columns['location'][select]
+        bound = weights['education_level'] * tables['education'][columns['education'][select]]
+        if tables['required_count']:
+            bound += weights['skills'] * skills / tables['required_count']
+        bound += weights['sector_interests'] * sector
+        bound += weights['location'] * np.where(columns['remote'][select], tables['location_remote'][location_ids],
+                                                tables['location'][location_ids])
+        bound += weights['career_goal'] * tables['goal'][goal_ids]
+        bound += weights['experience_level'] * tables['experience'][columns['experience'][select]]
+        base = weights['education_level'] + weights['skills'] + weights['sector_interests'] + weights['location']
+        bound /= np.where(tables['goal_applies'][goal_ids], base + weights['career_goal'], base) + \
+            weights['experience_level']
+
+        # The bound only skips rows; leave slack for rounding so no match is lost
+        return np.unique(np.concatenate([rows[bound >= min_score - 1e-9]] + always))
+
+    def _unkeyed_bound(self, tables: Dict[str, Any]) -> float:
+        """Best score possible for this posting without a required skill or a matching sector interest"""
+        weights = self.engine.weights
+        rest = weights['education_level'] * tables['education'].max() + \
+            weights['location'] * max(tables['location'].max(), tables['location_remote'].max()) + \
+            weights['experience_level'] * tables['experience'].max()
+        base = weights['education_level'] + weights['skills'] + weights['sector_interests'] + weights['location']
+        bound = rest / (base + weights['experience_level'])
+        if tables['goal_applies'].any():
+            goal = weights['career_goal'] * tables['goal'][tables['goal_applies']].max()
+            bound = max(bound, (rest + goal) / (base + weights['career_goal'] + weights['experience_level']))
+        return float(bound)
+
+    def _build_postings(self, n: int):
+        """Sorted (key id, row) arrays for skills and sector interests"""
+        np = self._np
+        columns = self._columns
+
+        def postings(slots) -> Tuple[Any, Any]:
+            ids = slots.ravel()
+            rows = np.broadcast_to(np.arange(n), slots.shape).ravel()
+            present = ids > 0
+            ids, rows = ids[present], rows[present]
+            order = np.argsort(ids, kind='stable')
+            return ids[order], rows[order]
+
+        self._postings = {
+            'skills': postings(columns['skills'][:self._skills_slots, :n]),
+            'interests': postings(columns['interests'][:self._interests_slots, :n])
+        }
+        self._postings_rows = n
+        self._changed_rows = set()
+
+    def top_postings(self, internships: List[Dict[str, Any]], per_candidate: int = 20,
+                     min_score: float = 0.0, block_rows: int = 8192):
+        """Each candidate's ``per_candidate`` best postings: sparse edges for global allocation.
+
+        Returns ``(user_ids, postings, scores)``: ``postings[r]`` holds indexes
+        into ``internships`` (best first, -1 where fewer than ``per_candidate``
+        reach ``min_score``) and ``scores[r]`` the matching scores. Candidates
+        are scored in blocks of ``block_rows`` so memory stays at
+        ``len(internships) x block_rows`` however many candidates are indexed.
+        """
+        np = self._np
+        if np is None:
+            raise RuntimeError('top_postings requires numpy')
+        with self._lock:
+            n = len(self._user_ids)
+            width = min(per_candidate, len(internships))
+            postings = np.full((n, width), -1, dtype=np.int32)
+            scores = np.zeros((n, width), dtype=np.float64)
+            tables = [self._tables(internship) for internship in internships]
+            for start in range(0, n, block_rows):
+                stop = min(start + block_rows, n)
+                block = np.empty((len(internships), stop - start), dtype=np.float64)
+                for column, table in enumerate(tables):
+                    block[column] = self._score_rows(table, slice(start, stop))[0]
+                if width < len(internships):
+                    best = np.argpartition(-block, width - 1, axis=0)[:width]
+                else:
+                    best = np.broadcast_to(np.arange(len(internships))[:, None], block.shape)
+                best_scores = np.take_along_axis(block, best, axis=0)
+                order = np.argsort(-best_scores, axis=0, kind='stable')
+                best = np.take_along_axis(best, order, axis=0).T
+                best_scores = np.take_along_axis(best_scores, order, axis=0).T
+                keep = best_scores >= max(min_score, 0.0)
+                postings[start:stop] = np.where(keep, best, -1)
+                scores[start:stop] = np.where(keep, best_scores, 0.0)
+            return list(self._user_ids), postings, scores
+
+    def _score_all(self, internship: Dict[str, Any]):
+        """Match score and skills fraction of every row; inactive rows score -1"""
+        return self._score_rows(self._tables(internship), slice(0, len(self._user_ids)))
+
+    def _tables(self, internship: Dict[str, Any]) -> Dict[str, Any]:
+        """Each score component evaluated once per vocabulary value for ``internship``"""
+        np = self._np
+        engine = self.engine
+
+        def table(vocabulary: _Vocabulary, component) -> Any:
+            return np.array([component(value) for value in vocabulary.values], dtype=np.float64)
+
+        goal_matches = [engine._goal_match(value, internship) for value in self._goals.values]
+        sector_name = internship.get('sector', '')
+        required = self.engine.required_skill_ids(internship)
+        required_mask = np.zeros(len(self._skill_ids) + 1, dtype=bool)
+        for skill_id in required:
+            dense_id = self._skill_ids.get(skill_id)
+            if dense_id:
+                required_mask[dense_id] = True
+
+        return {
+            'education': table(self._education, lambda value: engine._education_match(
+                value, internship.get('education_level'))),
+            'experience': table(self._experience, lambda value: engine._experience_match(
+                value, internship.get('experience_level', 'Beginner'))),
+            'location': table(self._locations, lambda value: engine._location_match(value, False, internship)),
+            'location_remote': table(self._locations, lambda value: engine._location_match(value, True, internship)),
+            'goal': np.array([match or 0.0 for match in goal_matches], dtype=np.float64),
+            'goal_applies': np.array([match is not None for match in goal_matches], dtype=bool),
+            'sector': table(self._interests, lambda value: engine._sector_match([value], sector_name) if value else 0.0),
+            'required_mask': required_mask,
+            'required_count': len(required)
+        }
+
+    def component_scores(self, internship: Dict[str, Any]) -> Dict[str, Any]:
+        """Unweighted score components of every row for ``internship`` (see ``_components``)"""
+        if self._np is None:
+            raise RuntimeError('component_scores requires numpy')
+        with self._lock:
+            return self._components(self._tables(internship), slice(0, len(self._user_ids)))
+
+    def _components(self, tables: Dict[str, Any], rows) -> Dict[str, Any]:
+        """Per-component match values of ``rows``, keyed like the engine's weights, plus
+        ``goal_applies`` (the goal weight counts towards the maximum) and ``active``"""
+        np = self._np
+        columns = self._columns
+        n = len(columns['active'][rows])
+
+        location_ids = columns['location'][rows]
+        goal_ids = columns['goal'][rows]
+        matched = np.zeros(n, dtype=np.int32)
+        if tables['required_count']:
+            for slot in columns['skills'][:self._skills_slots]:
+                matched += tables['required_mask'][slot[rows]]
+            skills_fraction = matched / tables['required_count']
+        else:
+            skills_fraction = np.zeros(n)
+        best_sector = np.zeros(n)
+        for slot in columns['interests'][:self._interests_slots]:
+            np.maximum(best_sector, tables['sector'][slot[rows]], out=best_sector)
+
+        return {
+            'education_level': tables['education'][columns['education'][rows]],
+            'skills': skills_fraction,
+            'sector_interests': best_sector,
+            'location': np.where(columns['remote'][rows], tables['location_remote'][location_ids],
+                                 tables['location'][location_ids]),
+            'career_goal': tables['goal'][goal_ids],
+            'experience_level': tables['experience'][columns['experience'][rows]],
+            'goal_applies': tables['goal_applies'][goal_ids],
+            'active': columns['active'][rows]
+        }
+
+    def _score_rows(self, tables: Dict[str, Any], rows):
+        """Match score and skills fraction of ``rows`` (a slice or row array); inactive rows score -1"""
+        np = self._np
+        components = self._components(tables, rows)
+        score = combine_components(components, self.engine.weights, np)
+        return np.where(components['active'], score, -1.0), components['skills']
+
+    def _top_candidates_scalar(self, internship: Dict[str, Any], k: int,
+                               min_score: float = 0.0) -> List[Dict[str, Any]]:
+        registry = self.engine.skill_registry
+        required = self.engine.required_skill_ids(internship)
+        scored = []
+        for row, profile in enumerate(self._profiles):
+            if profile is None:
+                continue
+            skills_fraction = self.engine._skills_match(registry.ids(profile.get('skills', [])), required)
+            score = self.engine.calculate_match_score(profile, internship, skills_match=skills_fraction)
+            if score < min_score:
+                continue
+            scored.append((score, -row, skills_fraction))
+        best = heapq.nlargest(k, scored)
+        return [self._result(self._user_ids[-neg_row], score, skills_fraction)
+                for score, neg_row, skills_fraction in best]
+
+    @staticmethod
+    def _result(user_id: str, score: float, skills_fraction: float) -> Dict[str, Any]:
+        return {
+            'user_id': user_id,
+            'match_score': min(max(round(score * 100, 1), 0), 100),
+            'skills_match_percentage': round(min(max(skills_fraction * 100.0, 0), 100), 1)
+        }
@@ -1,5 +1,7 @@
 # Configuration file for PM Internship Scheme Recommendation Engine
 
+import os
+
 # Flask Configuration
 DEBUG = True
 SECRET_KEY = 'pm-internship-recommendation-engine-2024'
@@ -9,11 +11,14 @@ MAX_RECOMMENDATIONS = 20  # Increased from 5 to show more internships
 MIN_MATCH_SCORE = 0.1  # Minimum score to include in recommendations
 
 # Scoring Weights
+# Relative weight of each component in calculate_match_score; scores are divided by the
+# sum of the weights that apply, so they need not add up to 1
 SCORING_WEIGHTS = {
     'education_level': 0.30,    # 30% weight for education match
     'skills': 0.25,             # 25% weight for skills match
     'sector_interests': 0.20,   # 20% weight for sector interest match
     'location': 0.15,           # 15% weight for location preference
+    'career_goal': 0.15,        # 15% weight for career goal, only when the candidate has a known goal
     'experience_level': 0.10    # 10% weight for experience level match
 }
 
@@ -36,5 +41,132 @@ UI_CONFIG = {
 API_CONFIG = {
     'rate_limit': 100,  # requests per minute
     'timeout': 30,      # seconds
-    'max_content_length': 16 * 1024 * 1024  # 16MB
+    'max_content_length': 5 * 1024 * 1024 + 256 * 1024,  # whole request body: one resume plus form fields
+    'max_resume_size': 5 * 1024 * 1024,       # 5MB per resume file, matches the upload form
+    'max_profile_skills': 100,                # per saved profile; also caps the candidate index's row width
+    'max_profile_sector_interests': 20
+}
+
+# Background Job Queue Configuration (async resume processing)
+JOB_QUEUE_CONFIG = {
+    'max_workers': 4,       # worker threads parsing resumes
+    'max_pending': 32,      # queued + running jobs before returning 429
+    'job_timeout': 60,      # seconds before a job is reported as timed out
+    'result_ttl': 600       # seconds a finished job's result stays pollable
+}
+
+# Recommendation Precompute Queue Configuration (re-ranks saved profiles in the background)
+# Separate from JOB_QUEUE_CONFIG so a burst of profile saves cannot fill the resume queue
+PRECOMPUTE_QUEUE_CONFIG = {
+    'max_workers': 2,
+    'max_pending': 64,      # beyond this, recommendations are computed on read instead
+    'job_timeout': 30,
+    'result_ttl': 60
+}
+
+# Resume Extraction Cache Configuration
+RESUME_CACHE_CONFIG = {
+    'max_entries': 1024,    # in-memory LRU size
+    'persist_dir': None     # e.g. 'data/resume_cache' to keep results across restarts
+}
+
+# Resume Storage Configuration (content-addressed uploads)
+STORAGE_CONFIG = {
+    'upload_folder': 'static/uploads',
+    'refs_db': 'data/internmatch.db',       # user -> stored resume table, shared by all workers; kept out of static/
+    'legacy_refs_file': 'data/resume_refs.json',    # imported into refs_db once if present
+    'gc_interval': 3600,        # seconds between orphaned-file sweeps
+    'gc_grace_period': 3600     # unreferenced files younger than this are kept
+}
+
+# Profile Database Configuration
+DATABASE_CONFIG = {
+    'backend': 'sqlite',              # 'sqlite' (shared, durable) or 'memory' (single process)
+    'path': 'data/internmatch.db',
+    'busy_timeout_ms': 5000           # how long a writer waits for the lock
+}
+
+# Request Timing Configuration (Server-Timing header and per-stage aggregates)
+TIMING_CONFIG = {
+    'enabled': True,            # False skips all stage bookkeeping
+    'server_timing_header': True    # expose stage durations to clients/browser devtools
+}
+
+# Metrics Configuration (Prometheus text format at /metrics)
+METRICS_CONFIG = {
+    'enabled': True     # False stops per-request counting; /metrics still serves engine counters
+}
+
+# Request Profiling Configuration (admin only)
+PROFILING_CONFIG = {
+    # Profiling is off unless a token is set; send it as X-Admin-Token with ?profile=cprofile|sample
+    'admin_token': os.environ.get('INTERNMATCH_ADMIN_TOKEN'),
+    'output_dir': 'data/profiles',
+    'keep_profiles': 50,        # oldest stored profiles are deleted beyond this
+    'slow_requests': 20,        # size of the slowest-requests buffer
+    'max_input_chars': 2000     # request inputs kept per slow request
+}
+
+# Logging Configuration (JSON lines to stderr through a background writer thread)
+LOGGING_CONFIG = {
+    'level': 'INFO',
+    'format': 'json',           # 'json' or 'text'
+    'queue_size': 10000,        # records beyond this are dropped rather than blocking requests
+    'sample_rates': {           # fraction of INFO/DEBUG records kept per event; warnings are never sampled
+        'resume.extracted': 0.1
+    }
+}
+
+# Startup Configuration
+STARTUP_CONFIG = {
+    'warm_up': True,                        # preload resume parsers on a background thread after boot
+    # Resume parsers and the ball tree behind location matching; pandas and the
+    # rest of sklearn stay lazy: nothing on the request path needs them
+    'warm_up_modules': ['PyPDF2', 'docx', 'sklearn.neighbors']
+}
+
+# Seat Allocation Configuration (python allocation.py)
+ALLOCATION_CONFIG = {
+    'default_capacity': 10,         # seats for postings without a 'capacity' field
+    'edges_per_candidate': 20,      # each candidate competes for their best N postings only
+    'min_score': MIN_MATCH_SCORE,   # same cut-off as get_recommendations
+    'epsilon': 0.001,               # final auction bid increment; total is within epsilon per placement of optimal
+    'max_auction_edges': 10_000_000     # above this the greedy pass is used instead of the auction
+}
+
+# Posting Alerts Configuration (saved candidates matched against new postings)
+ALERTS_CONFIG = {
+    'min_score': 0.6,       # match score (0-1) a candidate needs to be alerted
+    'max_alerts': 1000      # alerts returned per posting; the total matched is always reported
+}
+
+# Diversity Re-ranking Configuration (the "diversity" option on /api/recommendations)
+DIVERSITY_CONFIG = {
+    'pool_size': 300,           # best-scoring postings the re-ranker chooses from
+    'max_pool_size': 2000,
+    'mmr_lambda': 0.7,          # 1.0 = relevance only, lower values trade score for variety
+    'similarity_weights': {     # posting-to-posting similarity; weights sum to 1
+        'sector': 0.35,
+        'organization': 0.25,
+        'location': 0.2,
+        'skills': 0.2
+    }
+}
+
+# Location Matching Configuration (offline gazetteer of Indian cities and states)
+LOCATION_CONFIG = {
+    'gazetteer': 'data/gazetteer.json',
+    'same_area_km': 40,     # within this distance counts as the preferred city (e.g. Delhi and Gurugram)
+    'nearby_km': 150        # same state or within this distance earns partial location credit
+}
+
+# Skill Canonicalization Configuration (aliases and typo tolerance for skill matching)
+SKILLS_CONFIG = {
+    'aliases': 'data/skill_aliases.json',
+    'vocabulary': 'data/skills.json',
+    'min_fuzzy_length': 7,          # shorter skills ("Excel", "Sales", "Baking") must match an alias exactly
+    'max_edit_distance': 2,         # for skills of 9+ characters; shorter ones allow a single edit
+    'min_trigram_similarity': 0.5,  # trigram overlap a spelling needs before edit distance is checked
+    'suggestions': 8,               # default results from /api/skills/suggest
+    'max_suggestions': 20
 }
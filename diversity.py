@@ -0,0 +1,175 @@
+"""
+Diversity-aware re-ranking for PM Internship Scheme recommendations
+The match score only depends on a few categorical matches, so a plain top-k
+is often many near-identical postings from one sector, organisation and
+city. ``diversify`` re-ranks a pool of the best-scoring postings with
+maximal marginal relevance (MMR) and optional per-sector / organisation /
+location quotas. Posting features are encoded once per catalogue in
+``PostingFeatures``; similarity between two postings is a weighted sum of
+"same sector", "same organisation", "same location" and the cosine overlap
+of their required skills, so it lies in [0, 1].
+"""
+
+import math
+from typing import Any, Dict, List, Optional
+
+from lazy_imports import optional_module
+
+QUOTA_FIELDS = {
+    'max_per_sector': 'sector',
+    'max_per_organization': 'organization',
+    'max_per_location': 'location'
+}
+
+
+class PostingFeatures:
+    """Feature encoding of one catalogue list, aligned with its positions"""
+
+    def __init__(self, internships: List[Dict[str, Any]], weights: Dict[str, float]):
+        self.internships = internships
+        self.weights = dict(weights)
+        self._np = optional_module('numpy')
+        self.groups: Dict[str, List[int]] = {}
+        for field in ('sector', 'organization', 'location'):
+            ids: Dict[str, int] = {}
+            self.groups[field] = [ids.setdefault(str(internship.get(field, '') or '').lower(), len(ids))
+                                  for internship in internships]
+
+        skill_ids: Dict[str, int] = {}
+        self.skills = [sorted({skill_ids.setdefault(skill.lower(), len(skill_ids))
+                               for skill in internship.get('skills_required', [])})
+                       for internship in internships]
+        if self._np is not None:
+            np = self._np
+            self.group_arrays = {field: np.asarray(ids, dtype=np.int32) for field, ids in self.groups.items()}
+            width = max([len(skills) for skills in self.skills] + [1])
+            # Padded skill ids (-1 for empty slots) and 1/sqrt(skill count) for the cosine
+            self.skill_matrix = np.full((len(internships), width), -1, dtype=np.int32)
+            for position, skills in enumerate(self.skills):
+                self.skill_matrix[position, :len(skills)] = skills
+            counts = np.asarray([len(skills) for skills in self.skills], dtype=np.float64)
+            self.skill_norms = np.divide(1.0, np.sqrt(counts), out=np.zeros_like(counts), where=counts > 0)
+        else:
+            self.skill_sets = [set(skills) for skills in self.skills]
+
+    def gather(self, pool: List[int]):
+        """Feature rows of the postings in ``pool``, for repeated ``similarity`` calls"""
+        if self._np is None:
+            return pool
+        return {
+            'groups': {field: ids[pool] for field, ids in self.group_arrays.items()},
+            'skills': self.skill_matrix[pool],
+            'norms': self.skill_norms[pool]
+        }
+
+    def similarity(self, pool, position: int):
+        """Similarity of each posting in a ``gather``-ed pool to the posting at ``position``"""
+        weights = self.weights
+        if self._np is None:
+            skills = self.skill_sets[position]
+            values = []
+            for other in pool:
+                value = sum(weights[field] for field, ids in self.groups.items() if ids[other] == ids[position])
+                other_skills = self.skill_sets[other]
+                if skills and other_skills:
+                    value += weights['skills'] * len(skills & other_skills) / math.sqrt(len(skills) * len(other_skills))
+                values.append(value)
+            return values
+
+        np = self._np
+        values = np.zeros(len(pool['norms']))
+        for field, ids in pool['groups'].items():
+            values += weights[field] * (ids == self.group_arrays[field][position])
+        own = self.skill_matrix[position]
+        own = own[own >= 0]
+        if len(own):
+            # Skill ids are unique within a posting, so this counts the shared skills
+            shared = (pool['skills'][:, :, None] == own).sum(axis=(1, 2))
+            values += weights['skills'] * shared * pool['norms'] * self.skill_norms[position]
+        return values
+
+
+def diversify(pool: List[int], relevance: List[float], features: PostingFeatures, count: int,
+              mmr_lambda: float = 1.0, quotas: Optional[Dict[str, int]] = None) -> List[int]:
+    """Pick ``count`` positions from ``pool`` (best relevance first) by MMR under quotas.
+
+    Each step takes the posting maximising
+    ``mmr_lambda * relevance - (1 - mmr_lambda) * max similarity to those already picked``,
+    skipping postings whose sector / organisation / location already used up
+    its quota. ``mmr_lambda=1`` with no quotas returns the pool order unchanged.
+    """
+    quotas = {QUOTA_FIELDS[name]: limit for name, limit in (quotas or {}).items() if limit is not None}
+    used = {field: {} for field in quotas}
+    np = features._np
+    penalty = 1.0 - mmr_lambda
+    picked: List[int] = []
+    if np is None:
+        relevance = [mmr_lambda * value for value in relevance]
+        max_similarity = [0.0] * len(pool)
+        available = [True] * len(pool)
+    else:
+        relevance = mmr_lambda * np.asarray(relevance, dtype=np.float64)
+        max_similarity = np.zeros(len(pool))
+        available = np.ones(len(pool), dtype=bool)
+    rows = features.gather(pool)
+
+    values = relevance
+    while len(picked) < count:
+        if np is None:
+            candidates = [slot for slot in range(len(pool)) if available[slot]]
+            best = max(candidates, key=lambda slot: values[slot]) if candidates else -1
+        else:
+            best = int(np.argmax(np.where(available, values, -np.inf))) if available.any() else -1
+        if best < 0:
+            break
+
+        position = pool[best]
+        picked.append(position)
+        available[best] = False
+        for field, limit in quotas.items():
+            group = features.groups[field][position]
+            used[field][group] = used[field].get(group, 0) + 1
+            if used[field][group] < limit:
+                continue
+            if np is None:
+                for slot, other in enumerate(pool):
+                    if features.groups[field][other] == group:
+                        available[slot] = False
+            else:
+                available &= rows['groups'][field] != group
+        if penalty > 0:
+            similarity = features.similarity(rows, position)
+            if np is None:
+                max_similarity = [max(a, b) for a, b in zip(max_similarity, similarity)]
+                values = [value - penalty * most for value, most in zip(relevance, max_similarity)]
+            else:
+                np.maximum(max_similarity, similarity, out=max_similarity)
+                values = relevance - penalty * max_similarity
+    return picked
+
+
+def diversity_options(raw: Any, defaults: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate the ``diversity`` request option (``true`` or an object); raises ValueError"""
+    if raw is True:
+        raw = {}
+    if not isinstance(raw, dict):
+        raise ValueError('diversity must be true or an object')
+    unknown = set(raw) - {'mmr_lambda', 'pool_size'} - set(QUOTA_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown diversity option: {', '.join(sorted(unknown))}")
+
+    mmr_lambda = raw.get('mmr_lambda', defaults['mmr_lambda'])
+    if isinstance(mmr_lambda, bool) or not isinstance(mmr_lambda, (int, float)) or not 0 <= mmr_lambda <= 1:
+        raise ValueError('mmr_lambda must be a number between 0 and 1')
+    pool_size = raw.get('pool_size', defaults['pool_size'])
+    if isinstance(pool_size, bool) or not isinstance(pool_size, int) or not 1 <= pool_size <= defaults['max_pool_size']:
+        raise ValueError(f"pool_size must be an integer between 1 and {defaults['max_pool_size']}")
+    quotas = {}
+    for name in QUOTA_FIELDS:
+        limit = raw.get(name)
+        if limit is None:
+            continue
+        if isinstance(limit, bool) or not isinstance(limit, int) or limit < 1:
+            raise ValueError(f'{name} must be a positive integer')
+        quotas[name] = limit
+    return {'mmr_lambda': float(mmr_lambda), 'pool_size': pool_size, 'quotas': quotas}
@@ -0,0 +1,151 @@
+"""
+Offline gazetteer for PM Internship Scheme location matching
+Resolves free-text locations ("Bengaluru", "Gurgaon, Haryana", "Orissa")
+to a bundled list of Indian cities and states with aliases and coordinates
+(data/gazetteer.json), so location scoring compares places instead of raw
+strings. ``LocationIndex`` parses a catalogue's locations once and answers
+"postings within N km" with one ball-tree query over their coordinates.
+"""
+
+import json
+import logging
+import math
+import re
+import threading
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from lazy_imports import optional_module
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+class Place(NamedTuple):
+    """A city (with coordinates) or a whole state (``lat``/``lon`` None)"""
+    name: str
+    state: str
+    lat: Optional[float] = None
+    lon: Optional[float] = None
+
+
+def haversine_km(a: Place, b: Place) -> float:
+    """Great-circle distance between two places with coordinates"""
+    lat1, lon1, lat2, lon2 = map(math.radians, (a.lat, a.lon, b.lat, b.lon))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(h)))
+
+
+def _normalize(text: str) -> str:
+    return ' '.join(re.sub(r'[.\-()]', ' ', text.lower().replace('&', ' and ')).split())
+
+
+class Gazetteer:
+    """Alias lookup over the bundled cities and states; results are cached per string"""
+
+    def __init__(self, path: str = 'data/gazetteer.json', cache_size: int = 10000):
+        self._places: Dict[str, List[Place]] = {}
+        self._states: Dict[str, Place] = {}
+        self._cache: Dict[str, Optional[Place]] = {}
+        self._cache_size = cache_size
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            logger.warning("Gazetteer not found at %s; locations are matched by name only", path,
+                           extra={'event': 'gazetteer.missing'})
+            return
+
+        for state in data.get('states', []):
+            place = Place(state['name'], state['name'])
+            for alias in [state['name']] + state.get('aliases', []):
+                self._states[_normalize(alias)] = place
+        # Listed in order of preference, so an ambiguous name resolves to the first entry
+        for entry in data.get('places', []):
+            place = Place(entry['name'], entry['state'], float(entry['lat']), float(entry['lon']))
+            for alias in [entry['name']] + entry.get('aliases', []):
+                self._places.setdefault(_normalize(alias), []).append(place)
+
+    def resolve(self, text: Any) -> Optional[Place]:
+        """The city or state named by ``text``, or None if it is empty or unknown"""
+        text = str(text or '')
+        if text in self._cache:
+            return self._cache[text]
+        place = self._parse(text)
+        if len(self._cache) >= self._cache_size:
+            self._cache.clear()
+        self._cache[text] = place
+        return place
+
+    def _parse(self, text: str) -> Optional[Place]:
+        parts = [_normalize(part) for part in re.split(r'[,/|;]', text)]
+        parts = [part for part in parts if part]
+        if not parts:
+            return None
+        state = next((self._states[part] for part in reversed(parts) if part in self._states), None)
+        for part in parts:
+            candidates = self._places.get(part)
+            if candidates:
+                if state is not None:
+                    # "Aurangabad, Maharashtra": prefer the entry in the named state
+                    return next((place for place in candidates if place.state == state.state), candidates[0])
+                return candidates[0]
+        return state
+
+
+class LocationIndex:
+    """Resolved places of one catalogue list, aligned with its positions, with a spatial index"""
+
+    def __init__(self, gazetteer: Gazetteer, internships: List[Dict[str, Any]]):
+        self.internships = internships
+        self.places: List[Optional[Place]] = [gazetteer.resolve(internship.get('location', ''))
+                                              for internship in internships]
+        # One point per distinct city; each lists the catalogue positions located there
+        points: Dict[Place, List[int]] = {}
+        for position, place in enumerate(self.places):
+            if place is not None and place.lat is not None:
+                points.setdefault(place, []).append(position)
+        self._points = list(points)
+        self._positions = list(points.values())
+        self._tree = None
+        self._tree_lock = threading.Lock()
+
+    def within(self, place: Optional[Place], km: float) -> Dict[int, float]:
+        """Catalogue positions at most ``km`` from ``place``, with their distance in km"""
+        if place is None or place.lat is None or not self._points:
+            return {}
+        result = {}
+        for point in self._query(place, km):
+            distance = haversine_km(place, self._points[point])
+            if distance <= km:
+                for position in self._positions[point]:
+                    result[position] = distance
+        return result
+
+    def _query(self, place: Place, km: float) -> List[int]:
+        """Indexes of points that may lie within ``km``; exact distances are checked by the caller"""
+        np = optional_module('numpy')
+        if np is None:
+            return list(range(len(self._points)))
+        # Slightly widened radius: the caller's haversine check is the exact cut-off
+        radius = km / EARTH_RADIUS_KM * (1 + 1e-9) + 1e-12
+        target = np.radians([[place.lat, place.lon]])
+        tree = self._ball_tree(np)
+        if tree is not None:
+            return tree.query_radius(target, r=radius)[0].tolist()
+        coordinates = np.radians([[point.lat, point.lon] for point in self._points])
+        h = np.sin((coordinates[:, 0] - target[0, 0]) / 2) ** 2 + \
+            np.cos(target[0, 0]) * np.cos(coordinates[:, 0]) * np.sin((coordinates[:, 1] - target[0, 1]) / 2) ** 2
+        return np.nonzero(2 * np.arcsin(np.minimum(1.0, np.sqrt(h))) <= radius)[0].tolist()
+
+    def _ball_tree(self, np):
+        """Haversine ball tree over the points (scikit-learn), built on first use"""
+        if self._tree is None:
+            neighbors = optional_module('sklearn.neighbors')
+            if neighbors is None:
+                return None
+            with self._tree_lock:
+                if self._tree is None:
+                    self._tree = neighbors.BallTree(
+                        np.radians([[point.lat, point.lon] for point in self._points]), metric='haversine')
+        return self._tree
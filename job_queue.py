@@ -0,0 +1,147 @@
+"""
+Background job queue for PM Internship Scheme
+Runs slow work (resume parsing) off the request thread with bounded depth
+"""
+
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+class JobQueueFull(Exception):
+    """Raised when the queue already holds the maximum number of jobs"""
+
+
+class BackgroundJobQueue:
+    """Bounded thread-pool job queue with status polling and per-job timeouts.
+
+    Jobs move through ``queued -> running -> done | failed | timeout``.
+    A job that exceeds ``job_timeout`` is reported as ``timeout`` and its
+    result is discarded; the worker thread is left to finish on its own,
+    since Python threads cannot be interrupted safely.
+    """
+
+    def __init__(self, max_workers: int = 4, max_pending: int = 32,
+                 job_timeout: float = 60.0, result_ttl: float = 600.0):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.job_timeout = job_timeout
+        self.result_ttl = result_ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job-worker')
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+
+    def submit(self, func: Callable[..., Any], *args: Any,
+               cleanup: Optional[Callable[[], None]] = None) -> str:
+        """Queue ``func(*args)`` and return its job id.
+
+        Raises JobQueueFull when ``max_pending`` jobs are already queued or
+        running. ``cleanup`` always runs once the job has finished or been
+        dropped, so callers can hand over temp files.
+        """
+        if not self._slots.acquire(blocking=False):
+            if cleanup:
+                cleanup()
+            raise JobQueueFull('Job queue is full, please retry later')
+
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._purge_expired()
+            self._jobs[job_id] = {
+                'id': job_id,
+                'status': 'queued',
+                'created_at': time.time(),
+                'started_at': None,
+                'finished_at': None,
+                'result': None,
+                'error': None
+            }
+
+        try:
+            self._executor.submit(self._run, job_id, func, args, cleanup)
+        except RuntimeError:
+            # Executor has been shut down
+            with self._lock:
+                self._jobs.pop(job_id, None)
+            self._slots.release()
+            if cleanup:
+                cleanup()
+            raise
+        return job_id
+
+    def _run(self, job_id: str, func: Callable[..., Any], args: tuple,
+             cleanup: Optional[Callable[[], None]]):
+        try:
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job is None:
+                    return
+                now = time.time()
+                # Jobs that waited longer than their timeout are not worth starting
+                if now - job['created_at'] > self.job_timeout:
+                    self._finish(job, 'timeout', error='Job timed out while queued')
+                    return
+                job['status'] = 'running'
+                job['started_at'] = now
+
+            try:
+                result = func(*args)
+            except Exception as e:
+                with self._lock:
+                    if job['status'] == 'running':
+                        self._finish(job, 'failed', error=str(e))
+                return
+
+            with self._lock:
+                if job['status'] != 'running':
+                    return
+                if time.time() - job['started_at'] > self.job_timeout:
+                    self._finish(job, 'timeout', error='Job exceeded time limit')
+                else:
+                    self._finish(job, 'done', result=result)
+        finally:
+            self._slots.release()
+            if cleanup:
+                try:
+                    cleanup()
+                except Exception:
+                    pass
+
+    def _finish(self, job: Dict[str, Any], status: str, result: Any = None, error: Optional[str] = None):
+        job['status'] = status
+        job['result'] = result
+        job['error'] = error
+        job['finished_at'] = time.time()
+
+    def _purge_expired(self):
+        """Drop finished jobs older than ``result_ttl`` (caller holds the lock)"""
+        cutoff = time.time() - self.result_ttl
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job['finished_at'] is not None and job['finished_at'] < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a snapshot of the job, or None if it is unknown or expired"""
+        with self._lock:
+            self._purge_expired()
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if job['status'] == 'running' and time.time() - job['started_at'] > self.job_timeout:
+                self._finish(job, 'timeout', error='Job exceeded time limit')
+            return dict(job)
+
+    def stats(self) -> Dict[str, int]:
+        """Count jobs by status"""
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for job in self._jobs.values():
+                counts[job['status']] = counts.get(job['status'], 0) + 1
+            return counts
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
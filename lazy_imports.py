@@ -0,0 +1,92 @@
+"""
+Lazy loading of heavy optional dependencies for PM Internship Scheme
+pandas, numpy, scikit-learn, PyPDF2 and python-docx are imported the first
+time a feature needs them (or by a background warm-up thread), not when the
+app boots. Every import and startup phase is timed for the startup report.
+"""
+
+import importlib
+import importlib.util
+import logging
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_modules: Dict[str, Any] = {}
+_failed: Dict[str, str] = {}
+_import_seconds: Dict[str, float] = {}
+_phases: Dict[str, float] = {}
+
+
+def is_available(name: str) -> bool:
+    """Whether ``name`` is installed, without importing it"""
+    if name in _modules:
+        return True
+    if name in _failed:
+        return False
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def optional_module(name: str) -> Optional[Any]:
+    """Import ``name`` on first use; None if it is missing or fails to import"""
+    module = _modules.get(name)
+    if module is not None or name in _failed:
+        return module
+    with _lock:
+        if name in _modules or name in _failed:
+            return _modules.get(name)
+        start = time.perf_counter()
+        try:
+            module = importlib.import_module(name)
+        except Exception as e:
+            _failed[name] = str(e)
+            return None
+        finally:
+            _import_seconds[name] = time.perf_counter() - start
+        _modules[name] = module
+        return module
+
+
+def record_phase(name: str, seconds: float):
+    """Record a named startup phase, e.g. building the recommendation engine"""
+    _phases[name] = seconds
+
+
+def import_report() -> Dict[str, Any]:
+    """Seconds spent importing each lazily loaded module and in each startup phase, plus the
+    imports and warm-up tasks that failed (``failed``, name -> error)"""
+    with _lock:
+        return {
+            'imports': {name: round(seconds, 4) for name, seconds in _import_seconds.items()},
+            'failed': dict(_failed),
+            'phases': {name: round(seconds, 4) for name, seconds in _phases.items()}
+        }
+
+
+def warm_up(modules: Iterable[str], tasks: Iterable = (), name: str = 'warm-up') -> threading.Thread:
+    """Import ``modules`` and run ``tasks`` on a daemon thread so first requests don't pay for them"""
+    def run():
+        start = time.perf_counter()
+        for module in modules:
+            optional_module(module)
+        for task in tasks:
+            try:
+                task()
+            except Exception as e:
+                # Listed under import_report()['failed'] by task name, alongside failed imports
+                task_name = f"{name}:{getattr(task, '__name__', repr(task))}"
+                with _lock:
+                    _failed[task_name] = str(e)
+                logger.exception("Warm-up task %s failed: %s", task_name, e,
+                                 extra={'event': 'startup.warm_up_failed'})
+        record_phase(name, time.perf_counter() - start)
+
+    thread = threading.Thread(target=run, name=name, daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,277 @@
+"""
+In-process metrics for PM Internship Scheme
+Counters, gauges and histograms rendered in the Prometheus text exposition
+format. Updates go to one of a fixed set of lock stripes picked per thread,
+so request threads rarely contend with each other; a scrape sums the stripes.
+"""
+
+import itertools
+import math
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Request latency buckets in seconds (Prometheus client defaults plus 30s for large PDFs)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+STRIPES = 16
+
+_stripe_local = threading.local()
+_stripe_counter = itertools.count()
+
+
+def _stripe_index() -> int:
+    """Round-robin stripe assigned to the calling thread on first use"""
+    index = getattr(_stripe_local, 'index', None)
+    if index is None:
+        index = _stripe_local.index = next(_stripe_counter) % STRIPES
+    return index
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+class _Metric:
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            # Unlabelled metrics report zero before their first update
+            self.labels()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values, **kwargs):
+        """Child metric for one label combination; creation is the only locked path"""
+        if kwargs:
+            values = tuple(kwargs[name] for name in self.labelnames)
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.get(key)
+                if child is None:
+                    child = self._children[key] = self._new_child()
+        return child
+
+    def _default(self):
+        return self.labels()
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return lines
+
+    def _items(self):
+        with self._lock:
+            return list(self._children.items())
+
+
+class _CounterChild:
+    __slots__ = ('_values', '_locks')
+
+    def __init__(self):
+        self._values = [0.0] * STRIPES
+        self._locks = [threading.Lock() for _ in range(STRIPES)]
+
+    def inc(self, amount: float = 1.0):
+        index = _stripe_index()
+        with self._locks[index]:
+            self._values[index] += amount
+
+    def get(self) -> float:
+        return sum(self._values)
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self._default().inc(amount)
+
+    def samples(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.get())}"
+                for key, child in self._items()]
+
+
+class _GaugeChild:
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float):
+        self.value = value
+
+    def get(self) -> float:
+        return self.value
+
+
+class Gauge(_Metric):
+    """Last-write-wins value, or computed at scrape time with ``set_function``"""
+    kind = 'gauge'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self._function: Optional[Callable[[], Iterable[Tuple[Tuple[str, ...], float]]]] = None
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float):
+        self._default().set(value)
+
+    def set_function(self, function: Callable[[], Iterable[Tuple[Tuple[str, ...], float]]]):
+        """``function`` returns (label values, value) pairs when scraped"""
+        self._function = function
+
+    def samples(self) -> List[str]:
+        if self._function is not None:
+            try:
+                pairs = list(self._function())
+            except Exception:
+                pairs = []
+        else:
+            pairs = [(key, child.get()) for key, child in self._items()]
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                for key, value in pairs]
+
+
+class _HistogramChild:
+    __slots__ = ('_bounds', '_counts', '_sums', '_locks')
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self._bounds = bounds
+        # One row of bucket counts per stripe; the last slot is the +Inf bucket
+        self._counts = [[0] * (len(bounds) + 1) for _ in range(STRIPES)]
+        self._sums = [0.0] * STRIPES
+        self._locks = [threading.Lock() for _ in range(STRIPES)]
+
+    def observe(self, value: float):
+        bucket = bisect_left(self._bounds, value)
+        index = _stripe_index()
+        with self._locks[index]:
+            self._counts[index][bucket] += 1
+            self._sums[index] += value
+
+    def snapshot(self) -> Tuple[List[int], float]:
+        counts = [0] * (len(self._bounds) + 1)
+        total = 0.0
+        for index in range(STRIPES):
+            with self._locks[index]:
+                row = list(self._counts[index])
+                total += self._sums[index]
+            for bucket, count in enumerate(row):
+                counts[bucket] += count
+        return counts, total
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(float(b) for b in buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self._default().observe(value)
+
+    def samples(self) -> List[str]:
+        lines = []
+        for key, child in self._items():
+            counts, total = child.snapshot()
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, (('le', _format_value(bound)),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """Prometheus text exposition of every registered metric"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+# Metrics updated outside app.py; the request-level ones live with the Flask hooks
+POSTINGS_SCORED = registry.counter(
+    'internmatch_postings_scored_total', 'Internship postings scored against a candidate profile')
+POSTINGS_SCORED_PER_REQUEST = registry.histogram(
+    'internmatch_postings_scored_per_request', 'Postings scored per get_recommendations call',
+    buckets=(10, 100, 1000, 10000, 100000, 1000000))
+ENGINE_INDEX_BUILD_SECONDS = registry.gauge(
+    'internmatch_engine_index_build_seconds', 'Time to load the catalogue and build the engine index')
+RESUMES_PARSED = registry.counter(
+    'internmatch_resumes_parsed_total', 'Resume files whose text was extracted', ['format'])
+RESUME_PAGES_PARSED = registry.counter(
+    'internmatch_resume_pages_parsed_total', 'PDF pages read while extracting resume text')
+EXTRACTION_FAILURES = registry.counter(
+    'internmatch_resume_extraction_failures_total', 'Resume text extraction errors', ['stage'])
+POSTING_ALERTS = registry.counter(
+    'internmatch_posting_alerts_total', 'Candidates alerted about a new or changed posting')
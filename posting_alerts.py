@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Standing-query alerts for PM Internship Scheme
+When a posting is added or changed, finds the saved candidates it matches at
+or above the alert threshold through the candidate index's percolator
+postings, instead of re-ranking the catalogue for every user.
+
+Usage:
+    python posting_alerts.py new_postings.json -o alerts.jsonl
+    python posting_alerts.py new_postings.jsonl --candidates profiles.jsonl --min-score 0.7
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from candidate_index import CandidateIndex
+from config import ALERTS_CONFIG
+from metrics import POSTING_ALERTS
+from structured_logging import log_event
+
+logger = logging.getLogger(__name__)
+
+
+def alerts_for_posting(index: CandidateIndex, internship: Dict[str, Any], min_score: Optional[float] = None,
+                       limit: Optional[int] = None) -> Dict[str, Any]:
+    """Saved candidates whose match score for ``internship`` is at least ``min_score``, best first"""
+    min_score = ALERTS_CONFIG['min_score'] if min_score is None else min_score
+    limit = ALERTS_CONFIG['max_alerts'] if limit is None else limit
+    started = time.perf_counter()
+    result = index.percolate(internship, min_score, limit)
+    return {
+        'internship_id': internship.get('id'),
+        'title': internship.get('title'),
+        'min_score': round(min_score * 100, 1),
+        'alerts': result['matches'],
+        'matched': result['matched'],
+        'scored': result['scored'],
+        'total_candidates': len(index),
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 3)
+    }
+
+
+def upsert_and_alert(engine, index: CandidateIndex, internship: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+    """Add or replace a posting in the engine's catalogue, then find the candidates to alert"""
+    replaced = engine.upsert_internship(internship)
+    alert = alerts_for_posting(index, internship, **kwargs)
+    alert['replaced'] = replaced
+    POSTING_ALERTS.inc(alert['matched'])
+    log_event(logger, 'alerts.matched', 'Matched saved candidates against a posting',
+              internship_id=alert['internship_id'], replaced=replaced, matched=alert['matched'],
+              scored=alert['scored'], elapsed_ms=alert['elapsed_ms'])
+    return alert
+
+
+def load_postings(path: str) -> List[Dict[str, Any]]:
+    """Postings from a JSON array (like data/internships.json) or a JSON Lines file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    if text.lstrip().startswith('['):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Match new postings against saved candidate profiles')
+    parser.add_argument('postings', help='JSON array or JSON Lines file of new/changed postings')
+    parser.add_argument('--candidates', help='JSON Lines candidate profiles (default: the profile store)')
+    parser.add_argument('--min-score', type=float, default=ALERTS_CONFIG['min_score'],
+                        help='Match score (0-1) needed for an alert')
+    parser.add_argument('--limit', type=int, default=ALERTS_CONFIG['max_alerts'], help='Alerts kept per posting')
+    parser.add_argument('-o', '--output', help='Output .jsonl file, one line per posting (default: stdout)')
+    args = parser.parse_args(argv)
+
+    from precomputed_recommendations import candidate_profiles_from_jsonl, saved_candidate_profiles
+    from recommendation_engine import InternshipRecommendationEngine
+
+    postings = load_postings(args.postings)
+    engine = InternshipRecommendationEngine()
+    index = CandidateIndex(engine)
+    if args.candidates:
+        index.load(candidate_profiles_from_jsonl(args.candidates))
+    else:
+        from config import DATABASE_CONFIG
+        from profile_store import create_profile_store
+        index.load(saved_candidate_profiles(create_profile_store(DATABASE_CONFIG)))
+
+    started = time.perf_counter()
+    matched = 0
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        for internship in postings:
+            alert = alerts_for_posting(index, internship, args.min_score, args.limit)
+            matched += alert['matched']
+            output.write(json.dumps(alert, ensure_ascii=False) + '\n')
+    finally:
+        if args.output:
+            output.close()
+
+    print(f"🔔 {len(postings)} postings matched against {len(index)} candidates: {matched} alerts "
+          f"in {round(time.perf_counter() - started, 3)}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""
+Precomputed recommendations for PM Internship Scheme
+Saving a profile (or its skills or goal) queues a background job that ranks
+the catalogue for that user and stores the result next to the profile, so
+the recommendations page can read it instead of scoring on the request path.
+Stored lists are only served while the catalogue version and the inputs they
+were computed from are unchanged; otherwise they are recomputed on read.
+"""
+
+import hashlib
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from config import MAX_RECOMMENDATIONS
+from job_queue import JobQueueFull
+from structured_logging import log_event
+
+logger = logging.getLogger(__name__)
+
+
+def candidate_profile_from(profile: Dict[str, Any], goal: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Map a saved profile (and career goal) to the engine's candidate profile"""
+    candidate = {
+        'education_level': profile.get('education_level', ''),
+        'skills': profile.get('skills', []),
+        'sector_interests': profile.get('sector_interests', []),
+        'location_preference': profile.get('location_preference', ''),
+        'remote_work_preference': bool(profile.get('remote_work_preference', False)),
+        'experience_level': profile.get('experience_level', 'Beginner')
+    }
+    if goal and goal.get('goal'):
+        candidate['career_goal'] = goal['goal']
+    return candidate
+
+
+def saved_candidate_profiles(store) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """(user_id, candidate profile) for every profile in ``store``"""
+    for user_id, profile, goal in store.iter_profiles():
+        yield user_id, candidate_profile_from(profile, goal)
+
+
+def candidate_profiles_from_jsonl(path: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """(user_id, candidate profile) per line of a JSON Lines file of profiles (with an optional ``goal``)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for number, line in enumerate(f):
+            if line.strip():
+                record = json.loads(line)
+                yield str(record.get('user_id', number)), candidate_profile_from(record, record.get('goal'))
+
+
+def profile_fingerprint(candidate_profile: Dict[str, Any]) -> str:
+    encoded = json.dumps(candidate_profile, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+class RecommendationPrecomputer:
+    """Ranks saved profiles in the background and serves the stored lists"""
+
+    def __init__(self, engine, store, job_queue, num_recommendations: int = MAX_RECOMMENDATIONS):
+        self.engine = engine
+        self.store = store
+        self.job_queue = job_queue
+        self.num_recommendations = num_recommendations
+
+    def _candidate(self, user_id: str) -> Optional[Dict[str, Any]]:
+        profile = self.store.get(user_id)
+        if not profile:
+            return None
+        return candidate_profile_from(profile, self.store.get_goal(user_id))
+
+    def compute(self, user_id: str, num_recommendations: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Rank the catalogue for the user's current profile and store the result"""
+        candidate = self._candidate(user_id)
+        if candidate is None:
+            return None
+        # Read the version first: a catalogue change mid-scoring then just makes the entry stale
+        catalogue_version = self.engine.catalogue_version
+        count = max(num_recommendations or 0, self.num_recommendations)
+        recommendations = self.engine.get_recommendations(candidate, count)
+        entry = {
+            'recommendations': recommendations,
+            'candidate_profile': candidate,
+            'profile_fingerprint': profile_fingerprint(candidate),
+            'catalogue_version': catalogue_version,
+            'num_recommendations': count,
+            'computed_at': datetime.now().isoformat()
+        }
+        self.store.save_recommendations(user_id, entry)
+        return entry
+
+    def _precompute_job(self, user_id: str) -> Optional[Dict[str, Any]]:
+        # The job result stays pollable for a while; keep it small, the list lives in the store
+        entry = self.compute(user_id)
+        if entry is None:
+            return None
+        return {'user_id': user_id, 'total_found': len(entry['recommendations']),
+                'catalogue_version': entry['catalogue_version']}
+
+    def schedule(self, user_id: str) -> Optional[str]:
+        """Queue a background recompute; returns the job id, or None when the queue is full"""
+        try:
+            # The job reads the profile when it runs, so back-to-back saves still end on the latest data
+            return self.job_queue.submit(self._precompute_job, user_id)
+        except JobQueueFull:
+            log_event(logger, 'recommendations.precompute_skipped',
+                      'Precompute queue full; recommendations will be computed on read',
+                      level=logging.WARNING, user_id=user_id)
+            return None
+
+    def get(self, user_id: str, num_recommendations: Optional[int] = None) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """(entry, precomputed) for the user; recomputes when the stored list is stale.
+
+        Returns (None, False) when the user has no profile.
+        """
+        num_recommendations = num_recommendations or self.num_recommendations
+        candidate = self._candidate(user_id)
+        if candidate is None:
+            return None, False
+        entry = self.store.get_recommendations(user_id)
+        fresh = (entry is not None
+                 and entry.get('catalogue_version') == self.engine.catalogue_version
+                 and entry.get('profile_fingerprint') == profile_fingerprint(candidate)
+                 and entry.get('num_recommendations', 0) >= num_recommendations)
+        if not fresh:
+            entry = self.compute(user_id, num_recommendations)
+        entry['recommendations'] = entry['recommendations'][:num_recommendations]
+        return entry, fresh
@@ -0,0 +1,407 @@
+"""
+Profile storage for PM Internship Scheme
+Keeps user profiles and career goals, enforcing unique mobile/email/aadhar.
+ProfileStore is in-memory; SQLiteProfileStore is durable and shared across
+worker processes.
+"""
+
+import copy
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Fields that must be unique across users, with the label used in error messages
+UNIQUE_PROFILE_FIELDS = {
+    'mobile_number': 'Mobile number',
+    'email': 'Email',
+    'aadhar_number': 'Aadhar number'
+}
+
+
+class DuplicateProfileField(Exception):
+    """Raised when a profile reuses a unique field value owned by another user"""
+
+    def __init__(self, field: str):
+        super().__init__(f"{UNIQUE_PROFILE_FIELDS.get(field, field)} already exists")
+        self.field = field
+
+
+class ProfileStore:
+    """In-memory profile store with O(1) uniqueness checks, safe under threads.
+
+    ``_indexes[field][value]`` maps each unique field value to the user id
+    that owns it. Indexes are updated on every save so a changed email or
+    mobile number frees the old value for other users.
+
+    Concurrency: per-user work is serialized by one of ``lock_stripes``
+    striped locks (chosen by hashing the user id), so different users rarely
+    contend. Unique values are claimed with a compare-and-set on the index
+    under a short per-field lock, so two users can never both win the same
+    email even when their saves run at the same time.
+    """
+
+    def __init__(self, lock_stripes: int = 64):
+        self._profiles: Dict[str, Dict[str, Any]] = {}
+        self._goals: Dict[str, Dict[str, Any]] = {}
+        self._recommendations: Dict[str, Dict[str, Any]] = {}
+        self._indexes: Dict[str, Dict[Any, str]] = {field: {} for field in UNIQUE_PROFILE_FIELDS}
+        self._index_locks = {field: threading.Lock() for field in UNIQUE_PROFILE_FIELDS}
+        self._user_locks = [threading.Lock() for _ in range(lock_stripes)]
+
+    def _lock_for(self, user_id: str) -> threading.Lock:
+        return self._user_locks[hash(user_id) % len(self._user_locks)]
+
+    def get(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the user's profile, or None"""
+        with self._lock_for(user_id):
+            profile = self._profiles.get(user_id)
+            return copy.deepcopy(profile) if profile is not None else None
+
+    def find_user(self, field: str, value: Any) -> Optional[str]:
+        """Return the user id owning ``value`` for a unique field"""
+        return self._indexes[field].get(value)
+
+    def find_conflict(self, user_id: str, profile: Dict[str, Any]) -> Optional[str]:
+        """Return the first unique field whose value belongs to a different user.
+
+        Advisory only: ``save`` re-checks atomically while claiming values.
+        """
+        for field in UNIQUE_PROFILE_FIELDS:
+            value = profile.get(field)
+            if value:
+                owner = self._indexes[field].get(value)
+                if owner is not None and owner != user_id:
+                    return field
+        return None
+
+    def save(self, user_id: str, profile: Dict[str, Any]) -> Dict[str, Any]:
+        """Replace the user's profile, raising DuplicateProfileField on a conflict"""
+        profile = copy.deepcopy(profile)
+        with self._lock_for(user_id):
+            previous = self._profiles.get(user_id)
+            claimed = []
+            for field in UNIQUE_PROFILE_FIELDS:
+                value = profile.get(field)
+                if not value or (previous is not None and previous.get(field) == value):
+                    continue
+                if not self._claim(field, value, user_id):
+                    # Undo the claims made so far; they were not held before this save
+                    for claimed_field, claimed_value in claimed:
+                        self._release(claimed_field, claimed_value, user_id)
+                    raise DuplicateProfileField(field)
+                claimed.append((field, value))
+
+            self._profiles[user_id] = profile
+            if previous is not None:
+                # Free values the user no longer has
+                for field in UNIQUE_PROFILE_FIELDS:
+                    old_value = previous.get(field)
+                    if old_value and old_value != profile.get(field):
+                        self._release(field, old_value, user_id)
+            return copy.deepcopy(profile)
+
+    def add_skills(self, user_id: str, skills: Iterable[str], limit: Optional[int] = None) -> List[str]:
+        """Append skills the user doesn't already have, up to ``limit`` in total; returns the updated list"""
+        with self._lock_for(user_id):
+            profile = self._profiles.setdefault(user_id, {'skills': []})
+            current = list(profile.get('skills', []))
+            for skill in skills:
+                if limit is not None and len(current) >= limit:
+                    break
+                if skill not in current:
+                    current.append(skill)
+            profile['skills'] = current
+            return list(current)
+
+    def save_goal(self, user_id: str, goal: Dict[str, Any]):
+        goal = copy.deepcopy(goal)
+        with self._lock_for(user_id):
+            self._goals[user_id] = goal
+
+    def get_goal(self, user_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock_for(user_id):
+            goal = self._goals.get(user_id)
+            return copy.deepcopy(goal) if goal is not None else None
+
+    def save_recommendations(self, user_id: str, entry: Dict[str, Any]):
+        """Store a precomputed recommendation list (with its catalogue version and profile fingerprint)"""
+        entry = copy.deepcopy(entry)
+        with self._lock_for(user_id):
+            self._recommendations[user_id] = entry
+
+    def get_recommendations(self, user_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock_for(user_id):
+            entry = self._recommendations.get(user_id)
+            return copy.deepcopy(entry) if entry is not None else None
+
+    def iter_profiles(self) -> Iterator[Tuple[str, Dict[str, Any], Optional[Dict[str, Any]]]]:
+        """(user_id, profile, goal) for every saved profile, e.g. to build an index at startup"""
+        for user_id in list(self._profiles):
+            profile = self.get(user_id)
+            if profile is not None:
+                yield user_id, profile, self.get_goal(user_id)
+
+    def revision(self) -> int:
+        """Always 0: an in-memory store lives in one process, which sees every write itself"""
+        return 0
+
+    def changed_since(self, revision: int) -> Iterator[Tuple[int, str, Dict[str, Any], Optional[Dict[str, Any]]]]:
+        """Nothing: there are no other worker processes to catch up with"""
+        return iter(())
+
+    def _claim(self, field: str, value: Any, user_id: str) -> bool:
+        """Compare-and-set: take ``value`` for ``user_id`` unless another user owns it"""
+        with self._index_locks[field]:
+            owner = self._indexes[field].setdefault(value, user_id)
+        return owner == user_id
+
+    def _release(self, field: str, value: Any, user_id: str):
+        with self._index_locks[field]:
+            if self._indexes[field].get(value) == user_id:
+                del self._indexes[field][value]
+
+    def __len__(self) -> int:
+        return len(self._profiles)
+
+    def __contains__(self, user_id: str) -> bool:
+        return user_id in self._profiles
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    user_id TEXT PRIMARY KEY,
+    mobile_number TEXT,
+    email TEXT,
+    aadhar_number TEXT,
+    data TEXT NOT NULL,
+    updated_at TEXT,
+    revision INTEGER NOT NULL DEFAULT 0
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_profiles_mobile ON profiles(mobile_number);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_profiles_email ON profiles(email);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_profiles_aadhar ON profiles(aadhar_number);
+CREATE TABLE IF NOT EXISTS goals (
+    user_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    created_at TEXT
+);
+CREATE TABLE IF NOT EXISTS recommendations (
+    user_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    computed_at TEXT
+);
+"""
+
+# Statements are kept as constants so sqlite3's per-connection statement
+# cache reuses the compiled form on every call
+_SELECT_PROFILE = "SELECT data FROM profiles WHERE user_id = ?"
+_SELECT_CONFLICTS = (
+    "SELECT mobile_number, email, aadhar_number FROM profiles "
+    "WHERE user_id != ? AND (mobile_number = ? OR email = ? OR aadhar_number = ?)"
+)
+# Every write stamps the profile with the next revision; writers are serialized
+# by BEGIN IMMEDIATE, so revisions are committed in increasing order
+_NEXT_REVISION = "(SELECT COALESCE(MAX(revision), 0) + 1 FROM profiles)"
+_UPSERT_PROFILE = (
+    "INSERT INTO profiles (user_id, mobile_number, email, aadhar_number, data, updated_at, revision) "
+    f"VALUES (?, ?, ?, ?, ?, ?, {_NEXT_REVISION}) "
+    "ON CONFLICT(user_id) DO UPDATE SET mobile_number = excluded.mobile_number, "
+    "email = excluded.email, aadhar_number = excluded.aadhar_number, "
+    "data = excluded.data, updated_at = excluded.updated_at, revision = excluded.revision"
+)
+_TOUCH_PROFILE = f"UPDATE profiles SET revision = {_NEXT_REVISION} WHERE user_id = ?"
+_MAX_REVISION = "SELECT COALESCE(MAX(revision), 0) FROM profiles"
+_SELECT_CHANGED_PROFILES = (
+    "SELECT p.revision, p.user_id, p.data, g.data FROM profiles p LEFT JOIN goals g ON g.user_id = p.user_id "
+    "WHERE p.revision > ? ORDER BY p.revision"
+)
+_COUNT_PROFILES = "SELECT COUNT(*) FROM profiles"
+_SELECT_ALL_PROFILES = (
+    "SELECT p.user_id, p.data, g.data FROM profiles p LEFT JOIN goals g ON g.user_id = p.user_id"
+)
+_SELECT_GOAL = "SELECT data FROM goals WHERE user_id = ?"
+_UPSERT_GOAL = (
+    "INSERT INTO goals (user_id, data, created_at) VALUES (?, ?, ?) "
+    "ON CONFLICT(user_id) DO UPDATE SET data = excluded.data, created_at = excluded.created_at"
+)
+_SELECT_RECOMMENDATIONS = "SELECT data FROM recommendations WHERE user_id = ?"
+_UPSERT_RECOMMENDATIONS = (
+    "INSERT INTO recommendations (user_id, data, computed_at) VALUES (?, ?, ?) "
+    "ON CONFLICT(user_id) DO UPDATE SET data = excluded.data, computed_at = excluded.computed_at"
+)
+
+
+class SQLiteProfileStore:
+    """SQLite-backed profile store, safe to share between threads and processes.
+
+    The database runs in WAL mode so readers never block the single writer,
+    and every thread gets its own connection. Uniqueness is enforced by
+    unique indexes; writes run in ``BEGIN IMMEDIATE`` transactions so the
+    conflict check and the write happen atomically across workers.
+    """
+
+    def __init__(self, path: str, busy_timeout_ms: int = 5000):
+        self.path = path
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        conn = self._connect()
+        conn.executescript(_SCHEMA)
+        # Databases created before profiles had a revision column
+        if 'revision' not in {row[1] for row in conn.execute('PRAGMA table_info(profiles)')}:
+            try:
+                conn.execute('ALTER TABLE profiles ADD COLUMN revision INTEGER NOT NULL DEFAULT 0')
+            except sqlite3.OperationalError:
+                pass    # another worker added it first
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_profiles_revision ON profiles(revision)')
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # isolation_level=None: transactions are managed explicitly below
+            conn = sqlite3.connect(self.path, isolation_level=None, cached_statements=64,
+                                   check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(f'PRAGMA busy_timeout={int(self.busy_timeout_ms)}')
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        else:
+            conn.execute('COMMIT')
+
+    @staticmethod
+    def _unique_values(profile: Dict[str, Any]) -> Tuple[Optional[str], ...]:
+        # Empty values are stored as NULL, which unique indexes allow repeatedly
+        return tuple((profile.get(field) or None) for field in UNIQUE_PROFILE_FIELDS)
+
+    def get(self, user_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connect().execute(_SELECT_PROFILE, (user_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def find_user(self, field: str, value: Any) -> Optional[str]:
+        if field not in UNIQUE_PROFILE_FIELDS:
+            raise KeyError(field)
+        row = self._connect().execute(
+            f"SELECT user_id FROM profiles WHERE {field} = ?", (value,)).fetchone()
+        return row[0] if row else None
+
+    def _find_conflict(self, conn: sqlite3.Connection, user_id: str,
+                       values: Tuple[Optional[str], ...]) -> Optional[str]:
+        rows = conn.execute(_SELECT_CONFLICTS, (user_id,) + values).fetchall()
+        # Report fields in the same order as the in-memory store
+        for position, field in enumerate(UNIQUE_PROFILE_FIELDS):
+            if values[position] is not None and any(row[position] == values[position] for row in rows):
+                return field
+        return None
+
+    def find_conflict(self, user_id: str, profile: Dict[str, Any]) -> Optional[str]:
+        return self._find_conflict(self._connect(), user_id, self._unique_values(profile))
+
+    def save(self, user_id: str, profile: Dict[str, Any]) -> Dict[str, Any]:
+        values = self._unique_values(profile)
+        with self._transaction() as conn:
+            conflict = self._find_conflict(conn, user_id, values)
+            if conflict:
+                raise DuplicateProfileField(conflict)
+            conn.execute(_UPSERT_PROFILE, (user_id,) + values +
+                         (json.dumps(profile), profile.get('updated_at')))
+        return copy.deepcopy(profile)
+
+    def save_many(self, profiles: Dict[str, Dict[str, Any]]):
+        """Write many profiles in one transaction (bulk onboarding).
+
+        The whole batch is rolled back if any profile violates uniqueness,
+        either against stored profiles (DuplicateProfileField) or within the
+        batch itself (sqlite3.IntegrityError from the unique indexes).
+        """
+        rows = [(user_id,) + self._unique_values(profile) +
+                (json.dumps(profile), profile.get('updated_at'))
+                for user_id, profile in profiles.items()]
+        with self._transaction() as conn:
+            for row in rows:
+                conflict = self._find_conflict(conn, row[0], row[1:4])
+                if conflict:
+                    raise DuplicateProfileField(conflict)
+            conn.executemany(_UPSERT_PROFILE, rows)
+
+    def add_skills(self, user_id: str, skills: Iterable[str], limit: Optional[int] = None) -> List[str]:
+        with self._transaction() as conn:
+            row = conn.execute(_SELECT_PROFILE, (user_id,)).fetchone()
+            profile = json.loads(row[0]) if row else {'skills': []}
+            current = profile.setdefault('skills', [])
+            for skill in skills:
+                if limit is not None and len(current) >= limit:
+                    break
+                if skill not in current:
+                    current.append(skill)
+            conn.execute(_UPSERT_PROFILE, (user_id,) + self._unique_values(profile) +
+                         (json.dumps(profile), profile.get('updated_at')))
+        return list(current)
+
+    def save_goal(self, user_id: str, goal: Dict[str, Any]):
+        with self._transaction() as conn:
+            conn.execute(_UPSERT_GOAL, (user_id, json.dumps(goal), goal.get('created_at')))
+            # The goal is part of the candidate profile, so it counts as a profile change
+            conn.execute(_TOUCH_PROFILE, (user_id,))
+
+    def get_goal(self, user_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connect().execute(_SELECT_GOAL, (user_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_recommendations(self, user_id: str, entry: Dict[str, Any]):
+        # Single-row upsert; autocommit is atomic without an explicit transaction
+        self._connect().execute(_UPSERT_RECOMMENDATIONS,
+                                (user_id, json.dumps(entry), entry.get('computed_at')))
+
+    def get_recommendations(self, user_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connect().execute(_SELECT_RECOMMENDATIONS, (user_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def iter_profiles(self) -> Iterator[Tuple[str, Dict[str, Any], Optional[Dict[str, Any]]]]:
+        """(user_id, profile, goal) for every saved profile, e.g. to build an index at startup"""
+        for user_id, data, goal in self._connect().execute(_SELECT_ALL_PROFILES):
+            yield user_id, json.loads(data), json.loads(goal) if goal else None
+
+    def revision(self) -> int:
+        """Revision of the latest profile or goal write, in any worker process"""
+        return self._connect().execute(_MAX_REVISION).fetchone()[0]
+
+    def changed_since(self, revision: int) -> Iterator[Tuple[int, str, Dict[str, Any], Optional[Dict[str, Any]]]]:
+        """(revision, user_id, profile, goal) for profiles written after ``revision``, oldest first"""
+        for row_revision, user_id, data, goal in self._connect().execute(_SELECT_CHANGED_PROFILES, (revision,)):
+            yield row_revision, user_id, json.loads(data), json.loads(goal) if goal else None
+
+    def close(self):
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def __len__(self) -> int:
+        return self._connect().execute(_COUNT_PROFILES).fetchone()[0]
+
+    def __contains__(self, user_id: str) -> bool:
+        return self.get(user_id) is not None
+
+
+def create_profile_store(config: Dict[str, Any]):
+    """Build the profile store selected by ``DATABASE_CONFIG``"""
+    if config.get('backend') == 'sqlite':
+        return SQLiteProfileStore(config['path'], busy_timeout_ms=config.get('busy_timeout_ms', 5000))
+    return ProfileStore()
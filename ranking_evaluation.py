@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Offline ranking evaluation for PM Internship Scheme
+Replays a file of judgements (a candidate profile and the internship ids
+that are relevant to them) and reports NDCG@k and recall@k for many
+scoring-weight settings at once. Every unweighted score component is
+computed once per (profile, posting) pair through the candidate index and
+cached as a matrix, so each weight setting is a few array operations
+instead of a full re-run of the scorer. Rankings equal what
+``get_recommendations`` returns with the same weights.
+
+Judgements file (JSON Lines):
+    {"profile": {"education_level": "Graduate", "skills": [...], ...}, "relevant": [3, 17]}
+
+Usage:
+    python ranking_evaluation.py judgements.jsonl --vary skills=0.15,0.25,0.35 --vary location=0,0.15,0.3
+    python ranking_evaluation.py judgements.jsonl --settings weights.json --k 5 10 -o evaluation.json
+"""
+
+import argparse
+import itertools
+import json
+import sys
+import time
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from candidate_index import CandidateIndex, combine_components
+
+COMPONENTS = ('education_level', 'skills', 'sector_interests', 'location', 'career_goal', 'experience_level')
+
+
+class RankingEvaluator:
+    """Cached per-component score matrices for a set of judged profiles"""
+
+    def __init__(self, engine, judgements: Iterable[Tuple[Dict[str, Any], Iterable[Any]]]):
+        self.engine = engine
+        self.internships = list(engine.internships)
+        index = CandidateIndex(engine)
+        np = index._np
+        if np is None:
+            raise RuntimeError('RankingEvaluator requires numpy')
+        self._np = np
+
+        judgements = list(judgements)
+        index.load((str(query), profile) for query, (profile, _) in enumerate(judgements))
+        positions = {internship.get('id'): position for position, internship in enumerate(self.internships)}
+        queries, postings = len(judgements), len(self.internships)
+
+        # (queries, postings) matrix per component; rows follow load order in a fresh index
+        self.components = {name: np.zeros((queries, postings)) for name in COMPONENTS}
+        self.components['goal_applies'] = np.zeros((queries, postings), dtype=bool)
+        started = time.perf_counter()
+        for column, internship in enumerate(self.internships):
+            values = index.component_scores(internship)
+            for name, matrix in self.components.items():
+                matrix[:, column] = values[name][:queries]
+        self.build_seconds = time.perf_counter() - started
+
+        self.relevant = np.zeros((queries, postings), dtype=bool)
+        self.unknown_ids = 0
+        for query, (_, relevant_ids) in enumerate(judgements):
+            for internship_id in relevant_ids:
+                if internship_id in positions:
+                    self.relevant[query, positions[internship_id]] = True
+                else:
+                    self.unknown_ids += 1
+        self.relevant_counts = self.relevant.sum(axis=1)
+
+    def scores(self, weights: Dict[str, float]):
+        """Match scores of every (profile, posting) pair for ``weights`` (merged onto the engine's)"""
+        return combine_components(self.components, dict(self.engine.weights, **weights), self._np)
+
+    def ranking(self, weights: Dict[str, float], k: int):
+        """Each profile's top ``k`` posting positions, best first, as ``get_recommendations`` orders them;
+        -1 pads rankings that run out of postings above the engine's ``min_match_score``"""
+        np = self._np
+        scores = self.scores(weights)
+        queries, postings = scores.shape
+        k = min(k, postings)
+        ranking = np.full((queries, k), -1, dtype=np.int64)
+        if k == 0:
+            return ranking
+
+        # Everything tied with the k-th best is kept, then ordered by score and catalogue position
+        kth = np.partition(scores, postings - k, axis=1)[:, postings - k]
+        rows, columns = np.nonzero(scores >= kth[:, None])
+        order = np.lexsort((columns, -scores[rows, columns], rows))
+        rows, columns = rows[order], columns[order]
+        rank = np.arange(len(rows)) - np.searchsorted(rows, np.arange(queries))[rows]
+        keep = (rank < k) & (scores[rows, columns] > self.engine.min_match_score)
+        ranking[rows[keep], rank[keep]] = columns[keep]
+        return ranking
+
+    def evaluate(self, settings: Sequence[Dict[str, float]], ks: Sequence[int] = (5, 10, 20)) -> List[Dict[str, Any]]:
+        """Mean NDCG@k and recall@k over profiles with at least one relevant posting, per setting"""
+        np = self._np
+        judged = self.relevant_counts > 0
+        counts = self.relevant_counts[judged]
+        discounts = 1.0 / np.log2(np.arange(max(ks)) + 2)
+        ideal = np.cumsum(discounts)
+        results = []
+        for weights in settings:
+            ranking = self.ranking(weights, max(ks))[judged]
+            hits = np.take_along_axis(self.relevant[judged], np.maximum(ranking, 0), axis=1) & (ranking >= 0)
+            metrics = {}
+            for k in ks:
+                top = hits[:, :k]
+                dcg = top @ discounts[:top.shape[1]]
+                best = ideal[np.minimum(counts, k) - 1]
+                metrics[f'ndcg@{k}'] = round(float((dcg / best).mean()), 4) if len(counts) else 0.0
+                metrics[f'recall@{k}'] = round(float((top.sum(axis=1) / counts).mean()), 4) if len(counts) else 0.0
+            results.append({'weights': dict(self.engine.weights, **weights), **metrics})
+        return results
+
+
+def load_judgements(path: str) -> List[Tuple[Dict[str, Any], List[Any]]]:
+    """(profile, relevant internship ids) pairs from a JSON Lines file"""
+    judgements = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                judgements.append((record['profile'], record.get('relevant', [])))
+    return judgements
+
+
+def weight_grid(variations: Dict[str, List[float]]) -> List[Dict[str, float]]:
+    """Every combination of the given per-component values"""
+    names = list(variations)
+    return [dict(zip(names, values)) for values in itertools.product(*(variations[name] for name in names))]
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Evaluate ranking quality for many scoring-weight settings')
+    parser.add_argument('judgements', help='JSON Lines file of {"profile": ..., "relevant": [ids]}')
+    parser.add_argument('--vary', action='append', default=[], metavar='COMPONENT=V1,V2,...',
+                        help='Values to try for one weight (repeat for a grid); others keep their config value')
+    parser.add_argument('--settings', help='JSON file with a list of weight dicts to evaluate')
+    parser.add_argument('--k', type=int, nargs='+', default=[5, 10, 20])
+    parser.add_argument('-o', '--output', help='Write the results JSON here (default: stdout)')
+    args = parser.parse_args(argv)
+
+    variations = {}
+    for option in args.vary:
+        name, _, values = option.partition('=')
+        if name not in COMPONENTS or not values:
+            parser.error(f"--vary expects COMPONENT=V1,V2 with COMPONENT one of: {', '.join(COMPONENTS)}")
+        variations[name] = [float(value) for value in values.split(',')]
+    settings = weight_grid(variations) if variations else [{}]
+    if args.settings:
+        with open(args.settings, 'r', encoding='utf-8') as f:
+            settings = json.load(f) + (settings if variations else [])
+
+    from recommendation_engine import InternshipRecommendationEngine
+    engine = InternshipRecommendationEngine()
+    evaluator = RankingEvaluator(engine, load_judgements(args.judgements))
+
+    started = time.perf_counter()
+    results = evaluator.evaluate(settings, sorted(set(args.k)))
+    evaluate_seconds = time.perf_counter() - started
+    headline = f'ndcg@{max(args.k)}'
+    results.sort(key=lambda result: -result[headline])
+
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        json.dump(results, output, indent=2)
+        output.write('\n')
+    finally:
+        if args.output:
+            output.close()
+
+    queries = int((evaluator.relevant_counts > 0).sum())
+    print(f"📏 {len(settings)} settings x {queries} judged profiles x {len(evaluator.internships)} postings: "
+          f"matrices {round(evaluator.build_seconds, 3)}s, evaluation {round(evaluate_seconds, 3)}s", file=sys.stderr)
+    if evaluator.unknown_ids:
+        print(f"⚠️  {evaluator.unknown_ids} relevant ids are not in the catalogue", file=sys.stderr)
+    best = results[0]
+    print(f"🏆 best {headline} {best[headline]}: "
+          + ', '.join(f"{name}={best['weights'][name]}" for name in COMPONENTS), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,35 +1,91 @@
+import contextlib
+import hashlib
 import json
+import logging
 import math
-from typing import List, Dict, Any
+import os
+import tempfile
+import threading
+import time
+from typing import AbstractSet, List, Dict, Any, FrozenSet, Iterable, Optional, Tuple
 
-# Optional imports for advanced features
-try:
-    import pandas as pd
-    import numpy as np
-    from sklearn.feature_extraction.text import TfidfVectorizer
-    from sklearn.metrics.pairwise import cosine_similarity
-    HAS_SKLEARN = True
-except ImportError:
-    HAS_SKLEARN = False
-    print("Note: scikit-learn not available, using simplified matching algorithm")
+from config import DATA_FILES, DIVERSITY_CONFIG, LOCATION_CONFIG, MAX_RECOMMENDATIONS, MIN_MATCH_SCORE, SCORING_WEIGHTS, SKILLS_CONFIG
+from diversity import PostingFeatures, diversify
+from gazetteer import Gazetteer, LocationIndex, Place, haversine_km
+from lazy_imports import is_available, optional_module
+from metrics import ENGINE_INDEX_BUILD_SECONDS, POSTINGS_SCORED, POSTINGS_SCORED_PER_REQUEST
+from request_timing import stage
+from skill_registry import create_skill_registry
+from skill_suggest import SkillTrie
+
+logger = logging.getLogger(__name__)
+
+# scikit-learn is optional and only imported when the TF-IDF matrix is first needed
+HAS_SKLEARN = is_available('sklearn')
+if not HAS_SKLEARN:
+    logger.info("scikit-learn not available, using simplified matching algorithm")
+
+GOAL_KEYWORDS = {
+    'Software Developer': ['software', 'developer', 'programming', 'coding', 'tech'],
+    'Data Analyst': ['data', 'analyst', 'analytics', 'research', 'statistics'],
+    'Digital Marketer': ['marketing', 'digital', 'social media', 'content', 'brand'],
+    'Project Manager': ['project', 'manager', 'coordination', 'planning', 'leadership'],
+    'UI/UX Designer': ['design', 'ui', 'ux', 'user interface', 'user experience'],
+    'Business Analyst': ['business', 'analyst', 'strategy', 'consulting', 'analysis'],
+    'Content Writer': ['content', 'writer', 'writing', 'blog', 'copy'],
+    'Social Media Manager': ['social media', 'community', 'engagement', 'platform'],
+    'Research Analyst': ['research', 'analyst', 'study', 'investigation', 'analysis'],
+    'Government Officer': ['government', 'public', 'policy', 'administration', 'ministry'],
+    'Healthcare Professional': ['healthcare', 'health', 'medical', 'hospital', 'public health'],
+    'Education Specialist': ['education', 'teaching', 'learning', 'academic', 'school'],
+    'Environmental Consultant': ['environment', 'sustainability', 'green', 'conservation'],
+    'Financial Advisor': ['finance', 'financial', 'banking', 'investment', 'economic'],
+    'Agriculture Specialist': ['agriculture', 'farming', 'rural', 'crop', 'agricultural']
+}
 
 class InternshipRecommendationEngine:
-    def __init__(self):
+    def __init__(self, internships: Optional[List[Dict[str, Any]]] = None,
+                 weights: Optional[Dict[str, float]] = None, min_match_score: float = MIN_MATCH_SCORE,
+                 catalogue_path: str = DATA_FILES['internships']):
+        """Load the catalogue from ``catalogue_path``; pass ``internships`` to use an in-memory
+        catalogue instead (upserts to it are not written anywhere).
+        
+        ``weights`` overrides entries of ``config.SCORING_WEIGHTS``; recommendations
+        must score above ``min_match_score``.
+        """
+        build_start = time.perf_counter()
         self.internships = []
         self.sectors = []
         self.skills = []
-        if HAS_SKLEARN:
-            self.vectorizer = TfidfVectorizer(stop_words='english', max_features=1000)
-        else:
-            self.vectorizer = None
+        self.weights = dict(SCORING_WEIGHTS, **(weights or {}))
+        self.min_match_score = min_match_score
+        self.vectorizer = None
+        self._tfidf_matrix = None
+        self._catalogue_version = None
+        self._posting_features = None
+        self._location_index = None
+        self._skill_trie = None
+        # id(posting) -> (posting, canonical required skill ids) for the current catalogue
+        self._posting_skill_ids: Dict[int, Tuple[Dict[str, Any], FrozenSet[int]]] = {}
+        self._similarity_lock = threading.Lock()
+        self.catalogue_path = catalogue_path if internships is None else None
+        self._catalogue_stamp = None
+        self.gazetteer = Gazetteer(LOCATION_CONFIG['gazetteer'])
+        self.skill_registry = create_skill_registry(SKILLS_CONFIG)
         self.load_data()
-        self.prepare_similarity_matrix()
+        if internships is not None:
+            self.internships = internships
+        self._posting_skill_ids = self._skill_ids_for(self.internships)
+        self.index_build_seconds = time.perf_counter() - build_start
+        ENGINE_INDEX_BUILD_SECONDS.set(self.index_build_seconds)
     
     def load_data(self):
         """Load internship data, sectors, and skills from JSON files"""
         try:
-            with open('data/internships.json', 'r', encoding='utf-8') as f:
-                self.internships = json.load(f)
+            if self.catalogue_path:
+                self._catalogue_stamp = self._file_stamp()
+                with open(self.catalogue_path, 'r', encoding='utf-8') as f:
+                    self.internships = json.load(f)
             
             with open('data/sectors.json', 'r', encoding='utf-8') as f:
                 self.sectors = json.load(f)
@@ -38,128 +94,326 @@ class InternshipRecommendationEngine:
                 self.skills = json.load(f)
                 
         except FileNotFoundError as e:
-            print(f"Error loading data: {e}")
+            logger.error("Error loading data: %s", e, extra={'event': 'engine.data_missing'})
             self.internships = []
             self.sectors = []
             self.skills = []
     
+    @property
+    def catalogue_version(self) -> str:
+        """Content hash of the loaded catalogue and scoring settings; changes whenever either does"""
+        version = self._catalogue_version
+        if version is None:
+            # Hashed under the lock so an upsert cannot clear the version in between and see it
+            # overwritten with the hash of the catalogue it replaced
+            with self._similarity_lock:
+                version = self._catalogue_version
+                if version is None:
+                    encoded = json.dumps([self.internships, self.weights, self.min_match_score],
+                                         sort_keys=True, default=str).encode('utf-8')
+                    version = self._catalogue_version = hashlib.sha256(encoded).hexdigest()[:16]
+        return version
+    
     def prepare_similarity_matrix(self):
         """Prepare TF-IDF similarity matrix for skill-based matching"""
         if not self.internships or not HAS_SKLEARN:
             return
+        with self._similarity_lock:
+            if self._tfidf_matrix is not None:
+                return
+            text_module = optional_module('sklearn.feature_extraction.text')
+            if text_module is None:
+                return
+            
+            # Create text representations of internships
+            internship_texts = []
+            for internship in self.internships:
+                text = f"{internship['title']} {internship['description']} {' '.join(internship['skills_required'])} {internship['sector']}"
+                internship_texts.append(text)
+            
+            # Fit TF-IDF vectorizer
+            self.vectorizer = text_module.TfidfVectorizer(stop_words='english', max_features=1000)
+            self._tfidf_matrix = self.vectorizer.fit_transform(internship_texts)
+    
+    @property
+    def tfidf_matrix(self):
+        """TF-IDF matrix over the catalogue, built on first access"""
+        if self._tfidf_matrix is None:
+            self.prepare_similarity_matrix()
+        return self._tfidf_matrix
+    
+    def posting_features(self, internships: List[Dict[str, Any]]) -> PostingFeatures:
+        """Diversity features for ``internships`` (a catalogue list), encoded once per list"""
+        features = self._posting_features
+        if features is None or features.internships is not internships:
+            features = PostingFeatures(internships, DIVERSITY_CONFIG['similarity_weights'])
+            with self._similarity_lock:
+                if self.internships is internships:
+                    self._posting_features = features
+        return features
+    
+    def location_index(self, internships: List[Dict[str, Any]]) -> LocationIndex:
+        """Parsed locations and spatial index for ``internships`` (a catalogue list), built once per list"""
+        index = self._location_index
+        if index is None or index.internships is not internships:
+            index = LocationIndex(self.gazetteer, internships)
+            with self._similarity_lock:
+                if self.internships is internships:
+                    self._location_index = index
+        return index
+    
+    def skill_trie(self, internships: List[Dict[str, Any]]) -> SkillTrie:
+        """Skill autocomplete trie weighted by ``internships`` (a catalogue list), built once per list"""
+        trie = self._skill_trie
+        if trie is None or trie.internships is not internships:
+            trie = SkillTrie(self.skill_registry, internships, SKILLS_CONFIG['max_suggestions'])
+            with self._similarity_lock:
+                if self.internships is internships:
+                    self._skill_trie = trie
+        return trie
+    
+    def upsert_internship(self, internship: Dict[str, Any]) -> bool:
+        """Add a posting, or replace the one with the same id; returns True if one was replaced.
         
-        # Create text representations of internships
-        internship_texts = []
+        A catalogue loaded from ``catalogue_path`` is written back to it atomically, so
+        the posting survives restarts and other worker processes pick it up through
+        ``reload_if_changed``.
+        """
+        with self._similarity_lock, self._catalogue_file_lock():
+            # Apply the change to the latest file, which another process may have updated
+            self._reload_locked()
+            # Swap in a new list so requests iterating the old one are unaffected
+            internships = list(self.internships)
+            for position, existing in enumerate(internships):
+                if existing.get('id') == internship.get('id'):
+                    internships[position] = internship
+                    replaced = True
+                    break
+            else:
+                internships.append(internship)
+                replaced = False
+            if self.catalogue_path:
+                self._write_catalogue(internships)
+            self._set_catalogue(internships)
+        return replaced
+    
+    def reload_if_changed(self) -> bool:
+        """Reload the catalogue file if another process rewrote it; returns True if it did"""
+        if not self.catalogue_path or self._file_stamp() == self._catalogue_stamp:
+            return False
+        with self._similarity_lock:
+            return self._reload_locked()
+    
+    def _set_catalogue(self, internships: List[Dict[str, Any]]):
+        """Swap in a new catalogue list (caller holds ``_similarity_lock``)"""
+        self.internships = internships
+        self._posting_skill_ids = self._skill_ids_for(internships)
+        # Derived state is rebuilt on next use; stored recommendation lists go stale with the version
+        self._catalogue_version = None
+        self._tfidf_matrix = None
+        self.vectorizer = None
+        self._posting_features = None
+        self._location_index = None
+        self._skill_trie = None
+    
+    def _reload_locked(self) -> bool:
+        stamp = self._file_stamp()
+        if not self.catalogue_path or stamp is None or stamp == self._catalogue_stamp:
+            return False
+        with open(self.catalogue_path, 'r', encoding='utf-8') as f:
+            internships = json.load(f)
+        self._catalogue_stamp = stamp
+        self._set_catalogue(internships)
+        return True
+    
+    def _file_stamp(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.catalogue_path)
+        except (OSError, TypeError):
+            return None
+        return stat.st_mtime_ns, stat.st_size
+    
+    def _write_catalogue(self, internships: List[Dict[str, Any]]):
+        """Replace the catalogue file in one step, so readers never see a partial write"""
+        directory = os.path.dirname(os.path.abspath(self.catalogue_path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.internships-', suffix='.json')
+        try:
+            with contextlib.suppress(OSError):
+                os.chmod(temp_path, os.stat(self.catalogue_path).st_mode & 0o777)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(internships, f, indent=2, ensure_ascii=False)
+                f.write('\n')
+            os.replace(temp_path, self.catalogue_path)
+        except Exception:
+            with contextlib.suppress(OSError):
+                os.remove(temp_path)
+            raise
+        self._catalogue_stamp = self._file_stamp()
+    
+    @contextlib.contextmanager
+    def _catalogue_file_lock(self):
+        """Serialise catalogue read-modify-writes across processes (advisory lock, where available)"""
+        fcntl = optional_module('fcntl')
+        if not self.catalogue_path or fcntl is None:
+            yield
+            return
+        with open(self.catalogue_path + '.lock', 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    def _skill_ids_for(self, internships: List[Dict[str, Any]]) -> Dict[int, Tuple[Dict[str, Any], FrozenSet[int]]]:
+        """Canonical required skill ids of every posting, resolved once when the catalogue is set"""
+        return {id(internship): (internship, self.skill_registry.id_set(internship.get('skills_required', [])))
+                for internship in internships}
+    
+    def required_skill_ids(self, internship: Dict[str, Any]) -> FrozenSet[int]:
+        """Canonical ids of a posting's required skills (precomputed for catalogue postings)"""
+        entry = self._posting_skill_ids.get(id(internship))
+        if entry is not None and entry[0] is internship:
+            return entry[1]
+        return self.skill_registry.id_set(internship.get('skills_required', []))
+    
+    def get_internship(self, internship_id: Any) -> Optional[Dict[str, Any]]:
+        """Catalogue entry with the given id, or None"""
         for internship in self.internships:
-            text = f"{internship['title']} {internship['description']} {' '.join(internship['skills_required'])} {internship['sector']}"
-            internship_texts.append(text)
+            if internship.get('id') == internship_id:
+                return internship
+        return None
+    
+    def _education_match(self, candidate_level: str, internship_level: str) -> float:
+        if candidate_level == internship_level:
+            return 1.0
+        if candidate_level == 'Post Graduate' and internship_level == 'Graduate':
+            return 0.8  # Higher education can apply for lower requirements
+        return 0.0
+    
+    def _skills_match(self, candidate_skills: AbstractSet[int], required_skills: AbstractSet[int]) -> float:
+        """Share of the required skills the candidate has, compared as canonical skill ids"""
+        if not required_skills:
+            return 0.0
+        return len(candidate_skills.intersection(required_skills)) / len(required_skills)
+    
+    def _sector_match(self, candidate_interests: Iterable[str], internship_sector: str) -> float:
+        """1.0 if an interest names the sector, 0.5 if one mentions a sector keyword"""
+        internship_sector = internship_sector.lower()
+        candidate_interests = list(candidate_interests)
+        
+        # Check if any of candidate's interests match the internship sector
+        for interest in candidate_interests:
+            if interest.lower() in internship_sector or internship_sector in interest.lower():
+                return 1.0
         
-        # Fit TF-IDF vectorizer
-        self.tfidf_matrix = self.vectorizer.fit_transform(internship_texts)
+        # Partial match using keywords
+        for sector in self.sectors:
+            if sector['id'].lower() == internship_sector:
+                for keyword in sector.get('keywords', []):
+                    if any(keyword.lower() in interest.lower() for interest in candidate_interests):
+                        return 0.5
+                break
+        return 0.0
+    
+    def _location_match(self, candidate_location: str, remote_preference: bool, internship: Dict[str, Any]) -> float:
+        return self._location_detail(candidate_location, remote_preference, internship)[0]
+    
+    def _location_detail(self, candidate_location: str, remote_preference: bool, internship: Dict[str, Any],
+                         candidate: Optional[Place] = None, posting: Optional[Place] = None,
+                         distance: Optional[float] = None, resolved: bool = False) -> Tuple[float, str]:
+        """Location score and why: 'area', 'state', 'nearby', 'remote' or ''.
+        
+        Places are resolved through the gazetteer unless ``resolved`` is set, in
+        which case ``candidate``/``posting`` and their ``distance`` (None when
+        beyond ``nearby_km``) come from a ``LocationIndex`` query.
+        """
+        if not resolved:
+            candidate = self.gazetteer.resolve(candidate_location)
+            posting = self.gazetteer.resolve(internship.get('location', ''))
+            if candidate is not None and posting is not None and candidate.lat is not None and posting.lat is not None:
+                distance = haversine_km(candidate, posting)
+                if distance > LOCATION_CONFIG['nearby_km']:
+                    distance = None
+        
+        score, kind = 0.0, ''
+        if candidate is not None and posting is not None:
+            if distance is not None and distance <= LOCATION_CONFIG['same_area_km']:
+                score, kind = 1.0, 'area'
+            elif candidate.state == posting.state:
+                # A whole state as the preference (or posting) covers every city in it
+                score, kind = (1.0, 'area') if candidate.lat is None or posting.lat is None else (0.6, 'state')
+            elif distance is not None:
+                score, kind = 0.6, 'nearby'
+        elif candidate_location and internship.get('location'):
+            # Not in the gazetteer: fall back to comparing the names
+            candidate_location = candidate_location.lower()
+            internship_location = internship['location'].lower()
+            if candidate_location in internship_location or internship_location in candidate_location:
+                score, kind = 1.0, 'area'
+        if remote_preference and internship.get('remote_work', False) and score < 0.8:
+            score, kind = 0.8, 'remote'
+        return score, kind
+    
+    def _goal_match(self, candidate_goal: str, internship: Dict[str, Any]) -> Optional[float]:
+        """None when the goal is unset or unknown (the goal weight is then left out entirely)"""
+        if not candidate_goal or candidate_goal not in GOAL_KEYWORDS:
+            return None
+        # Check if internship title or description matches career goal
+        internship_text = f"{internship.get('title', '')} {internship.get('description', '')}".lower()
+        for keyword in GOAL_KEYWORDS[candidate_goal]:
+            if keyword in internship_text:
+                return 0.3
+        return 0.0
     
-    def calculate_match_score(self, candidate_profile: Dict[str, Any], internship: Dict[str, Any]) -> float:
-        """Calculate match score between candidate profile and internship"""
+    def _experience_match(self, candidate_level: str, internship_level: str) -> float:
+        if candidate_level == internship_level:
+            return 1.0
+        if candidate_level == 'Intermediate' and internship_level == 'Beginner':
+            return 0.8
+        return 0.0
+    
+    def calculate_match_score(self, candidate_profile: Dict[str, Any], internship: Dict[str, Any],
+                              location_match: Optional[float] = None, skills_match: Optional[float] = None) -> float:
+        """Calculate match score between candidate profile and internship
+        (``location_match``/``skills_match`` pass in components already computed for this pair)"""
+        weights = self.weights
         score = 0.0
         max_score = 0.0
         
         # 1. Education Level Match (30% weight)
-        education_weight = 0.3
-        if candidate_profile.get('education_level') == internship.get('education_level'):
-            score += education_weight * 1.0
-        elif candidate_profile.get('education_level') == 'Post Graduate' and internship.get('education_level') == 'Graduate':
-            score += education_weight * 0.8  # Higher education can apply for lower requirements
-        max_score += education_weight
+        score += weights['education_level'] * self._education_match(
+            candidate_profile.get('education_level'), internship.get('education_level'))
+        max_score += weights['education_level']
         
         # 2. Skills Match (25% weight)
-        skills_weight = 0.25
-        candidate_skills = set(candidate_profile.get('skills', []))
-        required_skills = set(internship.get('skills_required', []))
-        
-        if required_skills:
-            skills_match_ratio = len(candidate_skills.intersection(required_skills)) / len(required_skills)
-            score += skills_weight * skills_match_ratio
-        max_score += skills_weight
+        if skills_match is None:
+            skills_match = self._skills_match(self.skill_registry.ids(candidate_profile.get('skills', [])),
+                                              self.required_skill_ids(internship))
+        score += weights['skills'] * skills_match
+        max_score += weights['skills']
         
         # 3. Sector Interest Match (20% weight)
-        sector_weight = 0.2
-        candidate_interests = set(candidate_profile.get('sector_interests', []))
-        internship_sector = internship.get('sector', '').lower()
-        
-        # Check if any of candidate's interests match the internship sector
-        for interest in candidate_interests:
-            if interest.lower() in internship_sector or internship_sector in interest.lower():
-                score += sector_weight * 1.0
-                break
-        else:
-            # Partial match using keywords
-            for sector in self.sectors:
-                if sector['id'].lower() == internship_sector:
-                    for keyword in sector.get('keywords', []):
-                        if any(keyword.lower() in interest.lower() for interest in candidate_interests):
-                            score += sector_weight * 0.5
-                            break
-                    break
-        max_score += sector_weight
+        score += weights['sector_interests'] * self._sector_match(
+            set(candidate_profile.get('sector_interests', [])), internship.get('sector', ''))
+        max_score += weights['sector_interests']
         
         # 4. Location Preference Match (15% weight)
-        location_weight = 0.15
-        candidate_location = candidate_profile.get('location_preference', '').lower()
-        internship_location = internship.get('location', '').lower()
-        
-        if candidate_location and internship_location:
-            # Exact city match
-            if candidate_location in internship_location or internship_location in candidate_location:
-                score += location_weight * 1.0
-            # State match
-            elif any(state in internship_location for state in ['maharashtra', 'karnataka', 'tamil nadu', 'delhi', 'rajasthan', 'telangana', 'punjab', 'west bengal', 'haryana', 'goa']):
-                if any(state in candidate_location for state in ['maharashtra', 'karnataka', 'tamil nadu', 'delhi', 'rajasthan', 'telangana', 'punjab', 'west bengal', 'haryana', 'goa']):
-                    score += location_weight * 0.6
-            # Remote work preference
-            elif candidate_profile.get('remote_work_preference', False) and internship.get('remote_work', False):
-                score += location_weight * 0.8
-        max_score += location_weight
+        if location_match is None:
+            location_match = self._location_match(candidate_profile.get('location_preference', ''),
+                                                   candidate_profile.get('remote_work_preference', False), internship)
+        score += weights['location'] * location_match
+        max_score += weights['location']
         
-        # 5. Career Goal Match (15% weight)
-        goal_weight = 0.15
-        candidate_goal = candidate_profile.get('career_goal', '')
-        if candidate_goal:
-            # Check if internship title or description matches career goal
-            internship_text = f"{internship.get('title', '')} {internship.get('description', '')}".lower()
-            goal_keywords = {
-                'Software Developer': ['software', 'developer', 'programming', 'coding', 'tech'],
-                'Data Analyst': ['data', 'analyst', 'analytics', 'research', 'statistics'],
-                'Digital Marketer': ['marketing', 'digital', 'social media', 'content', 'brand'],
-                'Project Manager': ['project', 'manager', 'coordination', 'planning', 'leadership'],
-                'UI/UX Designer': ['design', 'ui', 'ux', 'user interface', 'user experience'],
-                'Business Analyst': ['business', 'analyst', 'strategy', 'consulting', 'analysis'],
-                'Content Writer': ['content', 'writer', 'writing', 'blog', 'copy'],
-                'Social Media Manager': ['social media', 'community', 'engagement', 'platform'],
-                'Research Analyst': ['research', 'analyst', 'study', 'investigation', 'analysis'],
-                'Government Officer': ['government', 'public', 'policy', 'administration', 'ministry'],
-                'Healthcare Professional': ['healthcare', 'health', 'medical', 'hospital', 'public health'],
-                'Education Specialist': ['education', 'teaching', 'learning', 'academic', 'school'],
-                'Environmental Consultant': ['environment', 'sustainability', 'green', 'conservation'],
-                'Financial Advisor': ['finance', 'financial', 'banking', 'investment', 'economic'],
-                'Agriculture Specialist': ['agriculture', 'farming', 'rural', 'crop', 'agricultural']
-            }
-            
-            if candidate_goal in goal_keywords:
-                for keyword in goal_keywords[candidate_goal]:
-                    if keyword in internship_text:
-                        score += goal_weight * 0.3
-                        break
-                max_score += goal_weight
+        # 5. Career Goal Match (15% weight, only counted when the candidate has a known goal)
+        goal_match = self._goal_match(candidate_profile.get('career_goal', ''), internship)
+        if goal_match is not None:
+            score += weights['career_goal'] * goal_match
+            max_score += weights['career_goal']
         
         # 6. Experience Level Match (10% weight)
-        experience_weight = 0.1
-        candidate_experience = candidate_profile.get('experience_level', 'Beginner')
-        internship_experience = internship.get('experience_level', 'Beginner')
-        
-        if candidate_experience == internship_experience:
-            score += experience_weight * 1.0
-        elif candidate_experience == 'Intermediate' and internship_experience == 'Beginner':
-            score += experience_weight * 0.8
-        max_score += experience_weight
+        score += weights['experience_level'] * self._experience_match(
+            candidate_profile.get('experience_level', 'Beginner'), internship.get('experience_level', 'Beginner'))
+        max_score += weights['experience_level']
         
         # Normalize score to 0-1 range
         if max_score > 0:
@@ -168,43 +422,83 @@ class InternshipRecommendationEngine:
             return min(max(normalized_score, 0.0), 1.0)
         return 0.0
     
-    def get_recommendations(self, candidate_profile: Dict[str, Any], num_recommendations: int = 20) -> List[Dict[str, Any]]:
-        """Get personalized internship recommendations for a candidate"""
-        if not self.internships:
+    def get_recommendations(self, candidate_profile: Dict[str, Any], num_recommendations: int = MAX_RECOMMENDATIONS,
+                            diversity: Optional[Dict[str, Any]] = None,
+                            max_distance_km: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Get personalized internship recommendations for a candidate.
+        
+        ``diversity`` (see ``diversity.diversity_options``) re-ranks the best
+        ``pool_size`` matches with MMR and per-sector/organisation/location quotas.
+        ``max_distance_km`` keeps only postings that close to the candidate's
+        city (plus remote ones if they prefer remote work).
+        """
+        internships = self.internships
+        if not internships:
             return []
         
+        # One spatial query finds the postings near the candidate; the rest get no distance credit
+        candidate_location = candidate_profile.get('location_preference', '')
+        remote_preference = candidate_profile.get('remote_work_preference', False)
+        locations = self.location_index(internships)
+        candidate_place = self.gazetteer.resolve(candidate_location)
+        nearby_km = LOCATION_CONFIG['nearby_km']
+        nearby = locations.within(candidate_place, max(nearby_km, max_distance_km or 0.0))
+        positions = range(len(internships))
+        if max_distance_km is not None:
+            if candidate_place is None or candidate_place.lat is None:
+                raise ValueError('max_distance_km needs a location_preference naming a known city')
+            positions = sorted(set(position for position, distance in nearby.items() if distance <= max_distance_km) |
+                               set(position for position in positions
+                                   if remote_preference and internships[position].get('remote_work', False)))
+        
+        candidate_skills = self.skill_registry.ids(candidate_profile.get('skills', []))
+        
         # Calculate match scores for all internships
         scored_internships = []
-        for internship in self.internships:
-            match_score = self.calculate_match_score(candidate_profile, internship)
-            # compute explicit skills match percentage
-            candidate_skills = set(candidate_profile.get('skills', []))
-            required_skills = set(internship.get('skills_required', []))
-            skills_match_percentage = 0.0
-            if required_skills:
-                skills_match_percentage = (len(candidate_skills.intersection(required_skills)) / len(required_skills)) * 100.0
-                # Ensure skills match percentage is between 0-100%
-                skills_match_percentage = min(max(skills_match_percentage, 0), 100)
-            scored_internships.append({
-                'internship': internship,
-                'match_score': match_score,
-                'skills_match_percentage': round(skills_match_percentage, 1)
-            })
+        with stage('score'):
+            for position in positions:
+                internship = internships[position]
+                distance = nearby.get(position)
+                location_match = self._location_detail(
+                    candidate_location, remote_preference, internship, candidate_place, locations.places[position],
+                    distance if distance is not None and distance <= nearby_km else None, resolved=True)[0]
+                skills_match = self._skills_match(candidate_skills, self.required_skill_ids(internship))
+                match_score = self.calculate_match_score(candidate_profile, internship, location_match, skills_match)
+                # Explicit skills match percentage, between 0-100%
+                skills_match_percentage = min(max(skills_match * 100.0, 0), 100)
+                scored_internships.append({
+                    'internship': internship,
+                    'position': position,
+                    'match_score': match_score,
+                    'skills_match_percentage': round(skills_match_percentage, 1)
+                })
+        POSTINGS_SCORED.inc(len(scored_internships))
+        POSTINGS_SCORED_PER_REQUEST.observe(len(scored_internships))
         
-        # Sort by match score (descending)
-        scored_internships.sort(key=lambda x: x['match_score'], reverse=True)
-        
-        # Return top recommendations with match explanations
-        recommendations = []
-        for item in scored_internships[:num_recommendations]:
-            if item['match_score'] > 0.1:  # Only include if there's some match
-                recommendation = item['internship'].copy()
-                recommendation['match_score'] = round(item['match_score'] * 100, 1)
-                # Ensure match score is between 0-100%
-                recommendation['match_score'] = min(max(recommendation['match_score'], 0), 100)
-                recommendation['skills_match_percentage'] = item['skills_match_percentage']
-                recommendation['match_reasons'] = self.get_match_reasons(candidate_profile, item['internship'])
-                recommendations.append(recommendation)
+        with stage('rank'):
+            # Sort by match score (descending)
+            scored_internships.sort(key=lambda x: x['match_score'], reverse=True)
+            selected = scored_internships[:num_recommendations]
+            
+            if diversity:
+                pool = [item for item in scored_internships[:diversity['pool_size']] if item['match_score'] > self.min_match_score]
+                by_position = {item['position']: item for item in pool}
+                picked = diversify([item['position'] for item in pool], [item['match_score'] for item in pool],
+                                   self.posting_features(internships), num_recommendations,
+                                   diversity['mmr_lambda'], diversity['quotas'])
+                selected = [by_position[position] for position in picked]
+            
+            # Return top recommendations with match explanations
+            recommendations = []
+            for item in selected:
+                if item['match_score'] > self.min_match_score:  # Only include if there's some match
+                    recommendation = item['internship'].copy()
+                    recommendation['match_score'] = round(item['match_score'] * 100, 1)
+                    # Ensure match score is between 0-100%
+                    recommendation['match_score'] = min(max(recommendation['match_score'], 0), 100)
+                    recommendation['skills_match_percentage'] = item['skills_match_percentage']
+                    recommendation['match_reasons'] = self.get_match_reasons(candidate_profile, item['internship'])
+                    recommendations.append(recommendation)
         
         return recommendations
     
@@ -217,11 +511,11 @@ class InternshipRecommendationEngine:
             reasons.append("Your education level matches the requirement")
         
         # Skills match
-        candidate_skills = set(candidate_profile.get('skills', []))
-        required_skills = set(internship.get('skills_required', []))
-        matching_skills = candidate_skills.intersection(required_skills)
+        candidate_skills = self.skill_registry.ids(candidate_profile.get('skills', []))
+        matching_skills = [skill for skill in dict.fromkeys(internship.get('skills_required', []))
+                           if self.skill_registry.canonical_id(skill) in candidate_skills]
         if matching_skills:
-            reasons.append(f"You have relevant skills: {', '.join(list(matching_skills)[:3])}")
+            reasons.append(f"You have relevant skills: {', '.join(matching_skills[:3])}")
         
         # Sector interest match
         candidate_interests = candidate_profile.get('sector_interests', [])
@@ -232,39 +526,22 @@ class InternshipRecommendationEngine:
         # Location match
         candidate_location = candidate_profile.get('location_preference', '')
         internship_location = internship.get('location', '')
-        if candidate_location and internship_location:
-            if candidate_location.lower() in internship_location.lower():
-                reasons.append(f"Located in your preferred area: {internship_location}")
-            elif candidate_profile.get('remote_work_preference', False) and internship.get('remote_work', False):
-                reasons.append("Offers remote work as per your preference")
+        _, kind = self._location_detail(candidate_location, candidate_profile.get('remote_work_preference', False),
+                                        internship)
+        if kind == 'area':
+            reasons.append(f"Located in your preferred area: {internship_location}")
+        elif kind == 'state':
+            reasons.append(f"In your preferred state: {self.gazetteer.resolve(internship_location).state}")
+        elif kind == 'nearby':
+            distance = haversine_km(self.gazetteer.resolve(candidate_location), self.gazetteer.resolve(internship_location))
+            reasons.append(f"About {round(distance)} km from {candidate_location}: {internship_location}")
+        elif kind == 'remote':
+            reasons.append("Offers remote work as per your preference")
         
         # Career goal match
         candidate_goal = candidate_profile.get('career_goal', '')
-        if candidate_goal:
-            internship_text = f"{internship.get('title', '')} {internship.get('description', '')}".lower()
-            goal_keywords = {
-                'Software Developer': ['software', 'developer', 'programming', 'coding', 'tech'],
-                'Data Analyst': ['data', 'analyst', 'analytics', 'research', 'statistics'],
-                'Digital Marketer': ['marketing', 'digital', 'social media', 'content', 'brand'],
-                'Project Manager': ['project', 'manager', 'coordination', 'planning', 'leadership'],
-                'UI/UX Designer': ['design', 'ui', 'ux', 'user interface', 'user experience'],
-                'Business Analyst': ['business', 'analyst', 'strategy', 'consulting', 'analysis'],
-                'Content Writer': ['content', 'writer', 'writing', 'blog', 'copy'],
-                'Social Media Manager': ['social media', 'community', 'engagement', 'platform'],
-                'Research Analyst': ['research', 'analyst', 'study', 'investigation', 'analysis'],
-                'Government Officer': ['government', 'public', 'policy', 'administration', 'ministry'],
-                'Healthcare Professional': ['healthcare', 'health', 'medical', 'hospital', 'public health'],
-                'Education Specialist': ['education', 'teaching', 'learning', 'academic', 'school'],
-                'Environmental Consultant': ['environment', 'sustainability', 'green', 'conservation'],
-                'Financial Advisor': ['finance', 'financial', 'banking', 'investment', 'economic'],
-                'Agriculture Specialist': ['agriculture', 'farming', 'rural', 'crop', 'agricultural']
-            }
-            
-            if candidate_goal in goal_keywords:
-                for keyword in goal_keywords[candidate_goal]:
-                    if keyword in internship_text:
-                        reasons.append(f"Aligns with your career goal: {candidate_goal}")
-                        break
+        if self._goal_match(candidate_goal, internship):
+            reasons.append(f"Aligns with your career goal: {candidate_goal}")
         
         # Experience level
         if candidate_profile.get('experience_level') == internship.get('experience_level'):
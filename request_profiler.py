@@ -0,0 +1,212 @@
+"""
+On-demand request profiling for PM Internship Scheme
+Runs a single request under cProfile (pstats) or a stack sampler (collapsed
+stacks for flamegraph.pl / speedscope) and keeps the results on disk, plus a
+rolling buffer of the slowest requests with their inputs.
+"""
+
+import cProfile
+import heapq
+import io
+import itertools
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+PROFILE_MODES = ('cprofile', 'sample')
+
+
+class RequestProfile:
+    """One in-flight profile, started and stopped on the request thread"""
+
+    def __init__(self, mode: str, sample_interval: float = 0.001):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode '{mode}'. Choose from: {', '.join(PROFILE_MODES)}")
+        self.id = uuid.uuid4().hex[:16]
+        self.mode = mode
+        self.sample_interval = sample_interval
+        self._profiler: Optional[cProfile.Profile] = None
+        self._stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+
+    def start(self):
+        if self.mode == 'cprofile':
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        else:
+            target = threading.get_ident()
+            self._sampler = threading.Thread(target=self._sample, args=(target,), daemon=True)
+            self._sampler.start()
+
+    def stop(self):
+        if self._profiler is not None:
+            self._profiler.disable()
+        if self._sampler is not None:
+            self._stop.set()
+            self._sampler.join()
+
+    def _sample(self, target: int):
+        while not self._stop.wait(self.sample_interval):
+            frame = sys._current_frames().get(target)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            self._stacks[';'.join(reversed(stack))] += 1
+
+    def collapsed(self) -> str:
+        """Brendan Gregg collapsed-stack format: ``frame;frame;frame count`` per line"""
+        if self._profiler is not None:
+            return _collapse_pstats(pstats.Stats(self._profiler))
+        return ''.join(f"{stack} {count}\n" for stack, count in self._stacks.most_common())
+
+    def summary(self, limit: int = 40) -> str:
+        if self._profiler is None:
+            return self.collapsed()
+        out = io.StringIO()
+        pstats.Stats(self._profiler, stream=out).sort_stats('cumulative').print_stats(limit)
+        return out.getvalue()
+
+    def dump_pstats(self, path: str):
+        if self._profiler is not None:
+            self._profiler.dump_stats(path)
+
+
+def _collapse_pstats(stats: pstats.Stats) -> str:
+    """Approximate collapsed stacks from cProfile caller edges.
+
+    cProfile only records caller -> callee pairs, so each function's own time
+    is attributed to its heaviest call path; good enough to eyeball a flamegraph.
+    """
+    def label(func):
+        filename, line, name = func
+        return f"{name} ({os.path.basename(filename)}:{line})"
+
+    entries = stats.stats  # func -> (cc, nc, tottime, cumtime, callers)
+    lines = []
+    for func, (_, _, tottime, _, callers) in entries.items():
+        if tottime <= 0:
+            continue
+        path = [label(func)]
+        seen = {func}
+        current = callers
+        while current:
+            # Follow the caller that contributed the most cumulative time
+            parent = max(current.items(), key=lambda item: item[1][3])[0]
+            if parent in seen or parent not in entries:
+                break
+            seen.add(parent)
+            path.append(label(parent))
+            current = entries[parent][4]
+        lines.append(f"{';'.join(reversed(path))} {int(tottime * 1_000_000)}")
+    return '\n'.join(sorted(lines)) + '\n'
+
+
+class RequestProfiler:
+    """Admin-triggered per-request profiles, one at a time, stored under ``output_dir``"""
+
+    def __init__(self, output_dir: str = 'data/profiles', keep: int = 50):
+        self.output_dir = output_dir
+        self.keep = keep
+        self._busy = threading.Lock()
+        self._lock = threading.Lock()
+        self._index: List[Dict[str, Any]] = []
+        os.makedirs(output_dir, exist_ok=True)
+
+    def begin(self, mode: str) -> Optional[RequestProfile]:
+        """Start profiling the calling thread, or None if another profile is running"""
+        # Only one profiler can hook the interpreter reliably at a time
+        if not self._busy.acquire(blocking=False):
+            return None
+        try:
+            profile = RequestProfile(mode)
+            profile.start()
+        except Exception:
+            self._busy.release()
+            raise
+        return profile
+
+    def end(self, profile: RequestProfile, route: str, duration: float) -> Dict[str, Any]:
+        try:
+            profile.stop()
+        finally:
+            self._busy.release()
+
+        base = os.path.join(self.output_dir, profile.id)
+        with open(base + '.collapsed', 'w', encoding='utf-8') as f:
+            f.write(profile.collapsed())
+        with open(base + '.txt', 'w', encoding='utf-8') as f:
+            f.write(profile.summary())
+        profile.dump_pstats(base + '.prof')
+
+        entry = {
+            'id': profile.id,
+            'mode': profile.mode,
+            'route': route,
+            'duration_ms': round(duration * 1000, 3),
+            'created_at': datetime.now().isoformat()
+        }
+        with self._lock:
+            self._index.append(entry)
+            expired = self._index[:-self.keep] if len(self._index) > self.keep else []
+            self._index = self._index[-self.keep:]
+        for old in expired:
+            for ext in ('.collapsed', '.txt', '.prof'):
+                try:
+                    os.remove(os.path.join(self.output_dir, old['id'] + ext))
+                except OSError:
+                    pass
+        return entry
+
+    def list(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(reversed(self._index))
+
+    def path(self, profile_id: str, fmt: str) -> Optional[str]:
+        """File holding a stored profile as 'collapsed', 'text' or 'pstats'"""
+        ext = {'collapsed': '.collapsed', 'text': '.txt', 'pstats': '.prof'}.get(fmt)
+        if ext is None or not profile_id.isalnum():
+            return None
+        path = os.path.join(self.output_dir, profile_id + ext)
+        return path if os.path.exists(path) else None
+
+
+class SlowRequestLog:
+    """The ``capacity`` slowest requests seen since startup, with their inputs"""
+
+    def __init__(self, capacity: int = 20):
+        self.capacity = capacity
+        self._heap: List[Any] = []
+        self._lock = threading.Lock()
+        self._tiebreak = itertools.count()
+        self._threshold = 0.0
+
+    def would_record(self, duration: float) -> bool:
+        # Unlocked read: a stale threshold only means one extra trip through record()
+        return len(self._heap) < self.capacity or duration > self._threshold
+
+    def record(self, duration: float, entry: Dict[str, Any]):
+        entry = dict(entry, duration_ms=round(duration * 1000, 3), recorded_at=time.time())
+        with self._lock:
+            item = (duration, next(self._tiebreak), entry)
+            if len(self._heap) < self.capacity:
+                heapq.heappush(self._heap, item)
+            elif duration > self._heap[0][0]:
+                heapq.heapreplace(self._heap, item)
+            if len(self._heap) >= self.capacity:
+                self._threshold = self._heap[0][0]
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            items = sorted(self._heap, reverse=True)
+        return [entry for _, _, entry in items]
@@ -0,0 +1,132 @@
+"""
+Per-stage request timing for PM Internship Scheme
+Code marks phases with ``with stage('name'):``; when a request timer is
+active on the current thread the durations are collected, emitted as a
+Server-Timing header and aggregated in-process. With no active timer
+``stage`` returns a shared no-op, so instrumented code costs almost nothing
+when timing is disabled or runs outside a request (batch jobs, benchmarks).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+_state = threading.local()
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ('timer', 'name', 'start')
+
+    def __init__(self, timer: 'RequestTimer', name: str):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.timer.add(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class RequestTimer:
+    """Durations (seconds) of the stages seen during one request, in first-seen order"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: 'OrderedDict[str, float]' = OrderedDict()
+
+    def add(self, name: str, seconds: float):
+        # Repeated stages (e.g. one per page) accumulate
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def total(self) -> float:
+        return time.perf_counter() - self.started
+
+    def header_value(self) -> str:
+        """Server-Timing header value, durations in milliseconds"""
+        parts = [f"{name};dur={seconds * 1000:.2f}" for name, seconds in self.stages.items()]
+        parts.append(f"total;dur={self.total() * 1000:.2f}")
+        return ', '.join(parts)
+
+
+def stage(name: str):
+    """Context manager timing ``name`` on the current request, or a no-op"""
+    timer = getattr(_state, 'timer', None)
+    if timer is None:
+        return _NULL_STAGE
+    return _Stage(timer, name)
+
+
+def start_request() -> RequestTimer:
+    timer = RequestTimer()
+    _state.timer = timer
+    return timer
+
+
+def current_timer() -> Optional[RequestTimer]:
+    return getattr(_state, 'timer', None)
+
+
+def finish_request() -> Optional[RequestTimer]:
+    timer = getattr(_state, 'timer', None)
+    _state.timer = None
+    return timer
+
+
+class StageStats:
+    """In-process aggregate of stage durations per route"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, Dict[str, float]]] = {}
+
+    def record(self, route: str, timer: RequestTimer):
+        total = timer.total()
+        with self._lock:
+            route_stats = self._stats.setdefault(route, {})
+            for name, seconds in list(timer.stages.items()) + [('total', total)]:
+                entry = route_stats.get(name)
+                if entry is None:
+                    entry = route_stats[name] = {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0}
+                ms = seconds * 1000
+                entry['count'] += 1
+                entry['total_ms'] += ms
+                if ms > entry['max_ms']:
+                    entry['max_ms'] = ms
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                route: {
+                    name: {
+                        'count': entry['count'],
+                        'mean_ms': round(entry['total_ms'] / entry['count'], 3),
+                        'max_ms': round(entry['max_ms'], 3)
+                    }
+                    for name, entry in stages.items()
+                }
+                for route, stages in self._stats.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+stage_stats = StageStats()
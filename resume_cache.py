@@ -0,0 +1,128 @@
+"""
+Content-hash cache for resume extraction results
+Identical uploads are served from memory (or disk) instead of being re-parsed
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+
+
+def file_digest(file_path: str) -> str:
+    """SHA-256 hex digest of a file, read in chunks"""
+    sha = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+class ResumeExtractionCache:
+    """Thread-safe LRU cache of extraction results keyed by content hash.
+
+    Keys combine the file digest with the extractor's vocabulary version
+    and the skill registry's version, so a change to ``skills.json`` or
+    ``skill_aliases.json`` naturally invalidates old entries. When
+    ``persist_dir`` is set, entries are also written there as JSON and
+    reloaded on a memory miss (e.g. after a restart).
+    """
+
+    def __init__(self, max_entries: int = 1024, persist_dir: Optional[str] = None):
+        self.max_entries = max_entries
+        self.persist_dir = persist_dir
+        self._entries: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if persist_dir and not os.path.exists(persist_dir):
+            os.makedirs(persist_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(digest: str, vocabulary_version: str, registry_version: str = '') -> str:
+        # Cached skills are canonicalized, so the alias registry is part of the key
+        if registry_version:
+            vocabulary_version = f"{vocabulary_version}.{registry_version}"
+        return f"{vocabulary_version}:{digest}"
+
+    def _disk_path(self, key: str) -> str:
+        name = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.persist_dir, name[:2], f"{name}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached result, or None on a miss"""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(value)
+
+        value = self._load_from_disk(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._store(key, value)
+        return copy.deepcopy(value)
+
+    def put(self, key: str, value: Dict[str, Any]):
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._store(key, value)
+        self._save_to_disk(key, value)
+
+    def _store(self, key: str, value: Dict[str, Any]):
+        """Insert and evict least recently used entries (caller holds the lock)"""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _load_from_disk(self, key: str) -> Optional[Dict[str, Any]]:
+        if not self.persist_dir:
+            return None
+        try:
+            with open(self._disk_path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _save_to_disk(self, key: str, value: Dict[str, Any]):
+        if not self.persist_dir:
+            return
+        path = self._disk_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write atomically so concurrent readers never see a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(value, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.error("Error persisting resume cache entry: %s", e, extra={'event': 'resume_cache.persist_failed'})
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / total, 4) if total else 0.0
+            }
@@ -0,0 +1,197 @@
+"""
+Content-addressed resume storage for PM Internship Scheme
+Uploads are stored once per unique content under a sharded hash layout,
+reference-counted per user in the shared SQLite database and
+garbage-collected when no user points at them
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Optional
+
+from upload_utils import save_upload
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS resume_refs (
+    user_id TEXT PRIMARY KEY,
+    object TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_resume_refs_object ON resume_refs(object);
+"""
+
+_SELECT_REFERENCED = "SELECT 1 FROM resume_refs WHERE object = ? LIMIT 1"
+_COUNT_REFS = "SELECT COUNT(*) FROM resume_refs WHERE object = ?"
+_UPSERT_REF = (
+    "INSERT INTO resume_refs (user_id, object) VALUES (?, ?) "
+    "ON CONFLICT(user_id) DO UPDATE SET object = excluded.object"
+)
+_DELETE_REF = "DELETE FROM resume_refs WHERE user_id = ?"
+_IMPORT_REF = "INSERT OR IGNORE INTO resume_refs (user_id, object) VALUES (?, ?)"
+
+
+class ResumeStore:
+    """Deduplicating store for uploaded resumes.
+
+    A file with SHA-256 ``abcdef...`` and extension ``.pdf`` lives at
+    ``<root>/ab/cd/abcdef....pdf``. Each user references at most one stored
+    resume (their current one); uploading a new resume releases the old
+    reference. Files with no references are removed by ``collect_garbage``
+    once they are older than ``grace_period`` seconds, so an upload that is
+    still being linked to a profile is never deleted underneath it.
+
+    References live in the ``resume_refs`` table of the SQLite database at
+    ``db_path`` (one row per user), shared by every worker process. Placing
+    a file and pointing a user at it happen in one ``BEGIN IMMEDIATE``
+    transaction, and the GC checks references under the same lock, so no
+    worker deletes a file another worker has just stored. Keep the database
+    outside any publicly served directory since it maps user ids to files.
+    """
+
+    def __init__(self, root: str, db_path: str, grace_period: float = 3600.0,
+                 legacy_refs_file: Optional[str] = None, busy_timeout_ms: int = 5000):
+        self.root = root
+        self.grace_period = grace_period
+        self.db_path = db_path
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self._gc_thread: Optional[threading.Thread] = None
+        self._gc_stop = threading.Event()
+        os.makedirs(root, exist_ok=True)
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self._connect().executescript(_SCHEMA)
+        if legacy_refs_file:
+            self._import_legacy_refs(legacy_refs_file)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # isolation_level=None: transactions are managed explicitly below
+            conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(f'PRAGMA busy_timeout={int(self.busy_timeout_ms)}')
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        else:
+            conn.execute('COMMIT')
+
+    def _object_path(self, name: str) -> str:
+        return os.path.join(self.root, name[:2], name[2:4], name)
+
+    def url_path(self, name: str) -> str:
+        """Path of a stored object relative to the store root, using forward slashes"""
+        return f"{name[:2]}/{name[2:4]}/{name}"
+
+    def store(self, file_storage, extension: str, user_id: str, max_bytes: Optional[int] = None) -> str:
+        """Save an upload (deduplicated), point ``user_id`` at it and return the object name"""
+        hasher = hashlib.sha256()
+        fd, temp_path = tempfile.mkstemp(dir=self.root, suffix='.part')
+        os.close(fd)
+        save_upload(file_storage, temp_path, max_bytes, hasher=hasher)
+
+        name = f"{hasher.hexdigest()}{extension}"
+        path = self._object_path(name)
+        try:
+            with self._transaction() as conn:
+                if os.path.exists(path):
+                    os.remove(temp_path)
+                    # Refresh mtime so a pending GC pass treats it as recently used
+                    os.utime(path)
+                else:
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    os.replace(temp_path, path)
+                conn.execute(_UPSERT_REF, (user_id, name))
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return name
+
+    def release(self, user_id: str):
+        """Drop the user's reference to their current resume"""
+        with self._transaction() as conn:
+            conn.execute(_DELETE_REF, (user_id,))
+
+    def ref_count(self, name: str) -> int:
+        return self._connect().execute(_COUNT_REFS, (name,)).fetchone()[0]
+
+    def _import_legacy_refs(self, refs_file: str):
+        """Copy references from the old JSON refs file, keeping any row already in the table"""
+        try:
+            with open(refs_file, 'r', encoding='utf-8') as f:
+                users = json.load(f).get('users', {})
+        except (FileNotFoundError, ValueError):
+            return
+        with self._transaction() as conn:
+            conn.executemany(_IMPORT_REF, list(users.items()))
+        try:
+            os.replace(refs_file, refs_file + '.imported')
+        except OSError:
+            # Another worker imported it at the same time
+            return
+        logger.info("Imported %d resume references from %s", len(users), refs_file,
+                    extra={'event': 'resume_store.refs_imported'})
+
+    def collect_garbage(self) -> List[str]:
+        """Delete unreferenced objects and stale partial uploads; return what was removed"""
+        removed = []
+        cutoff = time.time() - self.grace_period
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                # At the top level only leftover partial writes are ours to clean up
+                if dirpath == self.root and not filename.endswith(('.part', '.tmp')):
+                    continue
+                path = os.path.join(dirpath, filename)
+                # Under the write lock no worker can be storing or referencing this file
+                with self._transaction() as conn:
+                    if conn.execute(_SELECT_REFERENCED, (filename,)).fetchone():
+                        continue
+                    try:
+                        if os.path.getmtime(path) >= cutoff:
+                            continue
+                        os.remove(path)
+                    except OSError:
+                        continue
+                removed.append(path)
+        return removed
+
+    def start_gc(self, interval: float = 3600.0):
+        """Run ``collect_garbage`` every ``interval`` seconds on a daemon thread"""
+        if self._gc_thread is not None:
+            return
+
+        def loop():
+            while not self._gc_stop.wait(interval):
+                try:
+                    removed = self.collect_garbage()
+                    if removed:
+                        logger.info("Resume store GC removed %d orphaned files", len(removed),
+                                    extra={'event': 'resume_store.gc'})
+                except Exception as e:
+                    logger.exception("Resume store GC failed: %s", e, extra={'event': 'resume_store.gc_failed'})
+
+        self._gc_thread = threading.Thread(target=loop, name='resume-store-gc', daemon=True)
+        self._gc_thread.start()
+
+    def stop_gc(self):
+        self._gc_stop.set()
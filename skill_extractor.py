@@ -4,24 +4,24 @@ Skill Extractor for PM Internship Scheme
 Extracts real skills and requirements from internship data
 """
 
+import hashlib
 import json
+import logging
 import re
 from collections import Counter
 from typing import List, Dict, Any, Set
 import os
 
-# Optional imports for resume parsing
-try:
-    import PyPDF2  # type: ignore
-    HAS_PYPDF2 = True
-except Exception:
-    HAS_PYPDF2 = False
+from lazy_imports import is_available, optional_module
+from metrics import EXTRACTION_FAILURES, RESUME_PAGES_PARSED, RESUMES_PARSED
+from request_timing import stage
+from structured_logging import log_event
 
-try:
-    import docx  # python-docx
-    HAS_PYTHON_DOCX = True
-except Exception:
-    HAS_PYTHON_DOCX = False
+logger = logging.getLogger(__name__)
+
+# Optional resume parsers, imported on the first PDF/DOCX upload
+HAS_PYPDF2 = is_available('PyPDF2')
+HAS_PYTHON_DOCX = is_available('docx')  # python-docx
 
 class SkillExtractor:
     def __init__(self):
@@ -45,15 +45,17 @@ class SkillExtractor:
                 try:
                     with open(path, 'r', encoding='utf-8') as f:
                         self.internships = json.load(f)
-                        print(f"Successfully loaded data from: {path}")
+                        log_event(logger, 'skill_extractor.data_loaded', 'Loaded internship data',
+                                  level=logging.DEBUG, path=path, internships=len(self.internships))
                         return
                 except FileNotFoundError:
                     continue
             
-            print("Error: internships.json not found in any expected location")
+            log_event(logger, 'skill_extractor.data_missing', 'internships.json not found in any expected location',
+                      level=logging.ERROR, paths=possible_paths)
             self.internships = []
         except Exception as e:
-            print(f"Error loading data: {e}")
+            logger.exception("Error loading data: %s", e, extra={'event': 'skill_extractor.data_failed'})
             self.internships = []
     
     def analyze_skills(self):
@@ -250,6 +252,9 @@ class ResumeSkillExtractor:
         # Additional skill patterns for better matching
         self.skill_patterns = self._build_skill_patterns()
         
+        # Fingerprint of the vocabulary, used to key cached extraction results
+        self.vocabulary_version = self._compute_vocabulary_version()
+        
         # Education patterns
         self.education_patterns = [
             r'(?i)(bachelor|b\.?s\.?|b\.?e\.?|b\.?tech|b\.?com|b\.?a\.?|b\.?sc)',
@@ -285,10 +290,11 @@ class ResumeSkillExtractor:
                 except FileNotFoundError:
                     continue
             
-            print(f"Warning: skills.json not found, using empty skills list")
+            log_event(logger, 'resume_extractor.skills_missing', 'skills.json not found, using empty skills list',
+                      level=logging.WARNING, paths=possible_paths)
             return []
         except Exception as e:
-            print(f"Error loading skills: {e}")
+            logger.exception("Error loading skills: %s", e, extra={'event': 'resume_extractor.skills_failed'})
             return []
 
     def _build_normalized_skill_map(self, skills: List[str]) -> Dict[str, str]:
@@ -313,6 +319,10 @@ class ResumeSkillExtractor:
             'communication': ['english', 'communication', 'presentation', 'writing', 'public speaking']
         }
 
+    def _compute_vocabulary_version(self) -> str:
+        payload = json.dumps([self.known_skills, self.skill_patterns], sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
     def _normalize_text(self, text: str) -> str:
         text_lower = text.lower()
         # keep only alphanumerics and spaces
@@ -330,13 +340,15 @@ class ResumeSkillExtractor:
         return text.strip()
 
     def _extract_text_from_pdf(self, file_path: str) -> str:
-        if not HAS_PYPDF2:
+        PyPDF2 = optional_module('PyPDF2') if HAS_PYPDF2 else None
+        if PyPDF2 is None:
             return ''
         try:
             text_parts = []
             with open(file_path, 'rb') as f:
                 reader = PyPDF2.PdfReader(f)
                 for page in reader.pages:
+                    RESUME_PAGES_PARSED.inc()
                     try:
                         page_text = page.extract_text()
                         if page_text:
@@ -344,15 +356,20 @@ class ResumeSkillExtractor:
                             page_text = self._clean_text(page_text)
                             text_parts.append(page_text)
                     except Exception as e:
-                        print(f"Error extracting text from PDF page: {e}")
+                        EXTRACTION_FAILURES.labels('pdf_page').inc()
+                        log_event(logger, 'resume_extractor.pdf_page_failed', 'Error extracting text from PDF page',
+                                  level=logging.WARNING, error=str(e))
                         continue
             return '\n'.join(text_parts)
         except Exception as e:
-            print(f"Error reading PDF file: {e}")
+            EXTRACTION_FAILURES.labels('pdf').inc()
+            log_event(logger, 'resume_extractor.pdf_failed', 'Error reading PDF file',
+                      level=logging.ERROR, error=str(e))
             return ''
 
     def _extract_text_from_docx(self, file_path: str) -> str:
-        if not HAS_PYTHON_DOCX:
+        docx = optional_module('docx') if HAS_PYTHON_DOCX else None
+        if docx is None:
             return ''
         try:
             d = docx.Document(file_path)
@@ -362,7 +379,9 @@ class ResumeSkillExtractor:
                     text_parts.append(self._clean_text(paragraph.text))
             return '\n'.join(text_parts)
         except Exception as e:
-            print(f"Error reading DOCX file: {e}")
+            EXTRACTION_FAILURES.labels('docx').inc()
+            log_event(logger, 'resume_extractor.docx_failed', 'Error reading DOCX file',
+                      level=logging.ERROR, error=str(e))
             return ''
 
     def _extract_text_from_txt(self, file_path: str) -> str:
@@ -370,10 +389,12 @@ class ResumeSkillExtractor:
             with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
                 return f.read()
         except Exception:
+            EXTRACTION_FAILURES.labels('txt').inc()
             return ''
 
     def extract_text(self, file_path: str) -> str:
         ext = os.path.splitext(file_path)[1].lower()
+        RESUMES_PARSED.labels(ext.lstrip('.') or 'txt').inc()
         if ext == '.pdf':
             return self._extract_text_from_pdf(file_path)
         if ext in ['.docx', '.doc']:
@@ -513,7 +534,8 @@ class ResumeSkillExtractor:
     
     def extract_comprehensive_data(self, file_path: str) -> Dict[str, Any]:
         """Extract comprehensive data from resume including skills, education, experience, and contact info"""
-        text = self.extract_text(file_path)
+        with stage('parse'):
+            text = self.extract_text(file_path)
         if not text:
             return {
                 'skills': [],
@@ -526,16 +548,19 @@ class ResumeSkillExtractor:
                 'education_level': 'Graduate'
             }
         
-        return {
-            'skills': self.extract_skills_from_text(text),
-            'education': self.extract_education(text),
-            'experience': self.extract_experience(text),
-            'name': self.extract_name(text),
-            'email': self.extract_email(text),
-            'phone': self.extract_phone(text),
-            'experience_level': self.determine_experience_level(text),
-            'education_level': self.determine_education_level(text)
-        }
+        with stage('skills'):
+            skills = self.extract_skills_from_text(text)
+        with stage('fields'):
+            return {
+                'skills': skills,
+                'education': self.extract_education(text),
+                'experience': self.extract_experience(text),
+                'name': self.extract_name(text),
+                'email': self.extract_email(text),
+                'phone': self.extract_phone(text),
+                'experience_level': self.determine_experience_level(text),
+                'education_level': self.determine_education_level(text)
+            }
     
     def extract_education(self, text: str) -> str:
         """Extract education information from resume text"""
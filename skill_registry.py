@@ -0,0 +1,240 @@
+"""
+Canonical skill registry for PM Internship Scheme
+Skills reach the engine from the skills.json chips, the resume extractor
+("Sql", "Node.Js", "MS Excel") and postings' skills_required, so exact
+string comparison often misses. The registry maps any skill string to a
+canonical integer id: through the bundled aliases (data/skill_aliases.json)
+first, then through a trigram index checked with edit distance for typos.
+Unknown skills get a transient id hashed from their spelling, so identical
+spellings still match each other without growing the registry from request
+input. Lookups are cached per string.
+
+Fuzzy matches only affect scoring: ``canonicalize``, used when skills are
+stored, renames exact names and aliases only and keeps other spellings as
+the user wrote them.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import threading
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_skill(text: str) -> str:
+    """Lower-case, punctuation folded to spaces (keeping + and # for C++ / C#)"""
+    return ' '.join(re.sub(r'[^a-z0-9+#]', ' ', str(text).lower()).split())
+
+
+def _trigrams(key: str) -> Set[str]:
+    padded = f'  {key} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _edit_distance(a: str, b: str, limit: int) -> int:
+    """Edit distance counting a swap of adjacent letters as one edit ("pyhton"),
+    giving up (returning limit + 1) once it must exceed ``limit``"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    before, previous = None, list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            cost = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b))
+            if i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b:
+                cost = min(cost, before[j - 2] + 1)
+            current.append(cost)
+        if min(current) > limit:
+            return limit + 1
+        before, previous = previous, current
+    return previous[-1]
+
+
+# Transient ids of unregistered skills start here, far above any registered id
+TRANSIENT_ID_BASE = 1 << 32
+
+
+def _transient_id(key: str) -> int:
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=7).digest()
+    return TRANSIENT_ID_BASE + int.from_bytes(digest, 'big')
+
+
+class SkillRegistry:
+    """Skill string -> canonical id (registered ids start at 1; 0 means "no skill")"""
+
+    def __init__(self, aliases_path: str = 'data/skill_aliases.json', vocabulary_path: Optional[str] = 'data/skills.json',
+                 min_fuzzy_length: int = 7, max_edit_distance: int = 2, min_trigram_similarity: float = 0.5,
+                 cache_size: int = 50000):
+        self.min_fuzzy_length = min_fuzzy_length
+        self.max_edit_distance = max_edit_distance
+        self.min_trigram_similarity = min_trigram_similarity
+        self._lock = threading.Lock()
+        self._names: List[str] = ['']
+        self._keys: Dict[str, int] = {}           # normalised registered name or alias -> id
+        self._registered: List[Tuple[str, int]] = []  # (key, id) of registered names and aliases only
+        self._trigram_index: Dict[str, List[str]] = {}   # trigram -> registered names/aliases
+        self._trigram_counts: Dict[str, int] = {}
+        self._cache: Dict[str, int] = {}
+        self._set_cache: Dict[Tuple[str, ...], FrozenSet[int]] = {}
+        self._cache_size = cache_size
+        self._version: Optional[str] = None
+
+        for path, with_aliases in ((aliases_path, True), (vocabulary_path, False)):
+            if not path:
+                continue
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    entries = json.load(f)
+            except FileNotFoundError:
+                logger.warning("Skill list not found at %s", path, extra={'event': 'skills.list_missing'})
+                continue
+            for entry in entries:
+                if with_aliases:
+                    self.register(entry['name'], entry.get('aliases', []))
+                elif isinstance(entry, str):
+                    self.register(entry)
+
+    def __len__(self) -> int:
+        """Number of registered skills"""
+        return len(self._names) - 1
+
+    def register(self, name: str, aliases: Iterable[str] = ()) -> int:
+        """Add a canonical skill (or aliases for an existing one); returns its id"""
+        with self._lock:
+            key = normalize_skill(name)
+            skill_id = self._keys.get(key)
+            if skill_id is None:
+                skill_id = self._add(name.strip(), key)
+                self._index(key)
+                self._registered.append((key, skill_id))
+            for alias in aliases:
+                alias_key = normalize_skill(alias)
+                if alias_key and alias_key not in self._keys:
+                    self._keys[alias_key] = skill_id
+                    self._index(alias_key)
+                    self._registered.append((alias_key, skill_id))
+            self._cache.clear()
+            self._set_cache.clear()
+            self._version = None
+            return skill_id
+
+    def name(self, skill_id: int) -> str:
+        """Canonical name of a registered id ('' for 0 and transient ids)"""
+        return self._names[skill_id] if skill_id < len(self._names) else ''
+
+    @property
+    def version(self) -> str:
+        """Hash of the canonical names and aliases; changes whenever ``canonicalize`` output could"""
+        version = self._version
+        if version is None:
+            with self._lock:
+                payload = json.dumps([self._names, sorted(self._registered)])
+                version = self._version = hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+        return version
+
+    def registered_keys(self) -> List[Tuple[str, int]]:
+        """Normalised names and aliases of registered skills with their ids (not ad-hoc spellings)"""
+        with self._lock:
+            return list(self._registered)
+
+    def canonical_id(self, text: str) -> int:
+        """Id of the skill ``text`` names: exact alias, then a close spelling, else a transient id"""
+        skill_id = self._cache.get(text)
+        if skill_id is not None:
+            return skill_id
+        key = normalize_skill(text or '')
+        if not key:
+            return 0
+        skill_id = self._keys.get(key)
+        if skill_id is None:
+            with self._lock:
+                match = self._fuzzy_match(key)
+            # Typos resolve to their skill; anything else is only kept in the bounded cache
+            skill_id = self._keys[match] if match else _transient_id(key)
+        if len(self._cache) >= self._cache_size:
+            self._cache.clear()
+        self._cache[text] = skill_id
+        return skill_id
+
+    def canonical(self, text: str) -> str:
+        """Canonical display name for ``text`` (the text itself for unregistered skills)"""
+        return self.name(self.canonical_id(text)) or str(text or '').strip()
+
+    def id_set(self, skills: Iterable[str]) -> FrozenSet[int]:
+        """Distinct canonical ids of a skill list (uncached; postings compute theirs once at ingestion)"""
+        return frozenset(skill_id for skill_id in map(self.canonical_id, skills) if skill_id)
+
+    def ids(self, skills: Iterable[str]) -> FrozenSet[int]:
+        """Distinct canonical ids of a candidate's skill list, cached per list"""
+        skills = tuple(skills)
+        ids = self._set_cache.get(skills)
+        if ids is None:
+            ids = self.id_set(skills)
+            if len(self._set_cache) >= self._cache_size:
+                self._set_cache.clear()
+            self._set_cache[skills] = ids
+        return ids
+
+    def canonicalize(self, skills: Iterable[str]) -> List[str]:
+        """Skills as stored: exact names and aliases become the canonical name, anything else
+        (including near-misses) stays as written; de-duplicated, in first-seen order"""
+        seen: Set[Any] = set()
+        names = []
+        for skill in skills:
+            key = normalize_skill(skill or '')
+            if not key:
+                continue
+            skill_id = self._keys.get(key)
+            identity = skill_id or key
+            if identity not in seen:
+                seen.add(identity)
+                names.append(self._names[skill_id] if skill_id else str(skill).strip())
+        return names
+
+    def _add(self, name: str, key: str) -> int:
+        skill_id = len(self._names)
+        self._names.append(name)
+        self._keys[key] = skill_id
+        return skill_id
+
+    def _index(self, key: str):
+        if len(key) >= self.min_fuzzy_length:
+            trigrams = _trigrams(key)
+            self._trigram_counts[key] = len(trigrams)
+            for trigram in trigrams:
+                self._trigram_index.setdefault(trigram, []).append(key)
+
+    def _fuzzy_match(self, key: str) -> Optional[str]:
+        """Closest indexed name/alias sharing enough trigrams and the first letter, within the
+        edit-distance limit (different words a letter apart, like "Reaching"/"Teaching", stay apart)"""
+        if len(key) < self.min_fuzzy_length:
+            return None
+        trigrams = _trigrams(key)
+        shared: Dict[str, int] = {}
+        for trigram in trigrams:
+            for candidate in self._trigram_index.get(trigram, ()):
+                shared[candidate] = shared.get(candidate, 0) + 1
+
+        limit = 1 if len(key) < 9 else self.max_edit_distance
+        best, best_distance = None, limit + 1
+        # Dice coefficient over trigram sets, most similar first
+        similar = [(2 * count / (len(trigrams) + self._trigram_counts[candidate]), candidate)
+                   for candidate, count in shared.items()]
+        for similarity, candidate in sorted(similar, reverse=True):
+            if similarity < self.min_trigram_similarity:
+                break
+            if candidate[0] != key[0]:
+                continue
+            distance = _edit_distance(key, candidate, limit)
+            if distance < best_distance:
+                best, best_distance = candidate, distance
+        return best
+
+
+def create_skill_registry(config: Dict[str, Any]) -> SkillRegistry:
+    """Build the registry described by ``SKILLS_CONFIG``"""
+    return SkillRegistry(config['aliases'], config['vocabulary'], config['min_fuzzy_length'],
+                         config['max_edit_distance'], config['min_trigram_similarity'])
@@ -0,0 +1,74 @@
+"""
+Skill autocomplete for PM Internship Scheme
+A prefix trie over the skill registry's names and aliases, and over each
+later word in them, so "exc", "ms ex" and "learn" all reach their skills.
+Every node keeps its best skills pre-sorted (skills whose name starts with
+the prefix, then alias matches, then later-word matches, each by how many
+postings require the skill), so a suggestion is a walk down the typed
+characters and a list slice, independent of vocabulary size.
+"""
+
+from collections import Counter
+from typing import Any, Dict, List
+
+from skill_registry import SkillRegistry, normalize_skill
+
+
+class SkillTrie:
+    """Prefix trie of skill names/aliases with each node's top skills by posting frequency"""
+
+    def __init__(self, registry: SkillRegistry, internships: List[Dict[str, Any]], max_results: int = 20):
+        self.internships = internships
+        self.max_results = max_results
+        popularity = Counter(skill_id for internship in internships
+                             for skill_id in registry.id_set(internship.get('skills_required', [])))
+        # Unregistered skills postings ask for are suggested under their first spelling
+        names = {}
+        for internship in internships:
+            for skill in internship.get('skills_required', []):
+                skill_id = registry.canonical_id(skill)
+                if skill_id and skill_id not in names:
+                    names[skill_id] = registry.name(skill_id) or str(skill).strip()
+
+        def name(skill_id: int) -> str:
+            return names.get(skill_id) or registry.name(skill_id)
+
+        # Registered skills and aliases, plus any other skills postings ask for
+        keys = registry.registered_keys()
+        keys += [(normalize_skill(name(skill_id)), skill_id) for skill_id in popularity]
+
+        # Each node's '' entry collects skill id -> best tier (0 name, 1 alias, 2 later word) while building
+        root: Dict[str, Any] = {'': {}}
+        for key, skill_id in keys:
+            words = key.split(' ')
+            first_tier = 0 if key == normalize_skill(name(skill_id)) else 1
+            for start in range(len(words)):
+                tier = first_tier if start == 0 else 2
+                node = root
+                for char in ' '.join(words[start:]):
+                    node = node.setdefault(char, {'': {}})
+                    node[''][skill_id] = min(tier, node[''].get(skill_id, tier))
+                if start == 0:
+                    root[''][skill_id] = 0
+
+        # Then most required first, then alphabetical; the '' entry becomes the node's suggestions
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            tiers = node['']
+            ranked = sorted(tiers, key=lambda skill_id: (tiers[skill_id], -popularity[skill_id],
+                                                         name(skill_id).lower()))
+            node[''] = [name(skill_id) for skill_id in ranked[:max_results]]
+            stack.extend(child for char, child in node.items() if char)
+        self._root = root
+        self.popularity = {name(skill_id): count for skill_id, count in popularity.items()}
+
+    def suggest(self, prefix: str, limit: int = 8) -> List[str]:
+        """Canonical names of the most required skills with a name or alias word starting with ``prefix``"""
+        node = self._root
+        for char in normalize_skill(prefix):
+            node = node.get(char)
+            if node is None:
+                return []
+        return node[''][:limit]
+
@@ -36,11 +36,14 @@ async function loadSectors() {
     }
 }
 
-// Load skills from API
-async function loadSkills() {
+// Load skill suggestions from API (most requested skills, or those matching the typed text)
+async function loadSkills(query = '') {
     try {
-        const response = await fetch('/api/skills');
-        skills = await response.json();
+        const response = await fetch(`/api/skills/suggest?limit=12&q=${encodeURIComponent(query)}`);
+        const suggestions = await response.json();
+        // Ignore responses that arrive after the text has changed again
+        if (query !== document.getElementById('skillSearch').value.trim()) return;
+        skills = suggestions;
         renderSuggestedSkills();
     } catch (error) {
         console.error('Error loading skills:', error);
@@ -56,6 +59,9 @@ function initializeEventListeners() {
     
     // Skill management
     document.getElementById('addSkillBtn').addEventListener('click', addCustomSkill);
+    document.getElementById('skillSearch').addEventListener('input', function() {
+        loadSkills(this.value.trim());
+    });
     document.getElementById('skillSearch').addEventListener('keypress', function(e) {
         if (e.key === 'Enter') {
             e.preventDefault();
@@ -161,6 +167,7 @@ function addCustomSkill() {
         selectedSkills.push(skill);
         renderSelectedSkills();
         input.value = '';
+        loadSkills();
         validateCurrentStep();
     }
 }
@@ -4,6 +4,7 @@ let skills = [];
 let selectedSkills = [];
 let selectedSectors = [];
 let currentResume = null;
+let savedRecommendationInputs = null;  // matching inputs as last saved; the server precomputes these
 
 // Initialize the application
 document.addEventListener('DOMContentLoaded', function() {
@@ -24,11 +25,14 @@ async function loadSectors() {
     }
 }
 
-// Load skills from API
-async function loadSkills() {
+// Load skill suggestions from API (most requested skills, or those matching the typed text)
+async function loadSkills(query = '') {
     try {
-        const response = await fetch('/api/skills');
-        skills = await response.json();
+        const response = await fetch(`/api/skills/suggest?limit=12&q=${encodeURIComponent(query)}`);
+        const suggestions = await response.json();
+        // Ignore responses that arrive after the text has changed again
+        if (query !== document.getElementById('skillSearch').value.trim()) return;
+        skills = suggestions;
         renderSuggestedSkills();
     } catch (error) {
         console.error('Error loading skills:', error);
@@ -86,6 +90,9 @@ function populateProfileForm(profile) {
 function initializeEventListeners() {
     // Skill management
     document.getElementById('addSkillBtn').addEventListener('click', addCustomSkill);
+    document.getElementById('skillSearch').addEventListener('input', function() {
+        loadSkills(this.value.trim());
+    });
     document.getElementById('skillSearch').addEventListener('keypress', function(e) {
         if (e.key === 'Enter') {
             e.preventDefault();
@@ -198,6 +205,7 @@ function addCustomSkill() {
         selectedSkills.push(skill);
         renderSelectedSkills();
         input.value = '';
+        loadSkills();
     }
 }
 
@@ -375,6 +383,7 @@ async function saveProfile() {
             throw new Error(data.error);
         }
         
+        savedRecommendationInputs = getRecommendationInputs();
         showNotification('Profile saved successfully!', 'success');
         
     } catch (error) {
@@ -414,6 +423,18 @@ function validateProfileForm() {
     return true;
 }
 
+// Profile fields that affect recommendations, serialized for comparison
+function getRecommendationInputs() {
+    return JSON.stringify({
+        education_level: document.getElementById('education_level').value,
+        experience_level: document.getElementById('experience_level').value,
+        skills: selectedSkills,
+        sector_interests: selectedSectors,
+        location_preference: document.getElementById('location_preference').value,
+        remote_work_preference: document.getElementById('remote_work_preference').checked
+    });
+}
+
 // Get internship recommendations
 async function getRecommendations() {
     if (!validateProfileForm()) {
@@ -433,13 +454,17 @@ async function getRecommendations() {
             num_recommendations: parseInt(document.getElementById('num_recommendations')?.value) || 20
         };
         
-        const response = await fetch('/api/recommendations', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-            },
-            body: JSON.stringify(candidateProfile)
-        });
+        // Unchanged since the last save: the server already ranked this profile in the background
+        const usePrecomputed = savedRecommendationInputs === getRecommendationInputs();
+        const response = usePrecomputed
+            ? await fetch(`/api/profile/recommendations?num_recommendations=${candidateProfile.num_recommendations}`)
+            : await fetch('/api/recommendations', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                },
+                body: JSON.stringify(candidateProfile)
+            });
         
         const data = await response.json();
         
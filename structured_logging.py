@@ -0,0 +1,157 @@
+"""
+Structured logging for PM Internship Scheme
+Request threads only enqueue log records; a background listener formats them
+as one JSON object per line and writes them out. High-volume events can be
+sampled, and every record carries the id of the request that produced it.
+"""
+
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+import threading
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+_state = threading.local()
+
+# Attributes every LogRecord has; anything else came in through ``extra``
+_RESERVED = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+def set_request_id(request_id: Optional[str] = None) -> str:
+    request_id = request_id or uuid.uuid4().hex
+    _state.request_id = request_id
+    return request_id
+
+
+def get_request_id() -> Optional[str]:
+    return getattr(_state, 'request_id', None)
+
+
+def clear_request_id():
+    _state.request_id = None
+
+
+def log_event(logger: logging.Logger, event: str, message: str, level: int = logging.INFO, **fields):
+    """Log ``message`` with a stable ``event`` name and structured ``fields``"""
+    if logger.isEnabledFor(level):
+        logger.log(level, message, extra={'event': event, 'fields': fields})
+
+
+class RequestContextFilter(logging.Filter):
+    """Stamps records with the request id; runs on the calling thread before enqueueing"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = get_request_id()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a fraction of INFO/DEBUG records per event name; warnings and errors always pass"""
+
+    def __init__(self, sample_rates: Dict[str, float]):
+        super().__init__()
+        self.sample_rates = dict(sample_rates)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.sample_rates.get(getattr(record, 'event', None))
+        return rate is None or random.random() < rate
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'event': getattr(record, 'event', None),
+            'message': record.getMessage(),
+            'request_id': getattr(record, 'request_id', None),
+            'thread': record.threadName
+        }
+        entry.update(getattr(record, 'fields', None) or {})
+        for key, value in vars(record).items():
+            if key not in _RESERVED and key not in entry and key != 'fields':
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records instead of blocking when the queue is full"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge args and render the traceback now, but leave the JSON formatting to the writer thread
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_handler: Optional[DroppingQueueHandler] = None
+_configure_lock = threading.Lock()
+
+
+def configure_logging(config: Dict[str, Any], stream=None) -> DroppingQueueHandler:
+    """Route the root logger through a bounded queue to a background JSON writer (idempotent)"""
+    global _listener, _handler
+    with _configure_lock:
+        if _handler is not None:
+            return _handler
+
+        log_queue: queue.Queue = queue.Queue(maxsize=config.get('queue_size', 10000))
+        output = logging.StreamHandler(stream or sys.stderr)
+        output.setFormatter(JsonFormatter() if config.get('format', 'json') == 'json'
+                            else logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+
+        handler = DroppingQueueHandler(log_queue)
+        handler.addFilter(SamplingFilter(config.get('sample_rates', {})))
+        handler.addFilter(RequestContextFilter())
+
+        root = logging.getLogger()
+        root.setLevel(config.get('level', 'INFO'))
+        root.addHandler(handler)
+
+        _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+        _handler = handler
+        return handler
+
+
+def shutdown_logging():
+    """Flush queued records and stop the writer thread"""
+    global _listener, _handler
+    with _configure_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+        if _handler is not None:
+            logging.getLogger().removeHandler(_handler)
+            _handler = None
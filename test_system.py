@@ -5,7 +5,7 @@ Test script for PM Internship Scheme Recommendation Engine
 
 import json
 import sys
-from recommendation_engine import InternshipRecommendationEngine
+from recommendation_engine import InternshipRecommendationEngine, GOAL_KEYWORDS
 
 def test_recommendation_engine():
     """Test the recommendation engine with sample data"""
@@ -118,6 +118,1143 @@ def test_data_integrity():
     
     return True
 
+def test_job_queue():
+    """Test the background job queue used for async resume processing"""
+    print("\n⚙️  Testing background job queue...")
+    
+    import threading
+    import time
+    from job_queue import BackgroundJobQueue, JobQueueFull
+    
+    queue = BackgroundJobQueue(max_workers=1, max_pending=1, job_timeout=5)
+    release = threading.Event()
+    try:
+        job_id = queue.submit(lambda: release.wait(5) and {'skills': ['Python']})
+        
+        # Queue is at capacity, so the next submission must be rejected
+        try:
+            queue.submit(lambda: None)
+            print("❌ Full queue accepted another job")
+            return False
+        except JobQueueFull:
+            print("✅ Full queue rejects new jobs")
+        
+        release.set()
+        for _ in range(50):
+            job = queue.get(job_id)
+            if job['status'] == 'done':
+                break
+            time.sleep(0.05)
+        
+        if job['status'] != 'done' or job['result'] != {'skills': ['Python']}:
+            print(f"❌ Unexpected job state: {job}")
+            return False
+        print("✅ Job completed with result")
+        
+        if queue.get('missing') is not None:
+            print("❌ Unknown job id should return None")
+            return False
+        
+        return True
+    finally:
+        release.set()
+        queue.shutdown()
+
+def test_resume_cache():
+    """Test the content-hash resume extraction cache"""
+    print("\n🗄️  Testing resume extraction cache...")
+    
+    import tempfile
+    from resume_cache import ResumeExtractionCache
+    
+    cache = ResumeExtractionCache(max_entries=2)
+    cache.put('v1:a', {'skills': ['Python']})
+    cache.put('v1:b', {'skills': ['Java']})
+    cache.get('v1:a')
+    cache.put('v1:c', {'skills': ['Excel']})
+    
+    # 'b' was least recently used and must have been evicted
+    if cache.get('v1:b') is not None or cache.get('v1:a') is None:
+        print("❌ LRU eviction order is wrong")
+        return False
+    print("✅ Least recently used entry evicted")
+    
+    with tempfile.TemporaryDirectory() as persist_dir:
+        ResumeExtractionCache(persist_dir=persist_dir).put('v1:d', {'skills': ['Research']})
+        reloaded = ResumeExtractionCache(persist_dir=persist_dir).get('v1:d')
+        if reloaded != {'skills': ['Research']}:
+            print("❌ Persisted entry was not reloaded")
+            return False
+    print("✅ Entries persist to disk")
+    
+    # Cached skills are canonicalized, so an alias change must miss the cache
+    from skill_registry import SkillRegistry
+    registry = SkillRegistry(vocabulary_path=None)
+    if registry.version != SkillRegistry(vocabulary_path=None).version:
+        print("❌ Identical alias lists gave different registry versions")
+        return False
+    before = ResumeExtractionCache.make_key('digest', 'v1', registry.version)
+    registry.register('Origami', ['Paper Folding'])
+    if ResumeExtractionCache.make_key('digest', 'v1', registry.version) == before:
+        print("❌ Cache key does not follow the skill alias registry")
+        return False
+    print("✅ Alias changes invalidate cached extractions")
+    
+    return True
+
+def test_batch_ingest():
+    """Test batch resume ingestion over a directory and a zip archive"""
+    print("\n📦 Testing batch ingestion...")
+    
+    import io
+    import os
+    import tempfile
+    import zipfile
+    from batch_ingest import run_batch
+    
+    good = b"Priya Sharma\npriya@example.com\nSkills: Python, Sql, Node.js, Data Analysis\nB.Tech Computer Science"
+    corrupt = b"%PDF-1.4\nnot really a pdf"
+    with tempfile.TemporaryDirectory() as folder:
+        with open(os.path.join(folder, 'good.txt'), 'wb') as f:
+            f.write(good)
+        with open(os.path.join(folder, 'broken.pdf'), 'wb') as f:
+            f.write(corrupt)
+        archive_path = os.path.join(folder, 'batch.zip')
+        with zipfile.ZipFile(archive_path, 'w') as archive:
+            archive.writestr('a/good.txt', good)
+            archive.writestr('a/broken.pdf', corrupt)
+            archive.writestr('b/good.txt', good)
+        
+        for source, expected in [(folder, (1, 1)), (archive_path, (2, 1))]:
+            output = io.StringIO()
+            summary = run_batch(source, output, workers=1, chunksize=1)
+            records = {record['file']: record for record in map(json.loads, output.getvalue().splitlines())}
+            if (summary['succeeded'], summary['failed']) != expected:
+                print(f"❌ {os.path.basename(source)}: {summary['succeeded']} ok / {summary['failed']} failed, "
+                      f"expected {expected[0]} / {expected[1]}")
+                return False
+            broken = [record for name, record in records.items() if name.endswith('broken.pdf')]
+            good_records = [record for name, record in records.items() if name.endswith('good.txt')]
+            if broken[0]['status'] != 'error' or not broken[0]['error'] or \
+                    any('Python' not in record['data']['skills'] for record in good_records):
+                print("❌ Corrupt file reported as ok, or good file lost its skills")
+                return False
+            # Skills use the registry's canonical names, as /api/extract-skills reports them
+            if any({'SQL', 'JavaScript'} - set(record['data']['skills']) or 'Sql' in record['data']['skills']
+                   for record in good_records):
+                print(f"❌ Batch skills were not canonicalized: {good_records[0]['data']['skills']}")
+                return False
+    print("✅ Corrupt resumes are reported as failures, in folders and zip archives")
+    print("✅ Batch skills use canonical names")
+    
+    return True
+
+def test_resume_store():
+    """Test deduplicated resume storage and orphan garbage collection"""
+    print("\n📁 Testing content-addressed resume storage...")
+    
+    import io
+    import os
+    import tempfile
+    from werkzeug.datastructures import FileStorage
+    from resume_storage import ResumeStore
+    
+    with tempfile.TemporaryDirectory() as root:
+        store = ResumeStore(os.path.join(root, 'uploads'), os.path.join(root, 'refs.db'), grace_period=-1)
+        first = store.store(FileStorage(io.BytesIO(b'%PDF-1.4 resume')), '.pdf', 'user_a')
+        second = store.store(FileStorage(io.BytesIO(b'%PDF-1.4 resume')), '.pdf', 'user_b')
+        
+        if first != second or store.ref_count(first) != 2:
+            print("❌ Identical uploads were not deduplicated")
+            return False
+        print("✅ Identical uploads share one stored file")
+        
+        store.release('user_a')
+        if store.collect_garbage():
+            print("❌ GC removed a file that is still referenced")
+            return False
+        
+        store.release('user_b')
+        if len(store.collect_garbage()) != 1:
+            print("❌ GC did not remove the orphaned file")
+            return False
+        print("✅ Orphaned files are garbage collected")
+
+        # A second worker sharing the database sees the first worker's references
+        other_worker = ResumeStore(os.path.join(root, 'uploads'), os.path.join(root, 'refs.db'), grace_period=-1)
+        stored = store.store(FileStorage(io.BytesIO(b'%PDF-1.4 other resume')), '.pdf', 'user_c')
+        if other_worker.collect_garbage() or other_worker.ref_count(stored) != 1:
+            print("❌ Another worker's GC removed a referenced file")
+            return False
+        print("✅ References are shared between workers")
+
+        # References from the old JSON refs file are imported once
+        legacy_file = os.path.join(root, 'resume_refs.json')
+        with open(legacy_file, 'w', encoding='utf-8') as f:
+            json.dump({'users': {'user_d': stored}}, f)
+        ResumeStore(os.path.join(root, 'uploads'), os.path.join(root, 'refs.db'), legacy_refs_file=legacy_file)
+        if store.ref_count(stored) != 2 or os.path.exists(legacy_file):
+            print("❌ Legacy resume references were not imported")
+            return False
+        print("✅ Legacy resume references imported")
+
+    return True
+
+def test_upload_validation():
+    """Test resume upload checks: magic bytes, the per-file size cap and content-hash URLs"""
+    print("\n🛡️  Testing resume upload validation...")
+
+    import io
+    import os
+    import tempfile
+    import app as app_module
+    from resume_storage import ResumeStore
+
+    client = app_module.app.test_client()
+    original_store = app_module.resume_store
+    with tempfile.TemporaryDirectory() as root:
+        # Keep test uploads out of static/uploads
+        app_module.resume_store = ResumeStore(os.path.join(root, 'uploads'), os.path.join(root, 'refs.db'))
+        try:
+            def upload(route, content, filename, user_id='upload_test'):
+                return client.post(f'{route}?user_id={user_id}', data={'resume': (io.BytesIO(content), filename)},
+                                   content_type='multipart/form-data')
+
+            for route in ['/api/extract-skills', '/api/upload-resume']:
+                response = upload(route, b'Plain text renamed to look like a PDF', 'resume.pdf')
+                if response.status_code != 400 or 'does not look like a .pdf' not in response.get_json().get('error', ''):
+                    print(f"❌ {route}: spoofed .pdf returned {response.status_code}")
+                    return False
+            print("✅ Files whose content doesn't match their extension are rejected")
+
+            too_big = b'%PDF-1.4\n' + b'0' * app_module.MAX_RESUME_SIZE
+            for route in ['/api/extract-skills', '/api/upload-resume']:
+                response = upload(route, too_big, 'big.pdf')
+                if response.status_code != 413 or response.get_json().get('error') != 'File exceeds the 5MB limit':
+                    print(f"❌ {route}: file over 5MB returned {response.status_code}")
+                    return False
+            print("✅ Files over 5MB get 413 with the size limit message")
+
+            # A body over MAX_CONTENT_LENGTH is refused from its Content-Length, before any of it is read
+            class CountingStream(io.BytesIO):
+                read_bytes = 0
+
+                def read(self, size=-1):
+                    data = super().read(size)
+                    CountingStream.read_bytes += len(data)
+                    return data
+
+                def readline(self, size=-1):
+                    data = super().readline(size)
+                    CountingStream.read_bytes += len(data)
+                    return data
+
+            body = (b'--boundary\r\nContent-Disposition: form-data; name="resume"; filename="big.pdf"\r\n\r\n' +
+                    too_big + b'0' * (1024 * 1024) + b'\r\n--boundary--\r\n')
+            for route in ['/api/extract-skills', '/api/upload-resume']:
+                CountingStream.read_bytes = 0
+                response = client.post(route, input_stream=CountingStream(body), content_length=len(body),
+                                       content_type='multipart/form-data; boundary=boundary')
+                if response.status_code != 413 or CountingStream.read_bytes:
+                    print(f"❌ {route}: oversized body returned {response.status_code} "
+                          f"after reading {CountingStream.read_bytes} bytes")
+                    return False
+            print("✅ Oversized request bodies are rejected before they are read")
+
+            content = b'%PDF-1.4\nSame resume uploaded twice'
+            first = upload('/api/upload-resume', content, 'first.pdf', 'user_a')
+            second = upload('/api/upload-resume', content, 'second.pdf', 'user_b')
+            if first.status_code != 200 or first.get_json()['resume_url'] != second.get_json()['resume_url']:
+                print("❌ Identical uploads got different URLs")
+                return False
+            print("✅ Identical uploads share one URL")
+        finally:
+            app_module.resume_store = original_store
+
+    return True
+
+def test_profile_store():
+    """Test unique-field indexes in the in-memory and SQLite profile stores"""
+    print("\n👤 Testing profile store uniqueness indexes...")
+    
+    import os
+    import tempfile
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    from profile_store import ProfileStore, SQLiteProfileStore, DuplicateProfileField
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        sqlite_store = SQLiteProfileStore(os.path.join(tmp_dir, 'profiles.db'))
+        try:
+            for store in [ProfileStore(), sqlite_store]:
+                name = type(store).__name__
+                store.save('user_a', {'email': 'a@example.com', 'mobile_number': '9000000001', 'aadhar_number': '1111'})
+                
+                try:
+                    store.save('user_b', {'email': 'a@example.com', 'mobile_number': '9000000002', 'aadhar_number': '2222'})
+                    print(f"❌ {name}: duplicate email was accepted")
+                    return False
+                except DuplicateProfileField as e:
+                    if e.field != 'email':
+                        print(f"❌ {name}: wrong conflicting field reported: {e.field}")
+                        return False
+                
+                # Changing user_a's email must release the old value
+                store.save('user_a', {'email': 'new@example.com', 'mobile_number': '9000000001', 'aadhar_number': '1111'})
+                store.save('user_b', {'email': 'a@example.com', 'mobile_number': '9000000002', 'aadhar_number': '2222'})
+                if store.find_user('email', 'a@example.com') != 'user_b':
+                    print(f"❌ {name}: index not updated after email change")
+                    return False
+                
+                store.add_skills('user_b', ['Python', 'Excel'])
+                if store.add_skills('user_b', ['Python']) != ['Python', 'Excel']:
+                    print(f"❌ {name}: skills were duplicated")
+                    return False
+                print(f"✅ {name}: uniqueness, index updates and skills work")
+                
+                # Concurrent saves racing for one email: exactly one may win
+                barrier = threading.Barrier(8)
+                
+                def race(i):
+                    barrier.wait()
+                    try:
+                        store.save(f'racer_{i}', {'email': 'race@example.com', 'mobile_number': f'80000000{i}'})
+                        return 1
+                    except DuplicateProfileField:
+                        return 0
+                
+                with ThreadPoolExecutor(max_workers=8) as pool:
+                    winners = sum(pool.map(race, range(8)))
+                if winners != 1:
+                    print(f"❌ {name}: {winners} concurrent saves claimed the same email")
+                    return False
+                print(f"✅ {name}: concurrent saves cannot duplicate unique fields")
+
+            # Another worker's connection sees every write after a revision, goals included
+            other_worker = SQLiteProfileStore(os.path.join(tmp_dir, 'profiles.db'))
+            try:
+                revision = other_worker.revision()
+                sqlite_store.add_skills('user_a', ['SQL'])
+                sqlite_store.save_goal('user_b', {'goal': 'Data Analyst'})
+                changed = [(user_id, goal) for _, user_id, _, goal in other_worker.changed_since(revision)]
+                if changed != [('user_a', None), ('user_b', {'goal': 'Data Analyst'})] or \
+                        list(other_worker.changed_since(other_worker.revision())):
+                    print(f"❌ Changed profiles since revision {revision}: {changed}")
+                    return False
+                print("✅ Profiles changed since a revision are visible to other workers")
+            finally:
+                other_worker.close()
+        finally:
+            sqlite_store.close()
+
+    return True
+
+def test_request_timing():
+    """Test per-stage request timing"""
+    print("\n⏱️  Testing request timing...")
+    
+    import request_timing
+    from request_timing import stage
+    
+    # Outside a request every stage is the shared no-op
+    if stage('score') is not stage('parse'):
+        print("❌ Stages outside a request should be no-ops")
+        return False
+    print("✅ Stages are no-ops without an active timer")
+    
+    timer = request_timing.start_request()
+    try:
+        with stage('parse'):
+            pass
+        with stage('parse'):
+            pass
+        with stage('score'):
+            pass
+    finally:
+        request_timing.finish_request()
+    
+    header = timer.header_value()
+    if [part.split(';')[0] for part in header.split(', ')] != ['parse', 'score', 'total']:
+        print(f"❌ Unexpected Server-Timing header: {header}")
+        return False
+    print(f"✅ Server-Timing: {header}")
+    
+    stats = request_timing.StageStats()
+    stats.record('example', timer)
+    stats.record('example', timer)
+    if stats.snapshot()['example']['parse']['count'] != 2:
+        print("❌ Stage timings were not aggregated")
+        return False
+    print("✅ Stage timings aggregate per route")
+    
+    return True
+
+def test_metrics():
+    """Test Prometheus metrics rendering"""
+    print("\n📈 Testing metrics...")
+    
+    import threading
+    from metrics import MetricsRegistry
+    
+    registry = MetricsRegistry()
+    requests_total = registry.counter('test_requests_total', 'Requests', ['route'])
+    latency = registry.histogram('test_latency_seconds', 'Latency', buckets=(0.1, 1.0))
+    
+    def record():
+        for _ in range(1000):
+            requests_total.labels('index').inc()
+            latency.observe(0.5)
+    
+    threads = [threading.Thread(target=record) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    text = registry.render()
+    expected = [
+        'test_requests_total{route="index"} 8000',
+        'test_latency_seconds_bucket{le="0.1"} 0',
+        'test_latency_seconds_bucket{le="1"} 8000',
+        'test_latency_seconds_bucket{le="+Inf"} 8000',
+        'test_latency_seconds_count 8000'
+    ]
+    missing = [line for line in expected if line not in text.splitlines()]
+    if missing:
+        print(f"❌ Missing metric lines: {missing}")
+        return False
+    print("✅ Concurrent counter and histogram updates are all counted")
+    
+    return True
+
+def test_request_profiler():
+    """Test request profiling and the slow request buffer"""
+    print("\n🔬 Testing request profiler...")
+    
+    import tempfile
+    from request_profiler import RequestProfiler, SlowRequestLog
+    
+    engine = InternshipRecommendationEngine()
+    profile = {'education_level': 'Graduate', 'skills': ['Research'], 'sector_interests': ['Government']}
+    
+    with tempfile.TemporaryDirectory() as output_dir:
+        profiler = RequestProfiler(output_dir)
+        active = profiler.begin('cprofile')
+        if profiler.begin('cprofile') is not None:
+            print("❌ A second concurrent profile should be refused")
+            return False
+        engine.get_recommendations(profile)
+        entry = profiler.end(active, 'test', 0.01)
+        
+        with open(profiler.path(entry['id'], 'collapsed'), 'r', encoding='utf-8') as f:
+            collapsed = f.read()
+        if 'calculate_match_score' not in collapsed or profiler.path(entry['id'], 'pstats') is None:
+            print("❌ Profile output is missing the scoring path")
+            return False
+    print("✅ cProfile output stored as pstats and collapsed stacks")
+    
+    log = SlowRequestLog(capacity=3)
+    for duration in [0.5, 0.1, 0.9, 0.3, 0.7]:
+        log.record(duration, {'path': str(duration)})
+    if [entry['path'] for entry in log.snapshot()] != ['0.9', '0.7', '0.5']:
+        print("❌ Slow request log kept the wrong requests")
+        return False
+    print("✅ Slow request log keeps the slowest requests")
+    
+    # Recording a slow request must not re-read a body Flask already refused
+    import io
+    from app import app, API_CONFIG
+    oversized = io.BytesIO(b'%PDF-1.4\n' + b'0' * (API_CONFIG['max_content_length'] + 1024))
+    response = app.test_client().post('/api/extract-skills', data={'resume': (oversized, 'big.pdf')},
+                                      content_type='multipart/form-data')
+    if response.status_code != 413 or 'Request too large' not in response.get_json().get('error', ''):
+        print(f"❌ Oversized upload returned {response.status_code} instead of 413")
+        return False
+    print("✅ Oversized uploads still get 413 while slow requests are logged")
+    
+    return True
+
+def test_structured_logging():
+    """Test queued JSON logging with request ids and sampling"""
+    print("\n📝 Testing structured logging...")
+    
+    import io
+    import logging
+    import logging.handlers
+    import queue
+    import structured_logging
+    from structured_logging import (DroppingQueueHandler, JsonFormatter, RequestContextFilter,
+                                    SamplingFilter, log_event)
+    
+    stream = io.StringIO()
+    output = logging.StreamHandler(stream)
+    output.setFormatter(JsonFormatter())
+    log_queue = queue.Queue(maxsize=100)
+    handler = DroppingQueueHandler(log_queue)
+    handler.addFilter(SamplingFilter({'noisy': 0.0}))
+    handler.addFilter(RequestContextFilter())
+    listener = logging.handlers.QueueListener(log_queue, output)
+    
+    logger = logging.getLogger('test_structured_logging')
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(handler)
+    listener.start()
+    try:
+        structured_logging.set_request_id('req-123')
+        log_event(logger, 'resume.extracted', 'Resume extracted', skills_found=4)
+        log_event(logger, 'noisy', 'Dropped by sampling')
+        log_event(logger, 'noisy', 'Warnings are never sampled', level=logging.WARNING)
+        structured_logging.clear_request_id()
+    finally:
+        listener.stop()
+        logger.removeHandler(handler)
+    
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    if [r['message'] for r in records] != ['Resume extracted', 'Warnings are never sampled']:
+        print(f"❌ Unexpected log records: {records}")
+        return False
+    if records[0]['request_id'] != 'req-123' or records[0]['skills_found'] != 4:
+        print(f"❌ Request id or fields missing: {records[0]}")
+        return False
+    print("✅ JSON records carry request ids and fields; sampling drops noisy events")
+    
+    full = DroppingQueueHandler(queue.Queue(maxsize=1))
+    full.handle(logging.makeLogRecord({'msg': 'first'}))
+    full.handle(logging.makeLogRecord({'msg': 'second'}))
+    if full.dropped != 1:
+        print("❌ A full queue should drop records instead of blocking")
+        return False
+    print("✅ Full queue drops records instead of blocking")
+    
+    return True
+
+def test_lazy_imports():
+    """Test that heavy optional dependencies are not imported at startup"""
+    print("\n🐢 Testing lazy imports...")
+    
+    import subprocess
+    
+    heavy = ['pandas', 'numpy', 'sklearn', 'PyPDF2', 'docx']
+    code = ("import sys, recommendation_engine, skill_extractor; "
+            f"print(','.join(m for m in {heavy!r} if m in sys.modules))")
+    loaded = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True).stdout.strip()
+    if loaded:
+        print(f"❌ Imported at startup: {loaded}")
+        return False
+    print("✅ pandas, numpy, scikit-learn, PyPDF2 and python-docx load on first use")
+    
+    from recommendation_engine import HAS_SKLEARN
+    if HAS_SKLEARN and InternshipRecommendationEngine().tfidf_matrix is None:
+        print("❌ TF-IDF matrix was not built on first access")
+        return False
+    print("✅ TF-IDF matrix builds on first access")
+
+    # A failing warm-up task is reported, and the tasks after it still run
+    import logging
+    import lazy_imports
+    ran = []
+
+    def broken_task():
+        raise RuntimeError('index unavailable')
+
+    logger = logging.getLogger('lazy_imports')
+    logger.disabled = True
+    try:
+        lazy_imports.warm_up([], tasks=[broken_task, lambda: ran.append(True)], name='test-warm-up').join(5)
+    finally:
+        logger.disabled = False
+    if lazy_imports.import_report()['failed'].get('test-warm-up:broken_task') != 'index unavailable' or not ran:
+        print("❌ Warm-up task failure was not recorded")
+        return False
+    print("✅ Warm-up task failures are logged and reported")
+
+    return True
+
+def test_precomputed_recommendations():
+    """Test background recommendation precomputation on profile save"""
+    print("\n⚡ Testing precomputed recommendations...")
+    
+    import os
+    import tempfile
+    import time
+    from job_queue import BackgroundJobQueue
+    from precomputed_recommendations import RecommendationPrecomputer
+    from profile_store import ProfileStore, SQLiteProfileStore
+    
+    engine = InternshipRecommendationEngine()
+    queue = BackgroundJobQueue(max_workers=1, max_pending=4, job_timeout=30, result_ttl=60)
+    profile = {'education_level': 'Graduate', 'experience_level': 'Beginner',
+               'skills': ['Research', 'Communication'], 'sector_interests': ['Government']}
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        sqlite_store = SQLiteProfileStore(os.path.join(tmp, 'profiles.db'))
+        try:
+            for name, store in [('memory', ProfileStore()), ('sqlite', sqlite_store)]:
+                precomputer = RecommendationPrecomputer(engine, store, queue)
+                store.save('user_1', dict(profile))
+                job_id = precomputer.schedule('user_1')
+                deadline = time.time() + 10
+                while queue.get(job_id)['status'] in ('queued', 'running') and time.time() < deadline:
+                    time.sleep(0.01)
+                
+                entry, precomputed = precomputer.get('user_1')
+                expected = engine.get_recommendations(entry['candidate_profile'], 20)
+                if not precomputed or entry['recommendations'] != expected:
+                    print(f"❌ {name}: saved profile was not precomputed")
+                    return False
+                
+                # Changing the profile makes the stored list stale; it is recomputed on read
+                store.add_skills('user_1', ['Policy Analysis'])
+                entry, precomputed = precomputer.get('user_1')
+                if precomputed or 'Policy Analysis' not in entry['candidate_profile']['skills']:
+                    print(f"❌ {name}: stale recommendations were served")
+                    return False
+                print(f"✅ {name}: precomputed list served, stale list recomputed")
+        finally:
+            sqlite_store.close()
+            queue.shutdown()
+    
+    # Profile-save bursts use their own queue and never fill the resume job queue
+    from app import job_queue, precomputer as app_precomputer
+    for n in range(app_precomputer.job_queue.max_pending + 10):
+        app_precomputer.schedule(f'burst_user_{n}')
+    if app_precomputer.job_queue is job_queue or job_queue.submit(lambda: None) is None:
+        print("❌ Precompute jobs share the resume job queue")
+        return False
+    print("✅ Precompute jobs run on their own queue")
+
+    # num_recommendations is clamped to 1..MAX_RECOMMENDATIONS; non-integers are a 400
+    from app import app, profile_store as app_store
+    from config import MAX_RECOMMENDATIONS
+    app_store.save('clamp_user', dict(profile))
+    client = app.test_client()
+    counts = {}
+    for value in ['-5', '0', '1000']:
+        response = client.get(f'/api/profile/recommendations?user_id=clamp_user&num_recommendations={value}')
+        counts[value] = response.status_code, len(response.get_json().get('recommendations', []))
+    if counts['-5'] != (200, 1) or counts['0'] != (200, 1) or counts['1000'][1] > MAX_RECOMMENDATIONS or \
+            client.get('/api/profile/recommendations?user_id=clamp_user&num_recommendations=ten').status_code != 400:
+        print(f"❌ num_recommendations was not bounded: {counts}")
+        return False
+    print("✅ num_recommendations is clamped and validated")
+
+    return True
+
+def test_candidate_index():
+    """Test employer-side candidate ranking against the engine's scores"""
+    print("\n👥 Testing candidate index...")
+    
+    import random
+    from candidate_index import CandidateIndex
+    
+    engine = InternshipRecommendationEngine()
+    rng = random.Random(7)
+    skills = sorted({skill for i in engine.internships for skill in i.get('skills_required', [])})
+    sectors = sorted({i.get('sector', '') for i in engine.internships}) + ['Unknown']
+    locations = sorted({i.get('location', '') for i in engine.internships}) + ['', 'Remote']
+    goals = [''] + sorted(GOAL_KEYWORDS)
+    
+    candidates = {}
+    for n in range(300):
+        candidates[f'user_{n}'] = {
+            'education_level': rng.choice(['12th', 'Diploma', 'Graduate', 'Post Graduate']),
+            'skills': rng.sample(skills, rng.randint(0, 12)),
+            'sector_interests': rng.sample(sectors, rng.randint(0, 3)),
+            'location_preference': rng.choice(locations),
+            'remote_work_preference': rng.random() < 0.3,
+            'experience_level': rng.choice(['Beginner', 'Intermediate', 'Advanced']),
+            'career_goal': rng.choice(goals)
+        }
+    index = CandidateIndex(engine, initial_capacity=16)
+    index.load(candidates.items())
+    index.remove('user_0')
+    del candidates['user_0']
+    
+    for internship in engine.internships[:20]:
+        expected = {user_id: round(engine.calculate_match_score(profile, internship) * 100, 1)
+                    for user_id, profile in candidates.items()}
+        ranked = index.top_candidates(internship, k=len(candidates))
+        if {c['user_id']: c['match_score'] for c in ranked} != expected:
+            print(f"❌ Scores differ from calculate_match_score for internship {internship['id']}")
+            return False
+        top = index.top_candidates(internship, k=5)
+        if [c['match_score'] for c in top] != sorted(expected.values(), reverse=True)[:5]:
+            print(f"❌ Wrong top-5 for internship {internship['id']}")
+            return False
+    print(f"✅ {len(candidates)} candidates ranked with engine-identical scores")
+    
+    # Re-saving a profile re-encodes it in place
+    index.upsert('user_1', dict(candidates['user_1'], skills=skills, sector_interests=sectors))
+    if len(index) != len(candidates):
+        print("❌ Upsert added a duplicate row")
+        return False
+    print("✅ Upsert and removal keep one row per candidate")
+
+    # A bulk load must not write back profiles saved (or removed) while it was reading
+    internship = engine.internships[0]
+    newer = dict(candidates['user_2'], skills=internship.get('skills_required', []))
+    def stale_rows():
+        for user_id in ('user_3', 'user_2', 'user_4'):
+            yield user_id, candidates[user_id]
+            if user_id == 'user_3':
+                index.upsert('user_2', newer)
+                index.remove('user_4')
+    loaded = index.load(stale_rows())
+    scores = {c['user_id']: c['match_score'] for c in index.top_candidates(internship, k=len(index))}
+    if loaded != 1 or 'user_4' in scores or \
+            scores.get('user_2') != round(engine.calculate_match_score(newer, internship) * 100, 1):
+        print("❌ Bulk load overwrote a profile saved during the load")
+        return False
+    print("✅ Bulk load skips candidates saved or removed after it started")
+
+    # One oversized profile is capped instead of widening every row
+    huge = dict(candidates['user_6'], skills=[f'made up skill {n}' for n in range(5000)],
+                sector_interests=[f'sector {n}' for n in range(500)])
+    index.upsert('user_6', huge)
+    width = len(index._columns['skills']) if index._np is not None else index.max_skills
+    if width > index.max_skills or index.top_candidates(internship, k=len(index)) is None:
+        print(f"❌ An oversized profile widened the skill columns to {width}")
+        return False
+    import app as app_module
+    response = app_module.app.test_client().post('/api/profile/skills?user_id=cap_test_user',
+                                                 json={'skills': huge['skills'][:app_module.MAX_PROFILE_SKILLS + 1]})
+    if response.status_code != 400:
+        print(f"❌ Adding more skills than a profile may hold returned {response.status_code}")
+        return False
+    print("✅ Skills and interests per profile are capped in the API and the index")
+
+    # Profiles another worker process saves reach this worker's employer-side ranking
+    import time
+    from profile_store import SQLiteProfileStore
+    for _ in range(100):
+        if app_module._profiles_synced is not None:
+            break
+        time.sleep(0.05)
+    if isinstance(app_module.profile_store, SQLiteProfileStore):
+        other_worker = SQLiteProfileStore(app_module.profile_store.path)
+        try:
+            other_worker.save('other_worker_user', dict(candidates['user_5'], skills=internship.get('skills_required', [])))
+        finally:
+            other_worker.close()
+        response = app_module.app.test_client().get(f"/api/internships/{internship['id']}/candidates?k=100000")
+        if 'other_worker_user' not in {c['user_id'] for c in response.get_json().get('candidates', [])}:
+            print("❌ A profile saved by another worker is missing from the candidate ranking")
+            return False
+        print("✅ Profiles saved by other workers are synced into the candidate index")
+
+    return True
+
+def test_seat_allocation():
+    """Test capacity-constrained allocation of candidates to internships"""
+    print("\n🪑 Testing seat allocation...")
+    
+    from allocation import SeatAllocator
+    from benchmarks.synthetic import SyntheticDataGenerator
+    from candidate_index import CandidateIndex
+    
+    generator = SyntheticDataGenerator(seed=3)
+    catalogue = generator.internships(30)
+    for internship in catalogue:
+        internship['capacity'] = generator.rng.randint(0, 6)
+    engine = InternshipRecommendationEngine(internships=catalogue)
+    index = CandidateIndex(engine)
+    index.load((f'user_{n}', profile) for n, profile in enumerate(generator.profiles(400)))
+    allocator = SeatAllocator(index, edges_per_candidate=10, min_score=0.1, epsilon=0.001)
+    
+    results = {method: allocator.allocate(catalogue, method) for method in ('auction', 'greedy')}
+    capacities = {internship['id']: internship['capacity'] for internship in catalogue}
+    for method, result in results.items():
+        placed = [a['user_id'] for a in result['assignments']]
+        taken = {}
+        for assignment in result['assignments']:
+            taken[assignment['internship_id']] = taken.get(assignment['internship_id'], 0) + 1
+        if len(placed) != len(set(placed)) or any(taken[i] > capacities[i] for i in taken):
+            print(f"❌ {method}: a candidate was placed twice or a posting was overfilled")
+            return False
+        if result['objective'] > result['upper_bound'] + 1e-6:
+            print(f"❌ {method}: objective exceeds its upper bound")
+            return False
+        print(f"✅ {method}: {result['assigned']}/{result['seats']} seats filled, "
+              f"objective {result['objective']} (bound {result['upper_bound']})")
+    
+    # The auction is within epsilon per seat of optimal, so at least as good as greedy up to that slack
+    auction = results['auction']
+    if auction['objective'] < auction['upper_bound'] - 0.001 * auction['seats'] - 1e-6:
+        print("❌ Auction result is further from optimal than epsilon allows")
+        return False
+    if auction['objective'] < results['greedy']['objective'] - 0.001 * auction['seats']:
+        print("❌ Auction scored below greedy")
+        return False
+    print("✅ Auction is within epsilon of the LP upper bound")
+
+    # Bad capacity values fall back to the default instead of failing the whole allocation
+    bad_rows = [dict(catalogue[0], capacity=None), dict(catalogue[1], capacity='ten'), dict(catalogue[2], capacity='3')]
+    if [allocator.capacity(internship) for internship in bad_rows] != [allocator.default_capacity] * 2 + [3] or \
+            allocator.allocate(bad_rows, 'greedy')['seats'] != 2 * allocator.default_capacity + 3:
+        print("❌ A null or non-numeric capacity broke the allocation")
+        return False
+    print("✅ Null and non-numeric capacities use the default")
+
+    return True
+
+def test_posting_alerts():
+    """Test that standing-query alerts find exactly the candidates above the threshold"""
+    print("\n🔔 Testing posting alerts...")
+    
+    from benchmarks.synthetic import SyntheticDataGenerator
+    from candidate_index import CandidateIndex
+    from posting_alerts import alerts_for_posting, upsert_and_alert
+    
+    generator = SyntheticDataGenerator(seed=11)
+    catalogue = generator.internships(40)
+    engine = InternshipRecommendationEngine(internships=catalogue[:30])
+    index = CandidateIndex(engine, initial_capacity=16)
+    candidates = {f'user_{n}': profile for n, profile in enumerate(generator.profiles(2000))}
+    index.load(candidates.items())
+    
+    def check(internship, min_score):
+        expected = {user_id for user_id, profile in candidates.items()
+                    if engine.calculate_match_score(profile, internship) >= min_score}
+        alert = alerts_for_posting(index, internship, min_score, limit=len(candidates))
+        return {a['user_id'] for a in alert['alerts']} == expected and alert['matched'] == len(expected)
+    
+    for internship in catalogue[30:35]:
+        for min_score in (0.3, 0.5, 0.7):
+            if not check(internship, min_score):
+                print(f"❌ Alerts differ from calculate_match_score for internship {internship['id']} at {min_score}")
+                return False
+    print("✅ Alerts match a brute-force scan at every threshold")
+    
+    # Profiles saved or removed after the postings were built are still matched exactly
+    for n, profile in enumerate(generator.profiles(50)):
+        candidates[f'user_{n}'] = profile
+        index.upsert(f'user_{n}', profile)
+    index.remove('user_60')
+    del candidates['user_60']
+    if not all(check(internship, 0.5) for internship in catalogue[30:35]):
+        print("❌ Alerts missed a re-saved or removed profile")
+        return False
+    print("✅ Re-saved and removed profiles are reflected in alerts")
+    
+    version = engine.catalogue_version
+    alert = upsert_and_alert(engine, index, catalogue[35], min_score=0.5)
+    if alert['replaced'] or engine.get_internship(catalogue[35]['id']) is None or \
+            engine.catalogue_version == version:
+        print("❌ New posting was not added to the catalogue")
+        return False
+    if not upsert_and_alert(engine, index, dict(catalogue[35], title='Renamed'), min_score=0.5)['replaced']:
+        print("❌ Re-posting the same id did not replace it")
+        return False
+    print(f"✅ Posting upserted; {alert['matched']} alerts from {alert['scored']} scored candidates")
+    
+    # Upserts to a file-backed catalogue are written back and picked up by other processes' engines
+    import os
+    import tempfile
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'internships.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(catalogue[:30], f)
+        writer = InternshipRecommendationEngine(catalogue_path=path)
+        reader = InternshipRecommendationEngine(catalogue_path=path)
+        writer.upsert_internship(catalogue[36])
+        if InternshipRecommendationEngine(catalogue_path=path).get_internship(catalogue[36]['id']) is None:
+            print("❌ Upserted posting was not persisted")
+            return False
+        if not reader.reload_if_changed() or reader.get_internship(catalogue[36]['id']) is None or \
+                reader.catalogue_version != writer.catalogue_version or writer.reload_if_changed():
+            print("❌ Another engine on the same catalogue did not pick up the upsert")
+            return False
+    print("✅ Upserts are persisted and reloaded by other workers")
+
+    # Alerts from the admin endpoint include candidates saved through other workers
+    import time
+    import app as app_module
+    from config import PROFILING_CONFIG
+    from profile_store import SQLiteProfileStore
+    for _ in range(100):
+        if app_module._profiles_synced is not None:
+            break
+        time.sleep(0.05)
+    if isinstance(app_module.profile_store, SQLiteProfileStore):
+        posting = dict(catalogue[37], id=990001)
+        other_worker = SQLiteProfileStore(app_module.profile_store.path)
+        try:
+            other_worker.save('alert_worker_user', {'skills': posting['skills_required'],
+                                                    'education_level': posting['education_level']})
+        finally:
+            other_worker.close()
+        original_engine, original_token = app_module.recommendation_engine, PROFILING_CONFIG['admin_token']
+        # An in-memory engine so the test never writes data/internships.json
+        app_module.recommendation_engine = InternshipRecommendationEngine(internships=list(original_engine.internships))
+        PROFILING_CONFIG['admin_token'] = 'test-token'
+        try:
+            response = app_module.app.test_client().post('/api/admin/internships?min_score=0', json=posting,
+                                                         headers={'X-Admin-Token': 'test-token'})
+        finally:
+            app_module.recommendation_engine, PROFILING_CONFIG['admin_token'] = original_engine, original_token
+        if 'alert_worker_user' not in {a['user_id'] for a in response.get_json().get('alerts', [])}:
+            print("❌ Posting alerts missed a candidate saved by another worker")
+            return False
+        print("✅ Posting alerts include candidates saved by other workers")
+
+    return True
+
+def test_diversity_reranking():
+    """Test MMR / quota re-ranking of recommendations"""
+    print("\n🎨 Testing diversity re-ranking...")
+    
+    from benchmarks.synthetic import SyntheticDataGenerator
+    from config import DIVERSITY_CONFIG
+    from diversity import diversity_options
+    
+    generator = SyntheticDataGenerator(seed=5)
+    engine = InternshipRecommendationEngine(internships=generator.internships(600))
+    profile = next(iter(generator.profiles(1)))
+    plain = engine.get_recommendations(profile, 20)
+    
+    unchanged = engine.get_recommendations(profile, 20, diversity_options({'mmr_lambda': 1}, DIVERSITY_CONFIG))
+    if [r['id'] for r in unchanged] != [r['id'] for r in plain]:
+        print("❌ mmr_lambda=1 without quotas changed the ranking")
+        return False
+    
+    options = diversity_options({'max_per_sector': 2, 'max_per_organization': 1}, DIVERSITY_CONFIG)
+    diverse = engine.get_recommendations(profile, 20, options)
+    sectors = [r['sector'] for r in diverse]
+    organizations = [r['organization'] for r in diverse]
+    if max(sectors.count(s) for s in sectors) > 2 or len(set(organizations)) != len(organizations):
+        print("❌ Quotas were exceeded")
+        return False
+    if len(set(sectors)) <= len(set(r['sector'] for r in plain)):
+        print("❌ Re-ranking did not widen the sector mix")
+        return False
+    print(f"✅ {len(set(sectors))} sectors in the diverse top-{len(diverse)} "
+          f"(plain ranking: {len(set(r['sector'] for r in plain))})")
+    
+    for bad in ({'mmr_lambda': 2}, {'max_per_sector': 0}, {'pool_size': 'all'}, {'max_per_city': 1}, 'yes'):
+        try:
+            diversity_options(bad, DIVERSITY_CONFIG)
+        except ValueError:
+            continue
+        print(f"❌ Invalid diversity option accepted: {bad}")
+        return False
+    print("✅ Invalid diversity options are rejected")
+    
+    return True
+
+def test_ranking_evaluation():
+    """Test configurable weights and the offline NDCG/recall evaluator"""
+    print("\n📏 Testing ranking evaluation...")
+    
+    from benchmarks.synthetic import SyntheticDataGenerator
+    from config import MIN_MATCH_SCORE, SCORING_WEIGHTS
+    from ranking_evaluation import RankingEvaluator, weight_grid
+    
+    engine = InternshipRecommendationEngine()
+    if engine.weights != SCORING_WEIGHTS or engine.min_match_score != MIN_MATCH_SCORE:
+        print("❌ Engine does not use the configured weights and threshold")
+        return False
+    print("✅ Engine reads SCORING_WEIGHTS and MIN_MATCH_SCORE from config")
+    
+    generator = SyntheticDataGenerator(seed=9)
+    catalogue = generator.internships(300)
+    profiles = list(generator.profiles(60))
+    engine = InternshipRecommendationEngine(internships=catalogue)
+    # Judge each profile's own top 5 as relevant, so the default weights score perfectly
+    judgements = [(profile, [r['id'] for r in engine.get_recommendations(profile, 5)]) for profile in profiles]
+    evaluator = RankingEvaluator(engine, judgements)
+    
+    grid = weight_grid({'skills': [0.25, 0.6], 'location': [0.0, 0.15]})
+    for weights in grid:
+        reweighted = InternshipRecommendationEngine(internships=catalogue, weights=weights)
+        ranking = evaluator.ranking(weights, 10)
+        for row, profile in enumerate(profiles):
+            expected = [r['id'] for r in reweighted.get_recommendations(profile, 10)]
+            if [catalogue[column]['id'] for column in ranking[row] if column >= 0] != expected:
+                print(f"❌ Cached ranking differs from get_recommendations for weights {weights}")
+                return False
+    print(f"✅ Cached matrices rank exactly like get_recommendations for {len(grid)} weight settings")
+    
+    results = evaluator.evaluate(grid, ks=(5, 10))
+    default = next(r for r in results if r['weights'] == engine.weights)
+    if default['ndcg@5'] != 1.0 or default['recall@5'] != 1.0:
+        print(f"❌ Expected perfect NDCG/recall for the judged weights, got {default}")
+        return False
+    if any(not 0.0 <= r['ndcg@10'] <= 1.0 or not 0.0 <= r['recall@10'] <= 1.0 for r in results):
+        print("❌ Metrics out of range")
+        return False
+    print("✅ NDCG@k and recall@k computed for every setting")
+    
+    return True
+
+def test_location_matching():
+    """Test gazetteer location resolution, distance scoring and the spatial index"""
+    print("\n📍 Testing location matching...")
+    
+    from benchmarks.synthetic import SyntheticDataGenerator
+    from gazetteer import haversine_km
+    
+    engine = InternshipRecommendationEngine()
+    gazetteer = engine.gazetteer
+    if gazetteer.resolve('Bengaluru') != gazetteer.resolve('Bangalore, Karnataka') or \
+            gazetteer.resolve('Gurgaon, Haryana').name != 'Gurugram' or gazetteer.resolve('Orissa').state != 'Odisha':
+        print("❌ Aliases did not resolve to the same place")
+        return False
+    if gazetteer.resolve('Atlantis') is not None:
+        print("❌ Unknown location resolved to a place")
+        return False
+    print("✅ Aliases and state names resolve through the gazetteer")
+    
+    bangalore = {'location': 'Bangalore, Karnataka', 'remote_work': False}
+    cases = [
+        ('Bengaluru', bangalore, 1.0),
+        ('Mysuru', bangalore, 0.6),                                  # same state
+        ('Karnataka', bangalore, 1.0),                               # whole state preferred
+        ('Mumbai', bangalore, 0.0),                                  # different states, far apart
+        ('New Delhi', {'location': 'Gurgaon, Haryana'}, 1.0),        # neighbouring cities across a border
+        ('Chandigarh', {'location': 'Ludhiana, Punjab'}, 0.6),       # about 100 km
+    ]
+    for preference, internship, expected in cases:
+        if engine._location_match(preference, False, internship) != expected:
+            print(f"❌ {preference} vs {internship['location']}: expected {expected}")
+            return False
+    reasons = engine.get_match_reasons({'location_preference': 'Bengaluru'}, dict(bangalore, title='x'))
+    if not any('preferred area' in reason for reason in reasons):
+        print("❌ Match reasons do not mention the matching city")
+        return False
+    print("✅ Distance and state scoring replace substring checks")
+    
+    generator = SyntheticDataGenerator(seed=6)
+    catalogue = generator.internships(400)
+    engine = InternshipRecommendationEngine(internships=catalogue)
+    locations = engine.location_index(engine.internships)
+    origin = gazetteer.resolve('Pune')
+    expected = {position for position, place in enumerate(locations.places)
+                if place is not None and place.lat is not None and haversine_km(origin, place) <= 200}
+    if set(locations.within(origin, 200)) != expected:
+        print("❌ Spatial query differs from a brute-force distance scan")
+        return False
+    
+    profile = dict(next(iter(generator.profiles(1))), location_preference='Pune', remote_work_preference=False)
+    nearby = engine.get_recommendations(profile, 50, max_distance_km=200)
+    if not nearby or any(r['id'] not in {catalogue[p]['id'] for p in expected} for r in nearby):
+        print("❌ max_distance_km returned a posting outside the radius")
+        return False
+    for recommendation in engine.get_recommendations(profile, 50):
+        internship = engine.get_internship(recommendation['id'])
+        if recommendation['match_score'] != round(engine.calculate_match_score(profile, internship) * 100, 1):
+            print("❌ Spatially scored recommendations differ from calculate_match_score")
+            return False
+    print(f"✅ {len(expected)} postings within 200 km found by one spatial query")
+    
+    return True
+
+def test_skill_registry():
+    """Test skill alias canonicalization, typo tolerance and id-based matching"""
+    print("\n🏷️  Testing skill registry...")
+    
+    from candidate_index import CandidateIndex
+    
+    engine = InternshipRecommendationEngine()
+    registry = engine.skill_registry
+    cases = [('MS Excel', 'Excel'), ('Sql', 'SQL'), ('node.js', 'Node.js'), ('Team work', 'Team Work'),
+             ('Javscript', 'JavaScript'), ('Machine Lerning', 'Machine Learning'), ('Commmunication', 'Communication'),
+             ('Baking', 'Baking'), ('Reaching', 'Reaching'), ('Scales', 'Scales')]
+    for text, expected in cases:
+        if registry.canonical(text) != expected:
+            print(f"❌ {text} resolved to {registry.canonical(text)}, expected {expected}")
+            return False
+    if registry.canonical_id('Jav') == registry.canonical_id('Java') or \
+            registry.canonical_id('Gardening') != registry.canonical_id('gardening'):
+        print("❌ Short or unknown skills were not matched exactly")
+        return False
+    if registry.canonicalize(['Excel', 'MS Excel', 'Sql', 'SQL', 'Javscript', 'Baking']) != \
+            ['Excel', 'SQL', 'Javscript', 'Baking']:
+        print("❌ Stored skills were not de-duplicated, or a near-miss overwrote the user's spelling")
+        return False
+    registered = len(registry)
+    for n in range(2000):
+        registry.canonical_id(f'made up skill {n}')
+    if len(registry) != registered:
+        print("❌ Unknown skills grew the registry")
+        return False
+    print("✅ Aliases and typos resolve to canonical skills; short and unknown ones match exactly")
+    
+    internship = {'id': 999, 'title': 'Data Intern', 'education_level': 'Graduate', 'sector': 'Technology',
+                  'location': 'Pune', 'skills_required': ['SQL', 'Microsoft Excel', 'Data Analysis']}
+    candidate = {'education_level': 'Graduate', 'skills': ['Sql', 'MS-Excel', 'data analytics']}
+    if engine._skills_match(registry.ids(candidate['skills']), registry.ids(internship['skills_required'])) != 1.0:
+        print("❌ Resume spellings did not match the posting's skills")
+        return False
+    reasons = engine.get_match_reasons(candidate, internship)
+    if not any('SQL' in reason for reason in reasons):
+        print("❌ Match reasons do not list the canonically matched skills")
+        return False
+    
+    index = CandidateIndex(engine, initial_capacity=4)
+    index.upsert('resume_user', candidate)
+    index.upsert('other_user', dict(candidate, skills=['Excel', 'Gardening']))
+    expected = {'resume_user': round(engine.calculate_match_score(candidate, internship) * 100, 1),
+                'other_user': round(engine.calculate_match_score(dict(candidate, skills=['Excel', 'Gardening']),
+                                                                 internship) * 100, 1)}
+    ranked = {c['user_id']: c['match_score'] for c in index.top_candidates(internship, k=2)}
+    if ranked != expected or index.top_candidates(internship, k=1)[0]['skills_match_percentage'] != 100.0:
+        print("❌ Candidate index skill ids differ from the engine's")
+        return False
+    print("✅ Profiles and postings are matched on canonical skill ids")
+
+    # Catalogue postings resolve their skills once; ranking only looks up the candidate's list
+    posting = engine.internships[0]
+    if engine.required_skill_ids(posting) is not engine.required_skill_ids(posting) or \
+            engine.required_skill_ids(dict(posting)) != engine.required_skill_ids(posting):
+        print("❌ Posting skill ids are not precomputed for the catalogue")
+        return False
+    registry._set_cache.clear()
+    engine.get_recommendations(candidate, 5)
+    if len(registry._set_cache) != 1:
+        print(f"❌ Ranking cached {len(registry._set_cache)} skill lists instead of just the candidate's")
+        return False
+    print("✅ Posting skill ids are computed at ingestion")
+
+    return True
+
+def test_skill_suggest():
+    """Test prefix-trie skill autocomplete weighted by posting frequency"""
+    print("\n🔤 Testing skill autocomplete...")
+    
+    import time
+    
+    engine = InternshipRecommendationEngine(internships=InternshipRecommendationEngine().internships)
+    trie = engine.skill_trie(engine.internships)
+    if trie.suggest('py')[:1] != ['Python'] or trie.suggest('ms ex') != ['Excel'] or \
+            'Machine Learning' not in trie.suggest('learn') or trie.suggest('qqq') != []:
+        print("❌ Prefixes, aliases or later words did not reach their skills")
+        return False
+    popular = trie.suggest('', 5)
+    counts = [trie.popularity.get(skill, 0) for skill in popular]
+    if len(popular) != 5 or counts != sorted(counts, reverse=True):
+        print("❌ Suggestions are not ordered by posting frequency")
+        return False
+    print(f"✅ Suggestions for 'py': {trie.suggest('py')}")
+    
+    engine.upsert_internship({'id': 9001, 'title': 'Quantum Intern', 'skills_required': ['Qiskit', 'Python'],
+                              'location': 'Pune', 'sector': 'Technology', 'education_level': 'Graduate'})
+    rebuilt = engine.skill_trie(engine.internships)
+    if rebuilt is trie or rebuilt.suggest('qis') != ['Qiskit'] or engine.skill_trie(engine.internships) is not rebuilt:
+        print("❌ Trie was not rebuilt once for the changed catalogue")
+        return False
+    
+    started = time.perf_counter()
+    for _ in range(10000):
+        rebuilt.suggest('machine le')
+    per_query_us = (time.perf_counter() - started) / 10000 * 1e6
+    if per_query_us > 1000:
+        print(f"❌ Suggest took {per_query_us:.1f}µs per query")
+        return False
+    print(f"✅ New posting skills suggested; {per_query_us:.1f}µs per query")
+    
+    return True
+
 def main():
     """Main test function"""
     print("🚀 PM Internship Scheme - System Test")
@@ -133,6 +1270,106 @@ def main():
         print("\n❌ Recommendation engine tests failed!")
         sys.exit(1)
     
+    # Test background job queue
+    if not test_job_queue():
+        print("\n❌ Job queue tests failed!")
+        sys.exit(1)
+    
+    # Test resume extraction cache
+    if not test_resume_cache():
+        print("\n❌ Resume cache tests failed!")
+        sys.exit(1)
+    
+    # Test batch resume ingestion
+    if not test_batch_ingest():
+        print("\n❌ Batch ingestion tests failed!")
+        sys.exit(1)
+    
+    # Test content-addressed resume storage
+    if not test_resume_store():
+        print("\n❌ Resume storage tests failed!")
+        sys.exit(1)
+
+    # Test upload validation
+    if not test_upload_validation():
+        print("\n❌ Upload validation tests failed!")
+        sys.exit(1)
+
+    # Test profile store
+    if not test_profile_store():
+        print("\n❌ Profile store tests failed!")
+        sys.exit(1)
+    
+    # Test request timing
+    if not test_request_timing():
+        print("\n❌ Request timing tests failed!")
+        sys.exit(1)
+    
+    # Test metrics
+    if not test_metrics():
+        print("\n❌ Metrics tests failed!")
+        sys.exit(1)
+    
+    # Test request profiler
+    if not test_request_profiler():
+        print("\n❌ Request profiler tests failed!")
+        sys.exit(1)
+    
+    # Test structured logging
+    if not test_structured_logging():
+        print("\n❌ Structured logging tests failed!")
+        sys.exit(1)
+    
+    # Test lazy imports
+    if not test_lazy_imports():
+        print("\n❌ Lazy import tests failed!")
+        sys.exit(1)
+    
+    # Test precomputed recommendations
+    if not test_precomputed_recommendations():
+        print("\n❌ Precomputed recommendation tests failed!")
+        sys.exit(1)
+    
+    # Test candidate index
+    if not test_candidate_index():
+        print("\n❌ Candidate index tests failed!")
+        sys.exit(1)
+    
+    # Test seat allocation
+    if not test_seat_allocation():
+        print("\n❌ Seat allocation tests failed!")
+        sys.exit(1)
+    
+    # Test posting alerts
+    if not test_posting_alerts():
+        print("\n❌ Posting alert tests failed!")
+        sys.exit(1)
+    
+    # Test diversity re-ranking
+    if not test_diversity_reranking():
+        print("\n❌ Diversity re-ranking tests failed!")
+        sys.exit(1)
+    
+    # Test ranking evaluation
+    if not test_ranking_evaluation():
+        print("\n❌ Ranking evaluation tests failed!")
+        sys.exit(1)
+    
+    # Test location matching
+    if not test_location_matching():
+        print("\n❌ Location matching tests failed!")
+        sys.exit(1)
+    
+    # Test skill canonicalization
+    if not test_skill_registry():
+        print("\n❌ Skill registry tests failed!")
+        sys.exit(1)
+    
+    # Test skill autocomplete
+    if not test_skill_suggest():
+        print("\n❌ Skill autocomplete tests failed!")
+        sys.exit(1)
+    
     print("\n" + "=" * 60)
     print("🎉 ALL TESTS PASSED!")
     print("✅ The PM Internship Scheme Recommendation Engine is ready to use!")
@@ -0,0 +1,91 @@
+"""
+Upload validation helpers for PM Internship Scheme
+Checks resume uploads by extension and magic bytes and copies them to disk
+in fixed-size chunks with a hard size limit
+"""
+
+import os
+import tempfile
+from typing import Optional
+
+CHUNK_SIZE = 64 * 1024
+
+ALLOWED_RESUME_EXTENSIONS = ['.pdf', '.docx', '.doc', '.txt']
+
+# Leading bytes expected for each binary resume format
+MAGIC_SIGNATURES = {
+    '.pdf': [b'%PDF-'],
+    '.docx': [b'PK\x03\x04'],
+    '.doc': [b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1', b'PK\x03\x04']
+}
+
+
+class UploadRejected(Exception):
+    """Raised when an upload fails validation; carries the HTTP status to return"""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def resume_extension(filename: str) -> str:
+    """Return the lower-cased extension, raising UploadRejected if unsupported"""
+    extension = os.path.splitext(filename or '')[1].lower()
+    if extension not in ALLOWED_RESUME_EXTENSIONS:
+        raise UploadRejected(f'Unsupported file type. Allowed: {", ".join(ALLOWED_RESUME_EXTENSIONS)}')
+    return extension
+
+
+def check_magic_bytes(file_storage, extension: str):
+    """Peek at the head of the upload and reject content that doesn't match its extension"""
+    stream = file_storage.stream
+    head = stream.read(1024)
+    stream.seek(0)
+
+    if not head:
+        raise UploadRejected('Uploaded file is empty')
+
+    signatures = MAGIC_SIGNATURES.get(extension)
+    if signatures is not None:
+        if not any(head.startswith(sig) for sig in signatures):
+            raise UploadRejected(f'File content does not look like a {extension} file')
+    elif b'\x00' in head:
+        # Plain text resumes should never contain NUL bytes
+        raise UploadRejected('File content does not look like a text file')
+
+
+def save_upload(file_storage, dest_path: str, max_bytes: Optional[int] = None, hasher=None):
+    """Copy the upload to ``dest_path`` in chunks, aborting once ``max_bytes`` is exceeded.
+
+    If ``hasher`` (e.g. ``hashlib.sha256()``) is given it is fed every chunk,
+    so the content digest comes for free with the copy.
+    """
+    written = 0
+    stream = file_storage.stream
+    try:
+        with open(dest_path, 'wb') as out:
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                written += len(chunk)
+                if max_bytes is not None and written > max_bytes:
+                    raise UploadRejected(f'File exceeds the {max_bytes // (1024 * 1024)}MB limit', 413)
+                out.write(chunk)
+                if hasher is not None:
+                    hasher.update(chunk)
+    except Exception:
+        try:
+            os.remove(dest_path)
+        except OSError:
+            pass
+        raise
+    return written
+
+
+def save_upload_to_temp(file_storage, suffix: str, max_bytes: Optional[int] = None) -> str:
+    """Save the upload to a new temp file and return its path; the caller removes it"""
+    fd, temp_path = tempfile.mkstemp(suffix=suffix)
+    os.close(fd)
+    save_upload(file_storage, temp_path, max_bytes)
+    return temp_path